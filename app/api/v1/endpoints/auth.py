@@ -17,6 +17,7 @@ from app.schemas.auth import (
 from app.schemas.user import UserCreate, UserResponse
 from app.services.auth import auth_service
 from app.services.email import email_service
+from app.services.outbox import outbox_service
 from app.api.deps import get_current_user, get_current_admin, get_client_ip_from_request
 from app.models.user import User
 
@@ -78,11 +79,14 @@ async def login(
         temp_token = auth_service.create_temp_token(user.id)
         
         if user.email_2fa_enabled:
-            code = await auth_service.create_2fa_code(db, user.id)
-            try:
-                await email_service.send_2fa_code(user.email, code, user.full_name or user.username)
-            except Exception as e:
-                print(f"Failed to send 2FA code: {e}")
+            code = await auth_service.create_2fa_code(db, user.id, commit=False)
+            await outbox_service.enqueue(
+                db,
+                "2fa_code",
+                email_service.build_2fa_code(user.email, code, user.full_name or user.username),
+                max_attempts=3
+            )
+            await db.commit()
         
         await auth_service.log_login_attempt(db, login_data.email, True, ip_address)
         
@@ -1,50 +1,113 @@
 # app/api/v1/endpoints/blog.py (VERSIÓN MEJORADA)
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
+from pydantic import TypeAdapter
 
+from app.config import settings
 from app.db.session import get_db
 from app.db.repositories.blog import blog_repository
+from app.db.repositories.comment import comment_repository
 from app.models.user import User
 from app.schemas.blog import (
     BlogPostCreate,
     BlogPostUpdate,
     BlogPostResponse,
+    BlogPostListItem,
     BlogPostWithDetails
 )
 from app.schemas.project import CommentCreate, CommentResponse
 from app.schemas.media import ImageResponse, ImageUploadResponse, ImageUpdate, VideoCreate, VideoResponse
 from app.services.media import media_service
-from app.services.email import email_service
-from app.services.notification import notification_service  # NUEVO
+from app.services.notification import notification_service
+from app.services.reaction import reaction_service
+from app.services.search import search_service
+from app.core.response_cache import response_cache
+from app.services.view_counter import view_counter_service
 from app.api.deps import get_current_admin
 from app.models.project import Comment
+from app.models.blog import BlogPost
+from app.utils.pagination import CursorPage
 
 router = APIRouter()
 
+blog_list_adapter = TypeAdapter(CursorPage[BlogPostListItem])
 
-@router.get("/", response_model=List[BlogPostResponse])
+
+async def _attach_images(db: AsyncSession, posts: List) -> None:
+    if not posts:
+        return
+    
+    images_dict = await media_service.load_images_for_entities(
+        db, [p.id for p in posts], 'blog_post'
+    )
+    
+    for post in posts:
+        post.images = images_dict.get(post.id, [])
+
+
+@router.get("/", response_model=CursorPage[BlogPostListItem])
 async def get_blog_posts(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     published: Optional[bool] = True,
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    posts = await blog_repository.get_all_ordered(
-        db, skip=skip, limit=limit, published=published
+    cache_key = response_cache.build_key(
+        'blog_post',
+        cursor=cursor,
+        limit=limit,
+        published=published,
+        include_total=include_total
     )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
-    if posts:
-        post_ids = [p.id for p in posts]
-        images_dict = await media_service.load_images_for_entities(
-            db, post_ids, 'blog_post'
-        )
-        
-        for post in posts:
-            post.images = images_dict.get(post.id, [])
+    page = await blog_repository.get_ordered_page(
+        db,
+        cursor=cursor,
+        limit=limit,
+        published=published,
+        include_total=include_total
+    )
+    await _attach_images(db, page.items)
     
-    return posts
+    return await response_cache.store(cache_key, blog_list_adapter, page.to_dict())
+
+
+@router.get("/tags/{tag}", response_model=CursorPage[BlogPostListItem])
+async def get_blog_posts_by_tag(
+    tag: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=100),
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """Posts publicados con el tag indicado (sin distinguir mayúsculas)"""
+    cache_key = response_cache.build_key(
+        'blog_post',
+        tag=tag.lower(),
+        cursor=cursor,
+        limit=limit,
+        include_total=include_total
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    page = await blog_repository.search_by_tag(
+        db,
+        tag,
+        cursor=cursor,
+        limit=limit,
+        include_total=include_total
+    )
+    await _attach_images(db, page.items)
+    
+    return await response_cache.store(cache_key, blog_list_adapter, page.to_dict())
 
 
 @router.get("/{slug}", response_model=BlogPostWithDetails)
@@ -60,15 +123,15 @@ async def get_blog_post(
             detail="Blog post not found"
         )
     
-    approved_comments = [c for c in post_db.comments if c.approved]
     images = await media_service.get_images(db, post_db.id, 'blog_post')
+    await comment_repository.attach_latest(
+        db, post_db, blog_post_id=post_db.id, limit=settings.DETAIL_COMMENTS_LIMIT
+    )
 
     response_data = BlogPostWithDetails.model_validate(post_db)
     
-    response_data.comments = approved_comments
     response_data.images = images
-    
-    await blog_repository.increment_views(db, post_db.id)
+    response_data.views = post_db.views + view_counter_service.record(post_db.id)
     
     return response_data
 
@@ -76,7 +139,6 @@ async def get_blog_post(
 @router.post("/", response_model=BlogPostResponse, status_code=status.HTTP_201_CREATED)
 async def create_blog_post(
     post_data: BlogPostCreate,
-    background_tasks: BackgroundTasks,  # NUEVO
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
@@ -92,18 +154,16 @@ async def create_blog_post(
             detail="A post with this slug already exists"
         )
     
-    post = await blog_repository.create(db, obj_in=post_data)
-    post.images = []
+    post = await blog_repository.create(db, obj_in=post_data, commit=False)
     
-    # NUEVO: Notificar a suscriptores si el post está publicado
+    # La notificación se encola en la misma transacción que el post
     if post.published:
-        background_tasks.add_task(
-            notification_service.notify_new_blog_post,
-            db,
-            post.title,
-            post.slug,
-            post.excerpt or "Check out my latest blog post!"
-        )
+        await notification_service.enqueue_new_blog_post(db, post.id)
+    
+    post = await blog_repository.commit(db, post)
+    post.images = []
+    search_service.index_blog_post(post)
+    await response_cache.invalidate('blog_post')
     
     return post
 
@@ -138,6 +198,8 @@ async def update_blog_post(
     
     post = await blog_repository.update(db, db_obj=post, obj_in=post_data)
     post.images = await media_service.get_images(db, post_id, 'blog_post')
+    search_service.index_blog_post(post)
+    await response_cache.invalidate('blog_post')
     
     # NO notificamos en actualizaciones, solo en creación
     
@@ -150,6 +212,9 @@ async def delete_blog_post(
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
+    # Images and reactions go in the same transaction; blobs are deleted in the background
+    await media_service.delete_all_images(db, post_id, 'blog_post', commit=False)
+    await reaction_service.delete_all_reactions(db, post_id, 'blog_post')
     deleted = await blog_repository.delete(db, id=post_id)
     
     if not deleted:
@@ -157,6 +222,9 @@ async def delete_blog_post(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Blog post not found"
         )
+    
+    search_service.remove('blog_post', post_id)
+    await response_cache.invalidate('blog_post')
 
 
 # ==================== IMÁGENES ====================
@@ -187,6 +255,8 @@ async def upload_blog_image(
         alt_text=alt_text
     )
     
+    await response_cache.invalidate('blog_post')
+    
     return ImageUploadResponse(
         message="Image uploaded successfully",
         image=image
@@ -216,6 +286,8 @@ async def update_blog_image_metadata(
             detail="Image not found"
         )
     
+    await response_cache.invalidate('blog_post')
+    
     return image
 
 
@@ -245,6 +317,8 @@ async def replace_blog_image(
             detail="Image not found"
         )
     
+    await response_cache.invalidate('blog_post')
+    
     return ImageUploadResponse(
         message="Image replaced successfully",
         image=image
@@ -270,10 +344,38 @@ async def delete_blog_image(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Image not found"
         )
+    
+    await response_cache.invalidate('blog_post')
 
 
 # ==================== COMENTARIOS ====================
 
+@router.get("/{post_id}/comments", response_model=CursorPage[CommentResponse])
+async def get_blog_comments(
+    post_id: int,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """Comentarios aprobados del post, paginados del más reciente al más antiguo"""
+    if not await blog_repository.exists(db, filters=[BlogPost.id == post_id]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Blog post not found"
+        )
+    
+    page = await comment_repository.get_approved_page(
+        db,
+        blog_post_id=post_id,
+        cursor=cursor,
+        limit=limit,
+        include_total=include_total
+    )
+    
+    return page.to_dict()
+
+
 @router.post("/{post_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 async def add_blog_comment(
     post_id: int,
@@ -296,20 +398,9 @@ async def add_blog_comment(
         approved=False
     )
     
+    # El admin recibe un resumen periódico (comment_summary_service)
     db.add(comment)
     await db.commit()
-    await db.refresh(comment)
-    
-    try:
-        await email_service.send_comment_notification(
-            commenter_name=comment_data.name,
-            commenter_email=comment_data.email,
-            comment_content=comment_data.content,
-            item_type="blog_post",
-            item_title=post.title
-        )
-    except Exception as e:
-        print(f"Failed to send email notification: {e}")
     
     return comment
 
@@ -341,4 +432,6 @@ async def add_blog_video(
         video_data.thumbnail_url
     )
     
+    await response_cache.invalidate('blog_post')
+    
     return video
\ No newline at end of file
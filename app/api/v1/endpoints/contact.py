@@ -1,13 +1,18 @@
 # app/api/v1/endpoints/contact.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 import logging
 
 from app.db.session import get_db
-from app.models.contact import ContactMessage
-from app.schemas.contact import ContactMessageCreate, MessageResponse
-from app.services.email import email_service
+from app.db.repositories.contact import contact_repository
+from app.models.contact import DeliveryStatusEnum
+from app.models.user import User
+from app.schemas.contact import ContactMessageCreate, ContactMessageResponse, MessageResponse
+from app.services.contact import contact_service
+from app.api.deps import get_current_admin
+from app.utils.pagination import CursorPage
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +25,10 @@ async def send_contact_message(
     db: AsyncSession = Depends(get_db)
 ):
     logger.info(f"Received contact message from {message_data.name} ({message_data.email})")
-    
+
     try:
-        message = ContactMessage(**message_data.model_dump())
-        db.add(message)
-        await db.commit()
-        await db.refresh(message)
+        # Los emails se envían desde el outbox, la respuesta no los espera
+        message = await contact_service.submit(db, message_data)
         logger.info(f"Message saved to database with ID: {message.id}")
     except Exception as e:
         logger.error(f"Failed to save message to database: {str(e)}")
@@ -34,54 +37,51 @@ async def send_contact_message(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save message"
         )
-    
-    admin_email_sent = False
-    try:
-        logger.info("Sending notification to admin...")
-        admin_email_sent = await email_service.send_contact_message_notification(
-            name=message_data.name,
-            email=message_data.email,
-            subject=message_data.subject,
-            message=message_data.message
-        )
-        
-        if admin_email_sent:
-            logger.info("Admin notification sent successfully")
-        else:
-            logger.warning("Admin notification failed")
-            
-    except Exception as e:
-        logger.error(f"Exception sending admin notification: {type(e).__name__}: {str(e)}")
-    
-    user_email_sent = False
-    try:
-        logger.info("Sending confirmation to user...")
-        user_email_sent = await email_service.send_confirmation_to_user(
-            name=message_data.name,
-            email=message_data.email,
-            subject=message_data.subject
-        )
-        
-        if user_email_sent:
-            logger.info("User confirmation sent successfully")
-        else:
-            logger.warning("User confirmation failed")
-            
-    except Exception as e:
-        logger.error(f"Exception sending user confirmation: {type(e).__name__}: {str(e)}")
-    
-    if admin_email_sent and user_email_sent:
-        return MessageResponse(
-            message="Message sent successfully",
-            detail="Thank you for contacting me. I'll get back to you soon!"
-        )
-    elif admin_email_sent or user_email_sent:
-        return MessageResponse(
-            message="Message sent with partial success",
-            detail="Your message was saved. Some notifications may have failed."
+
+    return MessageResponse(
+        message="Message sent successfully",
+        detail="Thank you for contacting me. I'll get back to you soon!"
+    )
+
+
+@router.get("/admin/messages", response_model=CursorPage[ContactMessageResponse])
+async def get_contact_messages(
+    delivery_status: Optional[DeliveryStatusEnum] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Mensajes de contacto con el estado de entrega de sus emails (solo admin).
+    delivery_status=failed devuelve los mensajes con algún email no entregado.
+    """
+    page = await contact_repository.get_messages_page(
+        db,
+        delivery_status=delivery_status,
+        cursor=cursor,
+        limit=limit,
+        include_total=include_total
+    )
+    return page.to_dict()
+
+
+@router.get("/admin/messages/{message_id}", response_model=ContactMessageResponse)
+async def get_contact_message(
+    message_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Obtener un mensaje de contacto y su estado de entrega (solo admin)
+    """
+    message = await contact_repository.get(db, message_id)
+
+    if not message:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Message not found"
         )
-    else:
-        return MessageResponse(
-            message="Message saved but notifications failed",
-            detail="Your message was saved. However, email notifications failed."
-        )
\ No newline at end of file
+
+    return message
@@ -1,38 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
+from pydantic import TypeAdapter
 
+from app.config import settings
 from app.db.session import get_db
 from app.db.repositories.project import project_repository
+from app.db.repositories.comment import comment_repository
 from app.models.user import User
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
     ProjectResponse,
     ProjectWithDetails,
+    ProjectListItem,
+    TechnologyFacet,
     CommentCreate,
     CommentResponse
 )
 from app.schemas.media import ImageResponse, ImageUploadResponse, ImageUpdate, VideoCreate, VideoResponse
 from app.services.media import media_service
-from app.services.email import email_service
 from app.services.notification import notification_service
+from app.services.reaction import reaction_service
+from app.services.search import search_service
+from app.core.response_cache import response_cache
 from app.api.deps import get_current_admin
-from app.models.project import Comment
+from app.models.project import Project, Comment
+from app.utils.pagination import CursorPage
 
 router = APIRouter()
 
+project_list_adapter = TypeAdapter(CursorPage[ProjectListItem])
+technology_facets_adapter = TypeAdapter(List[TechnologyFacet])
 
-@router.get("/", response_model=List[ProjectResponse])
+
+@router.get("/", response_model=CursorPage[ProjectListItem])
 async def get_projects(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     featured: Optional[bool] = None,
+    technology: Optional[str] = Query(None, max_length=100),
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    projects = await project_repository.get_all_ordered(
-        db, skip=skip, limit=limit, featured=featured
+    cache_key = response_cache.build_key(
+        'project',
+        cursor=cursor,
+        limit=limit,
+        featured=featured,
+        technology=technology.lower() if technology else None,
+        include_total=include_total
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    page = await project_repository.get_ordered_page(
+        db,
+        cursor=cursor,
+        limit=limit,
+        featured=featured,
+        technology=technology,
+        include_total=include_total
     )
+    projects = page.items
     
     if projects:
         project_ids = [p.id for p in projects]
@@ -43,7 +74,23 @@ async def get_projects(
         for project in projects:
             project.images = images_dict.get(project.id, [])
     
-    return projects
+    return await response_cache.store(cache_key, project_list_adapter, page.to_dict())
+
+
+@router.get("/technologies", response_model=List[TechnologyFacet])
+async def get_technology_facets(
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    db: AsyncSession = Depends(get_db)
+):
+    """Tecnologías usadas en proyectos con su número de proyectos, para filtros"""
+    cache_key = response_cache.build_key('project', facets='technologies', limit=limit)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    facets = await project_repository.get_technology_facets(db, limit=limit)
+    
+    return await response_cache.store(cache_key, technology_facets_adapter, facets)
 
 
 @router.get("/{project_id}", response_model=ProjectWithDetails)
@@ -60,7 +107,9 @@ async def get_project(
         )
     
     project.images = await media_service.get_images(db, project_id, 'project')
-    project.comments = [c for c in project.comments if c.approved]
+    await comment_repository.attach_latest(
+        db, project, project_id=project_id, limit=settings.DETAIL_COMMENTS_LIMIT
+    )
     
     return project
 
@@ -68,7 +117,6 @@ async def get_project(
 @router.post("/admin/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate,
-    background_tasks: BackgroundTasks,  # NUEVO
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
@@ -76,17 +124,15 @@ async def create_project(
     Crear nuevo proyecto.
     Notifica automáticamente a los suscriptores.
     """
-    project = await project_repository.create(db, obj_in=project_data)
-    project.images = []
+    project = await project_repository.create(db, obj_in=project_data, commit=False)
     
-    # NUEVO: Notificar a suscriptores sobre el nuevo proyecto
-    background_tasks.add_task(
-        notification_service.notify_new_project,
-        db,
-        project.title,
-        project.id,
-        project.description
-    )
+    # La notificación se encola en la misma transacción que el proyecto
+    await notification_service.enqueue_new_project(db, project.id)
+    
+    project = await project_repository.commit(db, project)
+    project.images = []
+    search_service.index_project(project)
+    await response_cache.invalidate('project')
     
     return project
 
@@ -112,6 +158,8 @@ async def update_project(
     
     project = await project_repository.update(db, db_obj=project, obj_in=project_data)
     project.images = await media_service.get_images(db, project_id, 'project')
+    search_service.index_project(project)
+    await response_cache.invalidate('project')
     
     # NO notificamos en actualizaciones, solo en creación
     
@@ -124,6 +172,9 @@ async def delete_project(
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
+    # Images and reactions go in the same transaction; blobs are deleted in the background
+    await media_service.delete_all_images(db, project_id, 'project', commit=False)
+    await reaction_service.delete_all_reactions(db, project_id, 'project')
     deleted = await project_repository.delete(db, id=project_id)
     
     if not deleted:
@@ -131,6 +182,9 @@ async def delete_project(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
+    
+    search_service.remove('project', project_id)
+    await response_cache.invalidate('project')
 
 
 # ==================== IMÁGENES ====================
@@ -161,6 +215,8 @@ async def upload_project_image(
         alt_text=alt_text
     )
     
+    await response_cache.invalidate('project')
+    
     return ImageUploadResponse(
         message="Image uploaded successfully",
         image=image
@@ -190,6 +246,8 @@ async def update_project_image_metadata(
             detail="Image not found"
         )
     
+    await response_cache.invalidate('project')
+    
     return image
 
 
@@ -219,6 +277,8 @@ async def replace_project_image(
             detail="Image not found"
         )
     
+    await response_cache.invalidate('project')
+    
     return ImageUploadResponse(
         message="Image replaced successfully",
         image=image
@@ -244,10 +304,38 @@ async def delete_project_image(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Image not found"
         )
+    
+    await response_cache.invalidate('project')
 
 
 # ==================== COMENTARIOS ====================
 
+@router.get("/{project_id}/comments", response_model=CursorPage[CommentResponse])
+async def get_project_comments(
+    project_id: int,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """Comentarios aprobados del proyecto, paginados del más reciente al más antiguo"""
+    if not await project_repository.exists(db, filters=[Project.id == project_id]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    page = await comment_repository.get_approved_page(
+        db,
+        project_id=project_id,
+        cursor=cursor,
+        limit=limit,
+        include_total=include_total
+    )
+    
+    return page.to_dict()
+
+
 @router.post("/{project_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 async def add_project_comment(
     project_id: int,
@@ -270,20 +358,9 @@ async def add_project_comment(
         approved=False
     )
     
+    # El admin recibe un resumen periódico (comment_summary_service)
     db.add(comment)
     await db.commit()
-    await db.refresh(comment)
-    
-    try:
-        await email_service.send_comment_notification(
-            commenter_name=comment_data.name,
-            commenter_email=comment_data.email,
-            comment_content=comment_data.content,
-            item_type="project",
-            item_title=project.title
-        )
-    except Exception as e:
-        print(f"Failed to send email notification: {e}")
     
     return comment
 
@@ -315,4 +392,6 @@ async def add_project_video(
         video_data.thumbnail_url
     )
     
+    await response_cache.invalidate('project')
+    
     return video
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import Optional
 
 from app.db.session import get_db
 from app.schemas.reaction import (
@@ -14,6 +14,7 @@ from app.schemas.reaction import (
 )
 from app.services.reaction import reaction_service
 from app.api.deps import get_client_ip_from_request
+from app.utils.pagination import CursorPage
 
 router = APIRouter()
 
@@ -64,16 +65,6 @@ async def get_reactions_summary(
     user_email: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
-    entity_exists = await reaction_service.verify_entity_exists(
-        db, entity_id, entity_type
-    )
-    
-    if not entity_exists:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"{entity_type.replace('_', ' ').title()} not found"
-        )
-    
     summary = await reaction_service.get_reaction_summary(
         db=db,
         entity_id=entity_id,
@@ -81,15 +72,22 @@ async def get_reactions_summary(
         user_email=user_email
     )
     
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{entity_type.replace('_', ' ').title()} not found"
+        )
+    
     return summary
 
 
-@router.get("/{entity_type}/{entity_id}", response_model=List[ReactionResponse])
+@router.get("/{entity_type}/{entity_id}", response_model=CursorPage[ReactionResponse])
 async def get_reactions(
     entity_type: str,
     entity_id: int,
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=500),
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
     entity_exists = await reaction_service.verify_entity_exists(
@@ -102,15 +100,16 @@ async def get_reactions(
             detail=f"{entity_type.replace('_', ' ').title()} not found"
         )
     
-    reactions = await reaction_service.get_all_reactions(
+    page = await reaction_service.get_all_reactions(
         db=db,
         entity_id=entity_id,
         entity_type=entity_type,
+        cursor=cursor,
         limit=limit,
-        offset=skip
+        include_total=include_total
     )
     
-    return reactions
+    return page.to_dict()
 
 
 @router.delete("/{entity_type}/{entity_id}", response_model=ReactionDeleteResponse)
@@ -0,0 +1,36 @@
+# app/api/v1/endpoints/search.py
+
+from fastapi import APIRouter, Query
+from typing import Optional, Literal
+
+from app.schemas.search import SearchResult
+from app.services.search import search_service
+from app.utils.pagination import PaginatedResponse
+
+router = APIRouter()
+
+
+@router.get("/", response_model=PaginatedResponse[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    type: Optional[Literal["blog_post", "project"]] = Query(None, description="Restrict to one entity type"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=50)
+):
+    """
+    Búsqueda de texto completo sobre posts publicados y proyectos,
+    ordenada por relevancia (BM25) y con coincidencias resaltadas
+    """
+    total, hits = search_service.search(
+        q,
+        entity_type=type,
+        offset=(page - 1) * page_size,
+        limit=page_size
+    )
+    
+    return PaginatedResponse[SearchResult].create(
+        items=[SearchResult.model_validate(hit) for hit in hits],
+        total=total,
+        page=page,
+        page_size=page_size
+    )
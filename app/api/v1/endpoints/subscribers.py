@@ -1,7 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-import secrets
+from typing import Optional
 
 from app.db.session import get_db
 from app.db.repositories.subscriber import subscriber_repository
@@ -9,11 +8,20 @@ from app.schemas.subscriber import (
     SubscriberCreate,
     SubscriberResponse,
     SubscriberVerify,
+    SubscriberPreferencesUpdate,
     UnsubscribeRequest
 )
 from app.services.email import email_service
+from app.services.outbox import outbox_service
+from app.core.security import (
+    SUBSCRIBER_TOKEN_UNSUBSCRIBE,
+    SUBSCRIBER_TOKEN_VERIFY,
+    create_subscriber_token,
+    verify_subscriber_token
+)
 from app.api.deps import get_current_admin
 from app.models.user import User
+from app.utils.pagination import CursorPage
 
 router = APIRouter()
 
@@ -21,7 +29,6 @@ router = APIRouter()
 @router.post("/subscribe", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def subscribe(
     subscriber_data: SubscriberCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -46,31 +53,37 @@ async def subscribe(
                 "verified": True
             }
         else:
-            background_tasks.add_task(
-                email_service.send_subscription_verification,
-                existing_subscriber.email,
-                existing_subscriber.verification_token
+            await outbox_service.enqueue(
+                db,
+                "subscription_verification",
+                email_service.build_subscription_verification(
+                    existing_subscriber.email,
+                    create_subscriber_token(existing_subscriber.id, SUBSCRIBER_TOKEN_VERIFY)
+                )
             )
+            await db.commit()
             return {
                 "message": "Verification email resent. Please check your inbox.",
                 "verified": False
             }
     
-    verification_token = secrets.token_urlsafe(32)
-    
     subscriber = await subscriber_repository.create(
         db,
-        obj_in=subscriber_data
+        obj_in=subscriber_data,
+        commit=False
     )
+    # El token firmado necesita el id
+    await db.flush()
     
-    subscriber.verification_token = verification_token
-    await db.commit()
-    
-    background_tasks.add_task(
-        email_service.send_subscription_verification,
-        subscriber.email,
-        verification_token
+    await outbox_service.enqueue(
+        db,
+        "subscription_verification",
+        email_service.build_subscription_verification(
+            subscriber.email,
+            create_subscriber_token(subscriber.id, SUBSCRIBER_TOKEN_VERIFY)
+        )
     )
+    await db.commit()
     
     return {
         "message": "Subscription created! Please check your email to verify.",
@@ -84,26 +97,28 @@ async def verify_subscription(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Verificar suscripción mediante token enviado por email
+    Verificar suscripción mediante token enviado por email.
+    El token se valida sin leer la base de datos.
     """
-    subscriber = await subscriber_repository.get_by_token(
-        db, verify_data.token
-    )
-
-    if not subscriber:
+    subscriber_id = verify_subscriber_token(verify_data.token, SUBSCRIBER_TOKEN_VERIFY)
+    
+    if subscriber_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invalid verification token"
         )
     
-    if subscriber.is_verified:
+    if not await subscriber_repository.verify_subscriber(db, subscriber_id):
+        if not await subscriber_repository.get(db, subscriber_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Invalid verification token"
+            )
         return {
             "message": "Email already verified!",
             "verified": True
         }
     
-    await subscriber_repository.verify_subscriber(db, subscriber)
-    
     return {
         "message": "Email verified successfully! You'll now receive updates.",
         "verified": True
@@ -116,61 +131,88 @@ async def unsubscribe(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Darse de baja de las notificaciones
+    Darse de baja de las notificaciones con el enlace firmado de cada email
     """
-    subscriber = await subscriber_repository.get_by_email(
-        db, unsubscribe_data.email
-    )
+    subscriber_id = verify_subscriber_token(unsubscribe_data.token, SUBSCRIBER_TOKEN_UNSUBSCRIBE)
     
-    if not subscriber:
+    if subscriber_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Email not found in subscription list"
+            detail="Invalid unsubscribe link"
         )
     
-    if not subscriber.is_active:
+    if not await subscriber_repository.deactivate_subscriber(db, subscriber_id):
         return {
             "message": "You are already unsubscribed"
         }
     
-    await subscriber_repository.deactivate_subscriber(db, subscriber)
-    
     return {
         "message": "You have been unsubscribed successfully. Sorry to see you go!"
     }
 
 
+@router.put("/preferences", response_model=dict)
+async def update_preferences(
+    preferences: SubscriberPreferencesUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Elegir cada cuánto recibir notificaciones: una por publicación
+    (immediate) o un resumen por hora o por día. Usa el token del enlace
+    de baja incluido en cada email.
+    """
+    subscriber_id = verify_subscriber_token(preferences.token, SUBSCRIBER_TOKEN_UNSUBSCRIBE)
+    
+    if subscriber_id is None or not await subscriber_repository.set_digest_frequency(
+        db, subscriber_id, preferences.digest_frequency
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invalid preferences link"
+        )
+    
+    return {
+        "message": "Your notification preferences have been updated.",
+        "digest_frequency": preferences.digest_frequency
+    }
+
 
-@router.get("/admin/all", response_model=List[SubscriberResponse])
+@router.get("/admin/all", response_model=CursorPage[SubscriberResponse])
 async def get_all_subscribers(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """
     Obtener todos los suscriptores (solo admin)
     """
-    subscribers = await subscriber_repository.get_multi(
-        db, skip=skip, limit=limit
+    page = await subscriber_repository.get_subscribers_page(
+        db, cursor=cursor, limit=limit, include_total=include_total
     )
-    return subscribers
+    return page.to_dict()
 
 
-@router.get("/admin/active", response_model=List[SubscriberResponse])
+@router.get("/admin/active", response_model=CursorPage[SubscriberResponse])
 async def get_active_subscribers(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """
     Obtener solo suscriptores activos y verificados (solo admin)
     """
-    subscribers = await subscriber_repository.get_active_verified(
-        db, skip=skip, limit=limit
+    page = await subscriber_repository.get_subscribers_page(
+        db,
+        cursor=cursor,
+        limit=limit,
+        active_verified_only=True,
+        include_total=include_total
     )
-    return subscribers
+    return page.to_dict()
 
 
 @router.delete("/admin/{subscriber_id}", status_code=status.HTTP_204_NO_CONTENT)
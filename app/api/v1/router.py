@@ -1,7 +1,7 @@
 # app/api/v1/router.py
 
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, profiles, projects, blog, contact, reactions, subscribers
+from app.api.v1.endpoints import auth, profiles, projects, blog, contact, reactions, subscribers, search
 
 api_router = APIRouter()
 
@@ -11,4 +11,5 @@ api_router.include_router(projects.router, prefix="/projects", tags=["Projects"]
 api_router.include_router(blog.router, prefix="/blog", tags=["Blog"])
 api_router.include_router(contact.router, prefix="/contact", tags=["Contact"])
 api_router.include_router(reactions.router, prefix="/reactions", tags=["Reactions"])
-api_router.include_router(subscribers.router, prefix="/subscribes", tags=["Subscribes"])
\ No newline at end of file
+api_router.include_router(subscribers.router, prefix="/subscribes", tags=["Subscribes"])
+api_router.include_router(search.router, prefix="/search", tags=["Search"])
\ No newline at end of file
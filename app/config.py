@@ -28,15 +28,90 @@ class Settings(BaseSettings):
     SENDER_EMAIL: str
     RECIPIENT_EMAIL: str
     
+    # Email
+    EMAIL_TRANSPORT: str = "azure"
+    EMAIL_POLLING_INTERVAL_SECONDS: float = 1.0
+    EMAIL_TEMPLATE_CACHE_SIZE: int = 256
+    
+    # Email outbox
+    OUTBOX_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 20
+    OUTBOX_CONCURRENCY: int = 5
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 5
+    OUTBOX_MAX_ATTEMPTS: int = 6
+    OUTBOX_BACKOFF_BASE_SECONDS: float = 30
+    OUTBOX_BACKOFF_MAX_SECONDS: float = 3600
+    OUTBOX_LEASE_SECONDS: int = 300
+    # Bulk sends only, 0 disables the limit. It sets the fan-out time: at 10/s
+    # 1,000 subscribers take ~2 minutes and 50,000 ~83 minutes. The default is
+    # conservative for a new email provider quota; set it to the rate the
+    # provider allows (100/s sends 50,000 in ~8 minutes) and
+    # SUBSCRIBER_SEND_CONCURRENCY to about rate x send latency.
+    OUTBOX_SEND_RATE_PER_SECOND: float = 10.0
+    OUTBOX_SEND_BURST: int = 10
+    SUBSCRIBER_NOTIFICATION_BATCH_SIZE: int = 50
+    SUBSCRIBER_SEND_CONCURRENCY: int = 5
+    
+    # Subscribers
+    SUBSCRIBER_VERIFY_TOKEN_EXPIRE_HOURS: int = 48
+    SUBSCRIBER_UNSUBSCRIBE_TOKEN_EXPIRE_DAYS: int = 365
+    
+    # Subscriber digests
+    DIGEST_ENABLED: bool = True
+    DIGEST_CHECK_INTERVAL_SECONDS: int = 300
+    
+    # Comments
+    DETAIL_COMMENTS_LIMIT: int = 5  # latest approved comments embedded in project/post details
+    
+    # Comment moderation summaries
+    COMMENT_SUMMARY_INTERVAL_SECONDS: int = 300
+    COMMENT_SUMMARY_LATEST: int = 10
+    
     # CORS
     FRONTEND_URL: str
     ALLOWED_ORIGINS: Union[str, List[str]]
     
+    # Storage
+    STORAGE_BACKEND: str = "azure"  # azure | local
+    STORAGE_UPLOAD_BLOCK_SIZE: int = 4 * 1024 * 1024
+    STORAGE_DELETE_BATCH_CONCURRENCY: int = 4
+    LOCAL_STORAGE_PATH: str = "media"
+    LOCAL_STORAGE_URL_PATH: str = "/media"
+    LOCAL_STORAGE_PUBLIC_URL: Optional[str] = None  # defaults to LOCAL_STORAGE_URL_PATH
+    
+    # Image variants (srcset)
+    IMAGE_VARIANTS_ENABLED: bool = True
+    IMAGE_VARIANT_WIDTHS: Union[str, List[int]] = [320, 640, 1280]
+    IMAGE_VARIANT_FORMAT: str = "webp"  # webp | avif | jpeg
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_PROCESSING_WORKERS: int = 2
+    
     # Azure Blob Storage
-    AZURE_STORAGE_CONNECTION_STRING: str
+    AZURE_STORAGE_CONNECTION_STRING: Optional[str] = None
     AZURE_STORAGE_CONTAINER_NAME: str = "portfolio-images-2025"
     AZURE_STORAGE_ACCOUNT_NAME: Optional[str] = None
     
+    # Cache
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_DEFAULT_TTL_SECONDS: int = 300
+    CACHE_SWEEP_INTERVAL_SECONDS: int = 60
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    
+    # Search
+    # Each process keeps its own index and only indexes the writes it serves;
+    # other workers and replicas pick them up on the next periodic rebuild
+    SEARCH_REBUILD_INTERVAL_SECONDS: int = 300
+    
+    # Blog views
+    VIEW_COUNTER_FLUSH_INTERVAL_SECONDS: int = 30
+    VIEW_COUNTER_FLUSH_THRESHOLD: int = 500
+    
+    # Metrics
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: Optional[str] = None  # scrapers send "Authorization: Bearer <token>"
+    
     # App
     APP_NAME: str = "Portfolio API"
     APP_VERSION: str = "1.0.0"
@@ -51,6 +126,15 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(',')]
         return v
     
+    @field_validator('IMAGE_VARIANT_WIDTHS', mode='before')
+    @classmethod
+    def parse_image_variant_widths(cls, v):
+        if isinstance(v, str):
+            return [int(width) for width in v.split(',') if width.strip()]
+        if isinstance(v, int):
+            return [v]
+        return v
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
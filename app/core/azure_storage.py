@@ -1,258 +1,205 @@
-from azure.storage.blob import BlobServiceClient, ContentSettings, generate_blob_sas, BlobSasPermissions
-from azure.core.exceptions import ResourceNotFoundError, AzureError
-from fastapi import UploadFile, HTTPException, status
+from azure.storage.blob import BlobBlock, ContentSettings, generate_blob_sas, BlobSasPermissions
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+from fastapi import UploadFile
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
-import uuid
-import os
-from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import base64
+import logging
 
-from app.config import settings
+from app.core.storage import BatchDeleteError, ObjectExistsError, StorageBackend
 
+logger = logging.getLogger(__name__)
 
-class AzureStorageService:
-    """Service for managing Azure Blob Storage operations"""
-    
-    ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'}
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-    
-    def __init__(self):
-        """Initialize Azure Blob Service Client"""
-        try:
-            self.blob_service_client = BlobServiceClient.from_connection_string(
-                settings.AZURE_STORAGE_CONNECTION_STRING
-            )
-            self.container_name = settings.AZURE_STORAGE_CONTAINER_NAME
-            self._ensure_container_exists()
-        except Exception as e:
-            raise RuntimeError(f"Failed to initialize Azure Storage: {str(e)}")
-    
-    def _ensure_container_exists(self):
+
+class AzureBlobStorageBackend(StorageBackend):
+    """
+    Azure Blob Storage backend built on the SDK's aio client (aiohttp
+    transport), so network I/O never blocks the event loop. The client is
+    created on first use and the container is checked in start().
+    """
+
+    name = "azure"
+
+    # Sub-requests allowed in one Blob batch request
+    MAX_BATCH_SIZE = 256
+
+    def __init__(
+        self,
+        connection_string: Optional[str],
+        container_name: str,
+        *,
+        block_size: int = 4 * 1024 * 1024,
+        batch_concurrency: int = 4,
+        client=None
+    ):
+        self.connection_string = connection_string
+        self.container_name = container_name
+        self.block_size = block_size
+        self.batch_concurrency = batch_concurrency
+        self._client = client
+
+    def _get_client(self):
+        if self._client is None:
+            if not self.connection_string:
+                raise RuntimeError("AZURE_STORAGE_CONNECTION_STRING is not set")
+            from azure.storage.blob.aio import BlobServiceClient
+            self._client = BlobServiceClient.from_connection_string(self.connection_string)
+        return self._client
+
+    def _blob_client(self, name: str):
+        return self._get_client().get_blob_client(container=self.container_name, blob=name)
+
+    @staticmethod
+    def _content_settings(content_type: str) -> ContentSettings:
+        return ContentSettings(
+            content_type=content_type,
+            cache_control='public, max-age=31536000'  # Cache for 1 year
+        )
+
+    @staticmethod
+    def _block_id(index: int) -> str:
+        # Block ids must be base64 and all the same length within a blob
+        return base64.b64encode(f"{index:08d}".encode()).decode()
+
+    async def start(self) -> None:
         """Ensure the storage container exists, create if not"""
         try:
-            container_client = self.blob_service_client.get_container_client(self.container_name)
-            if not container_client.exists():
-                container_client.create_container(public_access='blob')
+            container_client = self._get_client().get_container_client(self.container_name)
+            if not await container_client.exists():
+                await container_client.create_container(public_access='blob')
         except Exception as e:
-            print(f"Warning: Could not verify/create container: {e}")
-    
-    def _validate_file(self, file: UploadFile) -> None:
-        """Validate file type and size"""
-        # Check file extension
-        file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in self.ALLOWED_EXTENSIONS:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid file type. Allowed: {', '.join(self.ALLOWED_EXTENSIONS)}"
-            )
-        
-        # Check file size (read first chunk to verify it's not empty)
-        file.file.seek(0, 2)  # Seek to end
-        file_size = file.file.tell()
-        file.file.seek(0)  # Reset to beginning
-        
-        if file_size == 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File is empty"
-            )
-        
-        if file_size > self.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File too large. Maximum size: {self.MAX_FILE_SIZE / 1024 / 1024}MB"
+            logger.warning(f"Could not verify/create container: {e}")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def put(self, name: str, data: bytes, content_type: str) -> str:
+        blob_client = self._blob_client(name)
+        try:
+            await blob_client.upload_blob(
+                data,
+                content_settings=self._content_settings(content_type),
+                overwrite=False  # Prevent accidental overwrites
             )
-    
-    def _generate_blob_name(self, original_filename: str, entity_type: str, entity_id: int) -> str:
-        """Generate unique blob name with structure: entity_type/entity_id/uuid_filename"""
-        file_ext = Path(original_filename).suffix.lower()
-        unique_id = uuid.uuid4().hex[:12]
-        timestamp = datetime.utcnow().strftime('%Y%m%d')
-        
-        # Clean original filename
-        clean_name = Path(original_filename).stem
-        clean_name = "".join(c for c in clean_name if c.isalnum() or c in ('-', '_'))[:50]
-        
-        return f"{entity_type}/{entity_id}/{timestamp}_{unique_id}_{clean_name}{file_ext}"
-    
-    def _get_content_type(self, filename: str) -> str:
-        """Get content type based on file extension"""
-        ext_to_content_type = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp',
-            '.svg': 'image/svg+xml'
-        }
-        file_ext = Path(filename).suffix.lower()
-        return ext_to_content_type.get(file_ext, 'application/octet-stream')
-    
-    async def upload_image(
-        self,
-        file: UploadFile,
-        entity_type: str,
-        entity_id: int
-    ) -> Tuple[str, str]:
+        except ResourceExistsError:
+            raise ObjectExistsError(name)
+        return blob_client.url
+
+    async def put_stream(self, name: str, file: UploadFile, content_type: str) -> str:
         """
-        Upload image to Azure Blob Storage
-        
-        Args:
-            file: The uploaded file
-            entity_type: Type of entity (project, blog_post, profile)
-            entity_id: ID of the entity
-            
-        Returns:
-            Tuple of (blob_url, blob_name)
+        Copy the upload to the blob one block at a time, so at most
+        block_size bytes of the file are in memory. Files that fit in one
+        block are sent with a single request.
         """
+        blob_client = self._blob_client(name)
         try:
-            # Validate file
-            self._validate_file(file)
-            
-            # Generate blob name
-            blob_name = self._generate_blob_name(file.filename, entity_type, entity_id)
-            
-            # Get blob client
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name,
-                blob=blob_name
-            )
-            
-            # Set content settings
-            content_settings = ContentSettings(
-                content_type=self._get_content_type(file.filename),
-                cache_control='public, max-age=31536000'  # Cache for 1 year
-            )
-            
-            # Read and upload file
-            file_content = await file.read()
-            
-            blob_client.upload_blob(
-                file_content,
+            await self._put_blocks(blob_client, file, self._content_settings(content_type))
+        except (ResourceExistsError, ResourceModifiedError):
+            # upload_blob fails with 409, the IfMissing commit with 409 or 412
+            raise ObjectExistsError(name)
+        return blob_client.url
+
+    async def _put_blocks(self, blob_client, file: UploadFile, content_settings: ContentSettings) -> None:
+        await file.seek(0)
+        chunk = await file.read(self.block_size)
+
+        if len(chunk) < self.block_size:
+            await blob_client.upload_blob(
+                chunk,
                 content_settings=content_settings,
                 overwrite=False  # Prevent accidental overwrites
             )
-            
-            # Get the public URL
-            blob_url = blob_client.url
-            
-            return blob_url, blob_name
-            
-        except HTTPException:
-            raise
-        except AzureError as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Azure Storage error: {str(e)}"
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to upload image: {str(e)}"
-            )
-    
-    async def delete_image(self, blob_name: str) -> bool:
-        """
-        Delete image from Azure Blob Storage
-        
-        Args:
-            blob_name: Name of the blob to delete
-            
-        Returns:
-            True if deleted successfully, False if not found
-        """
+            return None
+
+        block_list = []
+        while chunk:
+            block_id = self._block_id(len(block_list))
+            await blob_client.stage_block(block_id, chunk, length=len(chunk))
+            block_list.append(BlobBlock(block_id=block_id))
+            # Drop the staged block before reading the next one
+            del chunk
+            chunk = await file.read(self.block_size)
+
+        # Uncommitted blocks are discarded by Azure if this never runs
+        await blob_client.commit_block_list(
+            block_list,
+            content_settings=content_settings,
+            match_condition=MatchConditions.IfMissing  # Prevent accidental overwrites
+        )
+        return None
+
+    async def delete(self, name: str) -> bool:
         try:
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name,
-                blob=blob_name
-            )
-            
-            blob_client.delete_blob()
+            await self._blob_client(name).delete_blob()
             return True
-            
         except ResourceNotFoundError:
             return False
-        except AzureError as e:
-            print(f"Azure error deleting blob {blob_name}: {e}")
-            return False
-        except Exception as e:
-            print(f"Error deleting blob {blob_name}: {e}")
-            return False
-    
-    async def delete_images_batch(self, blob_names: list[str]) -> dict[str, bool]:
+
+    async def _delete_sub_batch(
+        self,
+        names: List[str],
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[Dict[str, bool], List[str]]:
+        results, failed = {}, []
+        async with semaphore:
+            try:
+                container_client = self._get_client().get_container_client(self.container_name)
+                responses = await container_client.delete_blobs(*names, raise_on_any_failure=False)
+                # One response per blob, in request order
+                index = 0
+                async for response in responses:
+                    name = names[index]
+                    index += 1
+                    if response.status_code in (200, 202):
+                        results[name] = True
+                    elif response.status_code == 404:
+                        results[name] = False
+                    else:
+                        logger.warning(f"Error deleting blob {name}: HTTP {response.status_code}")
+                        failed.append(name)
+            except Exception as e:
+                logger.warning(f"Blob batch delete of {len(names)} blobs failed: {e}")
+                failed.extend(name for name in names if name not in results and name not in failed)
+        return results, failed
+
+    async def delete_batch(self, names: List[str]) -> Dict[str, bool]:
         """
-        Delete multiple images from Azure Blob Storage
-        
-        Args:
-            blob_names: List of blob names to delete
-            
-        Returns:
-            Dictionary mapping blob_name to deletion success status
+        Delete through the Blob batch API: one request per MAX_BATCH_SIZE
+        blobs, up to batch_concurrency requests in flight
         """
-        results = {}
-        for blob_name in blob_names:
-            results[blob_name] = await self.delete_image(blob_name)
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        parts = await asyncio.gather(*(
+            self._delete_sub_batch(names[start:start + self.MAX_BATCH_SIZE], semaphore)
+            for start in range(0, len(names), self.MAX_BATCH_SIZE)
+        ))
+
+        results, failed = {}, []
+        for part_results, part_failed in parts:
+            results.update(part_results)
+            failed.extend(part_failed)
+
+        if failed:
+            raise BatchDeleteError(results, failed)
         return results
-    
-    def extract_blob_name_from_url(self, url: str) -> Optional[str]:
-        """
-        Extract blob name from Azure blob URL
-        
-        Args:
-            url: Full blob URL
-            
-        Returns:
-            Blob name or None if not a valid Azure URL
-        """
-        try:
-            # Azure blob URLs format: https://{account}.blob.core.windows.net/{container}/{blob_name}
-            if 'blob.core.windows.net' not in url:
-                return None
-            
-            parts = url.split(f'/{self.container_name}/')
-            if len(parts) == 2:
-                # Remove query parameters if present
-                blob_name = parts[1].split('?')[0]
-                return blob_name
-            
-            return None
-        except Exception:
-            return None
-    
-    def generate_sas_url(self, blob_name: str, expiry_hours: int = 1) -> str:
-        """
-        Generate a SAS URL for temporary access (useful for private containers)
-        
-        Args:
-            blob_name: Name of the blob
-            expiry_hours: Hours until the SAS token expires
-            
-        Returns:
-            URL with SAS token
-        """
-        try:
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name,
-                blob=blob_name
-            )
-            
-            sas_token = generate_blob_sas(
-                account_name=self.blob_service_client.account_name,
-                container_name=self.container_name,
-                blob_name=blob_name,
-                account_key=self.blob_service_client.credential.account_key,
-                permission=BlobSasPermissions(read=True),
-                expiry=datetime.utcnow() + timedelta(hours=expiry_hours)
-            )
-            
-            return f"{blob_client.url}?{sas_token}"
-            
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to generate SAS URL: {str(e)}"
-            )
 
+    async def exists(self, name: str) -> bool:
+        return await self._blob_client(name).exists()
+
+    def url_for(self, name: str) -> str:
+        return self._blob_client(name).url
 
-# Singleton instance
-azure_storage_service = AzureStorageService()
\ No newline at end of file
+    def signed_url(self, name: str, expires_in: timedelta) -> str:
+        client = self._get_client()
+        sas_token = generate_blob_sas(
+            account_name=client.account_name,
+            container_name=self.container_name,
+            blob_name=name,
+            account_key=client.credential.account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.utcnow() + expires_in
+        )
+        return f"{self.url_for(name)}?{sas_token}"
@@ -1,48 +1,228 @@
 # app/core/cache.py
 
-from typing import Optional, Any
-import json
+from typing import Optional, Any, Dict
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import timedelta
+import asyncio
+import json
+import logging
+import sys
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    size: int
+    expires_at: Optional[float]
 
 
 class CacheService:
-    def __init__(self):
-        self._cache = {}
-        self._enabled = False
-    
+    """
+    In-process cache with per-key TTL and an LRU eviction policy.
+
+    Entries are bounded both by count (max_entries) and by an approximate
+    byte budget (max_bytes). Expired entries are dropped lazily on read and
+    periodically by the background sweeper started from the app lifespan.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: Optional[timedelta] = timedelta(minutes=5),
+        enabled: bool = True
+    ):
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._enabled = enabled
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._current_bytes = 0
+        self._sweeper_task: Optional[asyncio.Task] = None
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
     def enable(self):
         self._enabled = True
-    
+
     def disable(self):
         self._enabled = False
-    
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    # ==================== INTERNAL ====================
+
+    @staticmethod
+    def _estimate_size(value: Any) -> int:
+        """Approximate memory footprint of a cached value in bytes"""
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return len(value)
+        if isinstance(value, str):
+            return len(value.encode('utf-8'))
+        try:
+            return len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return sys.getsizeof(value)
+
+    def _is_expired(self, entry: _CacheEntry, now: float) -> bool:
+        return entry.expires_at is not None and entry.expires_at <= now
+
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._current_bytes -= entry.size
+
+    def _evict_if_needed(self) -> None:
+        while self._cache and (
+            len(self._cache) > self._max_entries
+            or self._current_bytes > self._max_bytes
+        ):
+            key, entry = self._cache.popitem(last=False)
+            self._current_bytes -= entry.size
+            self._evictions += 1
+
+    # ==================== PUBLIC API ====================
+
     async def get(self, key: str) -> Optional[Any]:
         if not self._enabled:
             return None
-        return self._cache.get(key)
-    
+
+        entry = self._cache.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if self._is_expired(entry, time.monotonic()):
+            self._remove(key)
+            self._expirations += 1
+            self._misses += 1
+            return None
+
+        self._cache.move_to_end(key)
+        self._hits += 1
+        return entry.value
+
     async def set(
-        self, 
-        key: str, 
-        value: Any, 
+        self,
+        key: str,
+        value: Any,
         expire: Optional[timedelta] = None
     ) -> None:
         if not self._enabled:
             return
-        self._cache[key] = value
-    
-    async def delete(self, key: str) -> None:
-        if not self._enabled:
+
+        ttl = expire if expire is not None else self._default_ttl
+        expires_at = time.monotonic() + ttl.total_seconds() if ttl else None
+        size = self._estimate_size(value)
+
+        if size > self._max_bytes:
+            # A single value larger than the whole budget would evict everything
+            self._remove(key)
             return
-        self._cache.pop(key, None)
-    
+
+        self._remove(key)
+        self._cache[key] = _CacheEntry(value=value, size=size, expires_at=expires_at)
+        self._current_bytes += size
+        self._evict_if_needed()
+
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with prefix, returns the number removed"""
+        keys = [key for key in self._cache if key.startswith(prefix)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
     async def clear(self) -> None:
         self._cache.clear()
-    
+        self._current_bytes = 0
+
     async def exists(self, key: str) -> bool:
         if not self._enabled:
             return False
-        return key in self._cache
+        entry = self._cache.get(key)
+        if entry is None:
+            return False
+        if self._is_expired(entry, time.monotonic()):
+            self._remove(key)
+            self._expirations += 1
+            return False
+        return True
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry, returns the number removed"""
+        now = time.monotonic()
+        expired = [key for key, entry in self._cache.items() if self._is_expired(entry, now)]
+        for key in expired:
+            self._remove(key)
+        self._expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "enabled": self._enabled,
+            "entries": len(self._cache),
+            "bytes": self._current_bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations
+        }
+
+    def reset_stats(self) -> None:
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    # ==================== SWEEPER ====================
+
+    async def _sweep_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = self.purge_expired()
+                if removed:
+                    logger.debug(f"Cache sweeper removed {removed} expired entries")
+            except Exception as e:
+                logger.error(f"Cache sweeper failed: {str(e)}")
+
+    def start_sweeper(self, interval: float) -> None:
+        if self._sweeper_task is None or self._sweeper_task.done():
+            self._sweeper_task = asyncio.create_task(self._sweep_forever(interval))
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper_task is None:
+            return
+        self._sweeper_task.cancel()
+        try:
+            await self._sweeper_task
+        except asyncio.CancelledError:
+            pass
+        self._sweeper_task = None
 
 
-cache_service = CacheService()
\ No newline at end of file
+cache_service = CacheService(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    default_ttl=timedelta(seconds=settings.CACHE_DEFAULT_TTL_SECONDS),
+    enabled=settings.CACHE_ENABLED
+)
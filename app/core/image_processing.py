@@ -0,0 +1,169 @@
+# app/core/image_processing.py
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Sequence, Union
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Variant format -> (Pillow format, content type, file extension)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "image/webp", ".webp"),
+    "avif": ("AVIF", "image/avif", ".avif"),
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+}
+
+# Uploads are copied to disk for the workers in chunks of this size
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class ImageVariant:
+    width: int
+    height: int
+    data: bytes
+
+
+@dataclass
+class ProcessedImage:
+    """Dimensions of the original and its encoded variants, narrowest first"""
+    width: int
+    height: int
+    variants: List[ImageVariant] = field(default_factory=list)
+
+
+def render_variants(
+    source: Union[bytes, str],
+    widths: Sequence[int],
+    pil_format: str,
+    quality: int
+) -> ProcessedImage:
+    """
+    Decode an image (its bytes or a file path) and encode one resized copy
+    per width narrower than the original (images are never upscaled).
+    Animated images only report their size. Runs in a worker process.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(source) if isinstance(source, bytes) else source) as original:
+        if getattr(original, "is_animated", False):
+            return ProcessedImage(*original.size)
+        # Apply the camera orientation, the variants carry no EXIF
+        image = ImageOps.exif_transpose(original)
+
+    if pil_format == "JPEG" or not image.has_transparency_data:
+        image = image.convert("RGB")
+    elif image.mode != "RGBA":
+        image = image.convert("RGBA")
+
+    width, height = image.size
+    processed = ProcessedImage(width, height)
+
+    for target in sorted(set(widths)):
+        if target >= width:
+            break
+        size = (target, max(1, round(height * target / width)))
+        variant = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+        buffer = BytesIO()
+        variant.save(buffer, format=pil_format, quality=quality)
+        processed.variants.append(ImageVariant(size[0], size[1], buffer.getvalue()))
+
+    return processed
+
+
+def _spool_to_disk(file: BinaryIO) -> str:
+    file.seek(0)
+    spooled = tempfile.NamedTemporaryFile(prefix="upload-", delete=False)
+    try:
+        with spooled:
+            shutil.copyfileobj(file, spooled, SPOOL_CHUNK_SIZE)
+    except BaseException:
+        os.unlink(spooled.name)
+        raise
+    return spooled.name
+
+
+class ImageProcessor:
+    """
+    Builds the resized variants (srcset) of uploaded images. Pillow work is
+    CPU bound and holds the GIL, so it runs in a process pool that is created
+    on first use and shut down from the app lifespan.
+    """
+
+    # Vector images are served as uploaded
+    SKIPPED_EXTENSIONS = {'.svg'}
+
+    def __init__(
+        self,
+        widths: Sequence[int],
+        image_format: str = "webp",
+        *,
+        quality: int = 80,
+        workers: int = 2,
+        enabled: bool = True,
+        executor: Optional[Executor] = None
+    ):
+        if image_format not in VARIANT_FORMATS:
+            raise ValueError(f"Unknown image variant format: {image_format}")
+
+        self.widths = sorted(set(widths))
+        self.pil_format, self.content_type, self.extension = VARIANT_FORMATS[image_format]
+        self.quality = quality
+        self.workers = workers
+        self.enabled = enabled
+        self._executor = executor
+
+    def supports(self, filename: str) -> bool:
+        return self.enabled and bool(self.widths) and Path(filename).suffix.lower() not in self.SKIPPED_EXTENSIONS
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def process(self, source: Union[bytes, str]) -> ProcessedImage:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            render_variants,
+            source,
+            self.widths,
+            self.pil_format,
+            self.quality
+        )
+
+    async def process_file(self, file: BinaryIO) -> ProcessedImage:
+        """
+        Process an open file without loading it: it is copied in chunks to a
+        named temporary file that the worker opens, so only the path is sent
+        to the pool
+        """
+        path = await asyncio.to_thread(_spool_to_disk, file)
+        try:
+            return await self.process(path)
+        finally:
+            await asyncio.to_thread(os.unlink, path)
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown)
+            self._executor = None
+
+
+image_processor = ImageProcessor(
+    settings.IMAGE_VARIANT_WIDTHS,
+    settings.IMAGE_VARIANT_FORMAT,
+    quality=settings.IMAGE_VARIANT_QUALITY,
+    workers=settings.IMAGE_PROCESSING_WORKERS,
+    enabled=settings.IMAGE_VARIANTS_ENABLED
+)
@@ -0,0 +1,63 @@
+# app/core/response_cache.py
+
+from typing import Any, Optional
+from datetime import timedelta
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.core.cache import CacheService, cache_service
+
+
+class ResponseCache:
+    """
+    Caches already-serialized JSON responses for public list endpoints.
+
+    Hits are returned as raw bytes, so neither the database nor Pydantic
+    validation is touched. Every write that can change a cached list calls
+    invalidate() for its entity type.
+    """
+
+    PREFIXES = {
+        "blog_post": "blog:list:",
+        "project": "projects:list:"
+    }
+
+    def __init__(self, cache: CacheService, ttl: timedelta):
+        self.cache = cache
+        self.ttl = ttl
+
+    def build_key(self, entity_type: str, **params: Any) -> str:
+        parts = [f"{name}={params[name]}" for name in sorted(params)]
+        return self.PREFIXES[entity_type] + "&".join(parts)
+
+    async def get(self, key: str) -> Optional[Response]:
+        body = await self.cache.get(key)
+        if body is None:
+            return None
+        return self._response(body, "HIT")
+
+    async def store(self, key: str, adapter: TypeAdapter, data: Any) -> Response:
+        """Validate data once, cache the JSON bytes and return them as a response"""
+        body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+        await self.cache.set(key, body, expire=self.ttl)
+        return self._response(body, "MISS")
+
+    async def invalidate(self, entity_type: str) -> None:
+        prefix = self.PREFIXES.get(entity_type)
+        if prefix:
+            await self.cache.delete_prefix(prefix)
+
+    @staticmethod
+    def _response(body: bytes, status: str) -> Response:
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"X-Cache": status}
+        )
+
+
+response_cache = ResponseCache(
+    cache_service,
+    ttl=timedelta(seconds=settings.RESPONSE_CACHE_TTL_SECONDS)
+)
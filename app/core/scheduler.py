@@ -0,0 +1,76 @@
+# app/core/scheduler.py
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+PeriodicJob = Callable[[], Awaitable[object]]
+
+
+@dataclass
+class _ScheduledJob:
+    name: str
+    func: PeriodicJob
+    interval: float
+    task: Optional[asyncio.Task] = None
+
+
+class PeriodicScheduler:
+    """
+    In-process scheduler for periodic jobs.
+
+    Each job runs in its own task every `interval` seconds, measured from
+    the end of the previous run, so a slow run never overlaps the next one.
+    Exceptions are logged and the job keeps its schedule. Jobs must be safe
+    to run from several processes at once; the scheduler does not
+    coordinate between instances.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, _ScheduledJob] = {}
+
+    def add_job(self, name: str, func: PeriodicJob, interval: float) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if name in self._jobs:
+            raise ValueError(f"Periodic job already registered: {name}")
+        self._jobs[name] = _ScheduledJob(name, func, interval)
+
+    @property
+    def jobs(self) -> frozenset:
+        return frozenset(self._jobs)
+
+    async def run_job(self, name: str) -> None:
+        """Run a job once, right now, logging instead of raising"""
+        job = self._jobs[name]
+        try:
+            await job.func()
+        except Exception as e:
+            logger.error(f"Periodic job {name} failed: {str(e)}")
+
+    async def _run_forever(self, job: _ScheduledJob) -> None:
+        while True:
+            await asyncio.sleep(job.interval)
+            await self.run_job(job.name)
+
+    def start(self) -> None:
+        for job in self._jobs.values():
+            if job.task is None or job.task.done():
+                job.task = asyncio.create_task(self._run_forever(job))
+
+    async def stop(self) -> None:
+        for job in self._jobs.values():
+            if job.task is None:
+                continue
+            job.task.cancel()
+            try:
+                await job.task
+            except asyncio.CancelledError:
+                pass
+            job.task = None
+
+
+scheduler = PeriodicScheduler()
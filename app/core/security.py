@@ -5,6 +5,10 @@ from typing import Optional, Any
 from jose import jwt
 from passlib.context import CryptContext
 from app.config import settings
+import base64
+import hashlib
+import hmac
+import time
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -46,4 +50,50 @@ def decode_token(token: str) -> Optional[dict]:
         )
         return payload
     except jwt.JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+# Subscriber tokens: "<subscriber id>.<expiry>.<HMAC of purpose, id and expiry>"
+SUBSCRIBER_TOKEN_VERIFY = "verify"
+SUBSCRIBER_TOKEN_UNSUBSCRIBE = "unsubscribe"
+
+
+def _subscriber_token_ttl(purpose: str) -> timedelta:
+    if purpose == SUBSCRIBER_TOKEN_VERIFY:
+        return timedelta(hours=settings.SUBSCRIBER_VERIFY_TOKEN_EXPIRE_HOURS)
+    if purpose == SUBSCRIBER_TOKEN_UNSUBSCRIBE:
+        return timedelta(days=settings.SUBSCRIBER_UNSUBSCRIBE_TOKEN_EXPIRE_DAYS)
+    raise ValueError(f"Unknown subscriber token purpose: {purpose}")
+
+
+def _subscriber_token_signature(purpose: str, subscriber_id: int, expire: int) -> str:
+    message = f"subscriber:{purpose}:{subscriber_id}:{expire}".encode()
+    digest = hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def create_subscriber_token(
+    subscriber_id: int,
+    purpose: str,
+    expires_delta: Optional[timedelta] = None
+) -> str:
+    """
+    Signed token for a subscriber link (verify or unsubscribe). It carries
+    everything needed to validate it, so nothing is stored per token.
+    """
+    expire = int(time.time() + (expires_delta or _subscriber_token_ttl(purpose)).total_seconds())
+    return f"{subscriber_id}.{expire}.{_subscriber_token_signature(purpose, subscriber_id, expire)}"
+
+
+def verify_subscriber_token(token: str, purpose: str) -> Optional[int]:
+    """Return the subscriber id if the token is authentic, unexpired and for this purpose"""
+    try:
+        subscriber_id, expire, signature = token.split(".")
+        subscriber_id, expire = int(subscriber_id), int(expire)
+    except ValueError:
+        return None
+
+    expected = _subscriber_token_signature(purpose, subscriber_id, expire)
+    if not hmac.compare_digest(signature, expected) or expire < time.time():
+        return None
+    return subscriber_id
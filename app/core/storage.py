@@ -0,0 +1,384 @@
+# app/core/storage.py
+
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+
+from fastapi import UploadFile, HTTPException, status
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectExistsError(Exception):
+    """put/put_stream target name is already taken; objects are never overwritten"""
+
+
+class BatchDeleteError(Exception):
+    """Some objects of a batch could not be deleted; the rest are in results"""
+
+    def __init__(self, results: Dict[str, bool], failed: List[str]):
+        super().__init__(f"{len(failed)} of {len(results) + len(failed)} objects could not be deleted")
+        self.results = results
+        self.failed = failed
+
+
+class StorageBackend(ABC):
+    """
+    Where uploaded media is stored. Objects are addressed by a name such as
+    'project/1/20250101_ab12cd_photo.jpg' and served from url_for(name).
+
+    Constructors never do I/O; start() runs once in the app lifespan.
+    """
+
+    name = "unknown"
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def put(self, name: str, data: bytes, content_type: str) -> str:
+        """Store a small object held in memory, returns its URL. Raises ObjectExistsError if name is taken"""
+
+    @abstractmethod
+    async def put_stream(self, name: str, file: UploadFile, content_type: str) -> str:
+        """
+        Store an upload by copying it in blocks from its spool file, returns
+        its URL. Raises ObjectExistsError if name is taken
+        """
+
+    @abstractmethod
+    async def delete(self, name: str) -> bool:
+        """Delete an object, False if it did not exist"""
+
+    async def delete_batch(self, names: List[str]) -> Dict[str, bool]:
+        """
+        Delete several objects, returns name -> deleted (False if it did not
+        exist). Raises BatchDeleteError listing the objects that failed.
+        """
+        results, failed = {}, []
+        for name in names:
+            try:
+                results[name] = await self.delete(name)
+            except Exception as e:
+                logger.warning(f"Error deleting {name}: {e}")
+                failed.append(name)
+
+        if failed:
+            raise BatchDeleteError(results, failed)
+        return results
+
+    @abstractmethod
+    async def exists(self, name: str) -> bool:
+        pass
+
+    @abstractmethod
+    def url_for(self, name: str) -> str:
+        pass
+
+    @abstractmethod
+    def signed_url(self, name: str, expires_in: timedelta) -> str:
+        """URL granting temporary read access, for private containers"""
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Stores files under a local directory, served by the static route that
+    main.py mounts at LOCAL_STORAGE_URL_PATH. Meant for development, tests
+    and benchmarks; file I/O runs in worker threads.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Path, public_url: str, *, block_size: int = 4 * 1024 * 1024):
+        self.root = Path(root).resolve()
+        self.public_url = public_url.rstrip("/")
+        self.block_size = block_size
+
+    def _path(self, name: str) -> Path:
+        path = (self.root / name).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid storage object name: {name}")
+        return path
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self.root.mkdir, parents=True, exist_ok=True)
+
+    async def put(self, name: str, data: bytes, content_type: str) -> str:
+        path = self._path(name)
+
+        def write():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "xb") as handle:  # Prevent accidental overwrites
+                handle.write(data)
+
+        try:
+            await asyncio.to_thread(write)
+        except FileExistsError:
+            raise ObjectExistsError(name)
+        return self.url_for(name)
+
+    async def put_stream(self, name: str, file: UploadFile, content_type: str) -> str:
+        path = self._path(name)
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        try:
+            handle = await asyncio.to_thread(open, path, "xb")
+        except FileExistsError:
+            raise ObjectExistsError(name)
+
+        try:
+            await file.seek(0)
+            while chunk := await file.read(self.block_size):
+                await asyncio.to_thread(handle.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(path.unlink, True)
+            raise
+
+        await asyncio.to_thread(handle.close)
+        return self.url_for(name)
+
+    async def delete(self, name: str) -> bool:
+        path = self._path(name)
+
+        def unlink() -> bool:
+            try:
+                path.unlink()
+                return True
+            except FileNotFoundError:
+                return False
+
+        return await asyncio.to_thread(unlink)
+
+    async def exists(self, name: str) -> bool:
+        return await asyncio.to_thread(self._path(name).is_file)
+
+    def url_for(self, name: str) -> str:
+        return f"{self.public_url}/{name}"
+
+    def signed_url(self, name: str, expires_in: timedelta) -> str:
+        # The static route is public, like the Azure container
+        return self.url_for(name)
+
+
+def create_storage_backend(name: Optional[str] = None) -> StorageBackend:
+    name = (name or settings.STORAGE_BACKEND).lower()
+
+    if name == "azure":
+        from app.core.azure_storage import AzureBlobStorageBackend
+        return AzureBlobStorageBackend(
+            settings.AZURE_STORAGE_CONNECTION_STRING,
+            settings.AZURE_STORAGE_CONTAINER_NAME,
+            block_size=settings.STORAGE_UPLOAD_BLOCK_SIZE,
+            batch_concurrency=settings.STORAGE_DELETE_BATCH_CONCURRENCY
+        )
+    if name == "local":
+        return LocalStorageBackend(
+            Path(settings.LOCAL_STORAGE_PATH),
+            settings.LOCAL_STORAGE_PUBLIC_URL or settings.LOCAL_STORAGE_URL_PATH,
+            block_size=settings.STORAGE_UPLOAD_BLOCK_SIZE
+        )
+
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+class StorageService:
+    """
+    Validates and names uploaded images and stores them in the configured
+    backend. The backend is created on first use (no I/O at import) and
+    started from the app lifespan.
+
+    Images are content-addressed: stored as content/<sha256><ext> (variants
+    as content/<sha256>_w640.webp), so identical uploads share one object.
+    """
+
+    ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'}
+    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    CONTENT_PREFIX = "content/"
+
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self._backend = backend
+
+    @property
+    def backend(self) -> StorageBackend:
+        if self._backend is None:
+            self._backend = create_storage_backend()
+        return self._backend
+
+    def use(self, backend: StorageBackend) -> None:
+        """Swap the backend, e.g. a LocalStorageBackend in tests"""
+        self._backend = backend
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def close(self) -> None:
+        if self._backend is not None:
+            await self._backend.close()
+
+    def _validate_file(self, file: UploadFile) -> None:
+        """Validate file type and size"""
+        # Check file extension
+        file_ext = Path(file.filename).suffix.lower()
+        if file_ext not in self.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file type. Allowed: {', '.join(self.ALLOWED_EXTENSIONS)}"
+            )
+
+        # Check file size (read first chunk to verify it's not empty)
+        file.file.seek(0, 2)  # Seek to end
+        file_size = file.file.tell()
+        file.file.seek(0)  # Reset to beginning
+
+        if file_size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File is empty"
+            )
+
+        if file_size > self.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large. Maximum size: {self.MAX_FILE_SIZE / 1024 / 1024}MB"
+            )
+
+    def _content_blob_name(self, content_hash: str, original_filename: str) -> str:
+        """Blob name derived from the content: content/<sha256><ext>"""
+        return f"{self.CONTENT_PREFIX}{content_hash}{Path(original_filename).suffix.lower()}"
+
+    def content_hash_of(self, blob_name: str) -> Optional[str]:
+        """SHA-256 a content-addressed blob (or variant) was named after, None for legacy names"""
+        if not blob_name.startswith(self.CONTENT_PREFIX):
+            return None
+        return PurePosixPath(blob_name).stem.split("_w")[0]
+
+    def _variant_blob_name(self, blob_name: str, width: int, extension: str) -> str:
+        """Name of a resized copy, next to the original: ..._photo_w640.webp"""
+        path = PurePosixPath(blob_name)
+        return str(path.with_name(f"{path.stem}_w{width}{extension}"))
+
+    def _get_content_type(self, filename: str) -> str:
+        """Get content type based on file extension"""
+        ext_to_content_type = {
+            '.jpg': 'image/jpeg',
+            '.jpeg': 'image/jpeg',
+            '.png': 'image/png',
+            '.gif': 'image/gif',
+            '.webp': 'image/webp',
+            '.svg': 'image/svg+xml'
+        }
+        file_ext = Path(filename).suffix.lower()
+        return ext_to_content_type.get(file_ext, 'application/octet-stream')
+
+    async def hash_image(self, file: UploadFile) -> str:
+        """Validate the upload and return the SHA-256 of its content"""
+        self._validate_file(file)
+
+        def sha256() -> str:
+            # Reads the spool file through a small reused buffer, in a worker thread
+            file.file.seek(0)
+            digest = hashlib.file_digest(file.file, "sha256")
+            file.file.seek(0)
+            return digest.hexdigest()
+
+        return await asyncio.to_thread(sha256)
+
+    async def upload_image(
+        self,
+        file: UploadFile,
+        content_hash: Optional[str] = None
+    ) -> Tuple[str, str, bool]:
+        """
+        Validate the image and stream it to the backend under its content hash
+
+        Args:
+            file: The uploaded file
+            content_hash: SHA-256 from hash_image, computed here if not given
+
+        Returns:
+            Tuple of (blob_url, blob_name, created); created is False when
+            identical content was already stored
+        """
+        try:
+            if content_hash is None:
+                content_hash = await self.hash_image(file)
+
+            blob_name = self._content_blob_name(content_hash, file.filename)
+            try:
+                blob_url = await self.backend.put_stream(
+                    blob_name,
+                    file,
+                    self._get_content_type(file.filename)
+                )
+                created = True
+            except ObjectExistsError:
+                blob_url, created = self.backend.url_for(blob_name), False
+            await file.seek(0)
+
+            return blob_url, blob_name, created
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to upload image: {str(e)}"
+            )
+
+    async def upload_variant(
+        self,
+        blob_name: str,
+        width: int,
+        data: bytes,
+        content_type: str,
+        extension: str
+    ) -> Tuple[str, str]:
+        """Store a resized copy of the image blob_name, returns (blob_url, blob_name)"""
+        variant_name = self._variant_blob_name(blob_name, width, extension)
+        try:
+            return await self.backend.put(variant_name, data, content_type), variant_name
+        except ObjectExistsError:
+            # Same content, same variant
+            return self.backend.url_for(variant_name), variant_name
+
+    async def delete_image(self, blob_name: str) -> bool:
+        """Delete an image, False if it was not found or could not be deleted"""
+        try:
+            return await self.backend.delete(blob_name)
+        except Exception as e:
+            logger.error(f"Error deleting blob {blob_name}: {e}")
+            return False
+
+    async def delete_images_batch(self, blob_names: List[str]) -> Dict[str, bool]:
+        """Delete several images, returns blob_name -> deleted"""
+        try:
+            return await self.backend.delete_batch(blob_names)
+        except BatchDeleteError as e:
+            logger.error(f"Error deleting blobs {e.failed}: {e}")
+            return {**e.results, **{blob_name: False for blob_name in e.failed}}
+        except Exception as e:
+            logger.error(f"Error deleting {len(blob_names)} blobs: {e}")
+            return {blob_name: False for blob_name in blob_names}
+
+    def generate_signed_url(self, blob_name: str, expiry_hours: int = 1) -> str:
+        """URL with temporary read access (useful for private containers)"""
+        try:
+            return self.backend.signed_url(blob_name, timedelta(hours=expiry_hours))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to generate SAS URL: {str(e)}"
+            )
+
+
+# Singleton instance
+storage_service = StorageService()
@@ -0,0 +1,90 @@
+# app/db/migrations.py
+
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import Column, Table, inspect, text
+from sqlalchemy.engine import Connection
+import logging
+
+from app.db.base import Base
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+logger = logging.getLogger(__name__)
+
+# create_all only creates missing tables, so columns and indexes added to a
+# table that already exists in production are listed here and added by
+# upgrade_schema(). Their definitions come from the models; NOT NULL columns
+# need a server_default that fills the existing rows.
+NEW_COLUMNS: Dict[str, List[str]] = {
+    "contact_messages": ["notification_status", "confirmation_status"],
+    "subscribers": ["digest_frequency"],
+    "comments": ["notified"],
+    # Left NULL on existing rows, see Image.content_hash
+    "images": ["content_hash", "width", "height", "variants"],
+}
+
+NEW_INDEXES: Dict[str, List[str]] = {
+    # Keyset pagination
+    "blog_posts": ["ix_blog_posts_created", "ix_blog_posts_published_created"],
+    "projects": ["ix_projects_created", "ix_projects_featured_created"],
+    "reactions": ["ix_reactions_entity_created"],
+    "contact_messages": ["ix_contact_messages_created"],
+    "subscribers": [
+        "ix_subscribers_created",
+        "ix_subscribers_active_verified_created",
+        "ix_subscribers_frequency_active_verified",
+    ],
+    "comments": [
+        "ix_comments_blog_post_approved_created",
+        "ix_comments_project_approved_created",
+        "ix_comments_notified",
+    ],
+    "images": ["ix_images_content_hash"],
+}
+
+# Value for the rows that existed before the column, when it must differ
+# from the default given to new rows
+BACKFILLS: Dict[Tuple[str, str], Any] = {
+    # Comments from before the moderation summaries must not all be reported in the first one
+    ("comments", "notified"): True,
+}
+
+
+def _add_column(conn: Connection, table: Table, column: Column) -> None:
+    dialect = conn.dialect
+    spec = dialect.ddl_compiler(dialect, None).get_column_specification(column)
+    # SQL Server does not accept the COLUMN keyword
+    add = "ADD" if dialect.name == "mssql" else "ADD COLUMN"
+    conn.execute(text(f"ALTER TABLE {dialect.identifier_preparer.format_table(table)} {add} {spec}"))
+
+
+def upgrade_schema(conn: Connection) -> List[str]:
+    """
+    Add the missing columns (and backfill them) and indexes to existing
+    tables. Idempotent: the live schema is inspected first, so it can run on
+    every deploy. Run it after create_all; returns what was added.
+    """
+    inspector = inspect(conn)
+    applied = []
+
+    for table_name, column_names in NEW_COLUMNS.items():
+        table = Base.metadata.tables[table_name]
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        for name in column_names:
+            if name in existing:
+                continue
+            _add_column(conn, table, table.c[name])
+            if (table_name, name) in BACKFILLS:
+                conn.execute(table.update().values({name: BACKFILLS[(table_name, name)]}))
+            applied.append(f"{table_name}.{name}")
+
+    for table_name, index_names in NEW_INDEXES.items():
+        table = Base.metadata.tables[table_name]
+        existing = {index["name"] for index in inspector.get_indexes(table_name)}
+        for index in table.indexes:
+            if index.name in index_names and index.name not in existing:
+                index.create(conn)
+                applied.append(index.name)
+
+    for change in applied:
+        logger.info(f"Schema upgrade: added {change}")
+    return applied
@@ -5,11 +5,17 @@ from app.db.repositories.user import user_repository
 from app.db.repositories.project import project_repository
 from app.db.repositories.blog import blog_repository
 from app.db.repositories.reaction import reaction_repository
+from app.db.repositories.comment import comment_repository
+from app.db.repositories.contact import contact_repository
+from app.db.repositories.digest import digest_repository
 
 __all__ = [
     "BaseRepository",
     "user_repository",
     "project_repository",
     "blog_repository",
-    "reaction_repository"
+    "reaction_repository",
+    "comment_repository",
+    "contact_repository",
+    "digest_repository"
 ]
\ No newline at end of file
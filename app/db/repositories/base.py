@@ -1,11 +1,13 @@
 # app/db/repositories/base.py
 
 from typing import Generic, TypeVar, Type, Optional, List, Any, Sequence
-from sqlalchemy import select, func, and_, delete
+from sqlalchemy import select, func, and_, or_, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, load_only
 from pydantic import BaseModel
 
+from app.utils.pagination import KeysetPage, encode_cursor, decode_cursor
+
 
 ModelType = TypeVar("ModelType", bound=DeclarativeBase)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -43,10 +45,14 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     limit: int = 100,
     filters: Optional[List] = None,
     order_by: Optional[List] = None,
-    options: Optional[List] = None
+    options: Optional[List] = None,
+    columns: Optional[List] = None
     ) -> Sequence[ModelType]:
         query = select(self.model)
         
+        if columns:
+            query = query.options(load_only(*columns))
+        
         if filters:
             query = query.where(and_(*filters))
         
@@ -65,6 +71,95 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(query)
         return result.scalars().all()
     
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        filters: Optional[List] = None,
+        options: Optional[List] = None,
+        columns: Optional[List] = None,
+        include_total: bool = False
+    ) -> KeysetPage[ModelType]:
+        """
+        Keyset pagination ordered by (created_at DESC, id DESC).
+        
+        The opaque cursor encodes the boundary row and the direction, so
+        every page is a range seek on the index instead of an OFFSET scan.
+        The total count is only computed when include_total is set.
+        When columns is given only those columns (plus the primary key and
+        created_at, needed for the cursor) are selected; the rest stay
+        unloaded and must not be accessed on the returned objects.
+        """
+        created_at = self.model.created_at
+        id_column = self.model.id
+        
+        query = select(self.model)
+        
+        if columns:
+            query = query.options(load_only(*columns, created_at))
+        
+        if filters:
+            query = query.where(and_(*filters))
+        
+        position = decode_cursor(cursor) if cursor else None
+        backward = position is not None and position.direction == "prev"
+        
+        if position is not None:
+            if backward:
+                query = query.where(
+                    or_(
+                        created_at > position.created_at,
+                        and_(created_at == position.created_at, id_column > position.id)
+                    )
+                )
+            else:
+                query = query.where(
+                    or_(
+                        created_at < position.created_at,
+                        and_(created_at == position.created_at, id_column < position.id)
+                    )
+                )
+        
+        if backward:
+            query = query.order_by(created_at.asc(), id_column.asc())
+        else:
+            query = query.order_by(created_at.desc(), id_column.desc())
+        
+        if options:
+            for option in options:
+                query = query.options(option)
+        
+        query = query.limit(limit + 1)
+        
+        result = await db.execute(query)
+        items = list(result.scalars().all())
+        
+        has_more = len(items) > limit
+        items = items[:limit]
+        if backward:
+            items.reverse()
+        
+        page = KeysetPage(items=items)
+        
+        if items:
+            first, last = items[0], items[-1]
+            if backward:
+                page.next_cursor = encode_cursor(last.created_at, last.id, "next")
+                if has_more:
+                    page.prev_cursor = encode_cursor(first.created_at, first.id, "prev")
+            else:
+                if has_more:
+                    page.next_cursor = encode_cursor(last.created_at, last.id, "next")
+                if position is not None:
+                    page.prev_cursor = encode_cursor(first.created_at, first.id, "prev")
+        
+        if include_total:
+            page.total = await self.count(db, filters=filters)
+        
+        return page
+    
     async def get_by_field(
         self,
         db: AsyncSession,
@@ -102,6 +197,12 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         
         return db_obj
     
+    async def commit(self, db: AsyncSession, db_obj: ModelType) -> ModelType:
+        """Commit the caller's transaction and refresh db_obj"""
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+    
     async def update(
         self,
         db: AsyncSession,
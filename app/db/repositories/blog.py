@@ -1,20 +1,138 @@
 # app/db/repositories/blog.py
 
-from typing import Optional, Sequence
+from typing import Optional, Sequence, List, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, update
+from sqlalchemy import select, desc, update, delete, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from app.db.repositories.base import BaseRepository
-from app.models.blog import BlogPost
+from app.utils.pagination import KeysetPage
+from app.utils.helpers import parse_tags, normalize_tag
+from app.models.blog import BlogPost, Tag, blog_post_tags
 from app.schemas.blog import BlogPostCreate, BlogPostUpdate
 
 
 class BlogRepository(BaseRepository[BlogPost, BlogPostCreate, BlogPostUpdate]):
     
+    # Columns needed by BlogPostListItem, everything except content
+    LIST_COLUMNS = [
+        BlogPost.title,
+        BlogPost.slug,
+        BlogPost.excerpt,
+        BlogPost.author,
+        BlogPost.tags,
+        BlogPost.published,
+        BlogPost.views,
+        BlogPost.created_at,
+        BlogPost.updated_at,
+    ]
+    
     def __init__(self):
         super().__init__(BlogPost)
     
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: BlogPostCreate,
+        commit: bool = True
+    ) -> BlogPost:
+        post = await super().create(db, obj_in=obj_in, commit=False)
+        await db.flush()
+        await self.sync_tags(db, post.id, post.tags)
+        
+        if commit:
+            await self.commit(db, post)
+        
+        return post
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: BlogPost,
+        obj_in: BlogPostUpdate | dict[str, Any],
+        commit: bool = True
+    ) -> BlogPost:
+        post = await super().update(db, db_obj=db_obj, obj_in=obj_in, commit=False)
+        await self.sync_tags(db, post.id, post.tags)
+        
+        if commit:
+            await self.commit(db, post)
+        
+        return post
+    
+    async def delete(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        commit: bool = True
+    ) -> bool:
+        await db.execute(delete(blog_post_tags).where(blog_post_tags.c.post_id == id))
+        return await super().delete(db, id=id, commit=commit)
+    
+    async def _get_or_create_tag_ids(
+        self,
+        db: AsyncSession,
+        names: List[str]
+    ) -> List[int]:
+        result = await db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names)))
+        tag_ids = dict(result.all())
+        
+        for name in names:
+            if name in tag_ids:
+                continue
+            try:
+                async with db.begin_nested():
+                    tag = Tag(name=name)
+                    db.add(tag)
+                    await db.flush()
+                    tag_ids[name] = tag.id
+            except IntegrityError:
+                # Another request created the tag concurrently
+                result = await db.execute(select(Tag.id).where(Tag.name == name))
+                tag_ids[name] = result.scalar_one()
+        
+        return [tag_ids[name] for name in names]
+    
+    async def sync_tags(
+        self,
+        db: AsyncSession,
+        post_id: int,
+        tags_string: Optional[str]
+    ) -> List[str]:
+        """
+        Rebuild the tag index rows of a post from its comma-separated tags,
+        inside the caller's transaction
+        """
+        names = list(dict.fromkeys(
+            name for name in (normalize_tag(tag) for tag in parse_tags(tags_string)) if name
+        ))
+        
+        await db.execute(delete(blog_post_tags).where(blog_post_tags.c.post_id == post_id))
+        
+        if names:
+            tag_ids = await self._get_or_create_tag_ids(db, names)
+            await db.execute(
+                insert(blog_post_tags),
+                [{"post_id": post_id, "tag_id": tag_id} for tag_id in tag_ids]
+            )
+        
+        return names
+    
+    async def rebuild_tag_index(self, db: AsyncSession) -> int:
+        """Re-index the tags of every post, returns the number of posts processed"""
+        result = await db.execute(select(BlogPost.id, BlogPost.tags).order_by(BlogPost.id))
+        rows = result.all()
+        
+        for post_id, tags_string in rows:
+            await self.sync_tags(db, post_id, tags_string)
+        
+        await db.commit()
+        return len(rows)
+    
     async def get_by_slug(
         self,
         db: AsyncSession,
@@ -30,10 +148,7 @@ class BlogRepository(BaseRepository[BlogPost, BlogPostCreate, BlogPostUpdate]):
         return await self.get(
             db,
             post_id,
-            options=[
-                selectinload(BlogPost.comments),
-                selectinload(BlogPost.videos)
-            ]
+            options=[selectinload(BlogPost.videos)]
         )
     
     async def get_by_slug_with_details(
@@ -42,7 +157,6 @@ class BlogRepository(BaseRepository[BlogPost, BlogPostCreate, BlogPostUpdate]):
         slug: str
     ) -> Optional[BlogPost]:
         query = select(BlogPost).options(
-            selectinload(BlogPost.comments),
             selectinload(BlogPost.videos)
         ).where(BlogPost.slug == slug)
         
@@ -60,7 +174,8 @@ class BlogRepository(BaseRepository[BlogPost, BlogPostCreate, BlogPostUpdate]):
             skip=skip,
             limit=limit,
             filters=[BlogPost.published == True],
-            order_by=[desc(BlogPost.created_at)]
+            order_by=[desc(BlogPost.created_at)],
+            columns=self.LIST_COLUMNS
         )
     
     async def get_all_ordered(
@@ -79,35 +194,73 @@ class BlogRepository(BaseRepository[BlogPost, BlogPostCreate, BlogPostUpdate]):
             skip=skip,
             limit=limit,
             filters=filters if filters else None,
-            order_by=[desc(BlogPost.created_at)]
+            order_by=[desc(BlogPost.created_at)],
+            columns=self.LIST_COLUMNS
+        )
+    
+    async def get_ordered_page(
+        self,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        published: Optional[bool] = None,
+        include_total: bool = False
+    ) -> KeysetPage[BlogPost]:
+        filters = []
+        if published is not None:
+            filters.append(BlogPost.published == published)
+        
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=filters if filters else None,
+            columns=self.LIST_COLUMNS,
+            include_total=include_total
         )
     
     async def increment_views(
         self,
         db: AsyncSession,
-        post_id: int
+        post_id: int,
+        amount: int = 1,
+        *,
+        commit: bool = True
     ) -> None:
         await db.execute(
             update(BlogPost)
             .where(BlogPost.id == post_id)
-            .values(views=BlogPost.views + 1)
+            .values(views=BlogPost.views + amount)
         )
-        await db.commit()
+        
+        if commit:
+            await db.commit()
     
     async def search_by_tag(
         self,
         db: AsyncSession,
         tag: str,
-        skip: int = 0,
-        limit: int = 10
-    ):
-        query = select(BlogPost).where(
-            BlogPost.tags.contains(tag),
-            BlogPost.published == True
-        ).order_by(desc(BlogPost.created_at)).offset(skip).limit(limit)
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        include_total: bool = False
+    ) -> KeysetPage[BlogPost]:
+        tagged_posts = (
+            select(blog_post_tags.c.post_id)
+            .join(Tag, Tag.id == blog_post_tags.c.tag_id)
+            .where(Tag.name == normalize_tag(tag))
+        )
         
-        result = await db.execute(query)
-        return result.scalars().all()
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=[
+                BlogPost.id.in_(tagged_posts),
+                BlogPost.published == True
+            ],
+            columns=self.LIST_COLUMNS,
+            include_total=include_total
+        )
     
     async def get_popular(
         self,
@@ -119,7 +272,8 @@ class BlogRepository(BaseRepository[BlogPost, BlogPostCreate, BlogPostUpdate]):
             skip=0,
             limit=limit,
             filters=[BlogPost.published == True],
-            order_by=[desc(BlogPost.views)]
+            order_by=[desc(BlogPost.views)],
+            columns=self.LIST_COLUMNS
         )
 
 
@@ -0,0 +1,124 @@
+# app/db/repositories/comment.py
+
+from typing import Any, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.repositories.base import BaseRepository
+from app.utils.pagination import KeysetPage
+from app.models.blog import BlogPost
+from app.models.project import Comment, Project
+from app.schemas.project import CommentCreate
+
+
+class CommentRepository(BaseRepository[Comment, CommentCreate, CommentCreate]):
+    
+    def __init__(self):
+        super().__init__(Comment)
+    
+    async def get_approved_page(
+        self,
+        db: AsyncSession,
+        *,
+        blog_post_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        include_total: bool = False
+    ) -> KeysetPage[Comment]:
+        filters = [Comment.approved == True]
+        if blog_post_id is not None:
+            filters.append(Comment.blog_post_id == blog_post_id)
+        if project_id is not None:
+            filters.append(Comment.project_id == project_id)
+        
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=filters,
+            include_total=include_total
+        )
+    
+    async def attach_latest(
+        self,
+        db: AsyncSession,
+        entity: Any,
+        *,
+        limit: int,
+        blog_post_id: Optional[int] = None,
+        project_id: Optional[int] = None
+    ) -> None:
+        """
+        Load only the latest approved comments into entity.comments, as
+        already-persisted state so the partial list is never flushed as a
+        change. entity.comments_next_cursor continues on /comments.
+        """
+        page = await self.get_approved_page(
+            db,
+            blog_post_id=blog_post_id,
+            project_id=project_id,
+            limit=limit
+        )
+        set_committed_value(entity, "comments", page.items)
+        entity.comments_next_cursor = page.next_cursor
+
+    
+    async def claim_unnotified(
+        self,
+        db: AsyncSession,
+        limit: int = 1000
+    ) -> List[int]:
+        """
+        Marcar como notificados los comentarios pendientes y devolver sus ids.
+        Si otro proceso marcó alguno entre la lectura y el UPDATE devuelve []
+        y el llamador debe hacer rollback; ese proceso envía el resumen.
+        """
+        result = await db.execute(
+            select(Comment.id)
+            .where(Comment.notified == False)
+            .order_by(Comment.id)
+            .limit(limit)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            return []
+        
+        result = await db.execute(
+            update(Comment)
+            .where(Comment.id.in_(ids), Comment.notified == False)
+            .values(notified=True)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(ids):
+            return []
+        return ids
+    
+    async def get_summary_rows(
+        self,
+        db: AsyncSession,
+        ids: List[int]
+    ) -> List[Any]:
+        """Comentarios con el título y enlace de su post o proyecto, más recientes primero"""
+        result = await db.execute(
+            select(
+                Comment.id,
+                Comment.name,
+                Comment.email,
+                Comment.content,
+                Comment.blog_post_id,
+                Comment.project_id,
+                BlogPost.title.label("blog_title"),
+                BlogPost.slug.label("blog_slug"),
+                Project.title.label("project_title")
+            )
+            .outerjoin(BlogPost, Comment.blog_post_id == BlogPost.id)
+            .outerjoin(Project, Comment.project_id == Project.id)
+            .where(Comment.id.in_(ids))
+            .order_by(Comment.id.desc())
+        )
+        return list(result.all())
+
+
+comment_repository = CommentRepository()
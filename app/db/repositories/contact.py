@@ -0,0 +1,61 @@
+# app/db/repositories/contact.py
+
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update, or_
+
+from app.db.repositories.base import BaseRepository
+from app.utils.pagination import KeysetPage
+from app.models.contact import ContactMessage, DeliveryStatusEnum
+from app.schemas.contact import ContactMessageCreate
+
+
+class ContactRepository(BaseRepository[ContactMessage, ContactMessageCreate, dict]):
+
+    def __init__(self):
+        super().__init__(ContactMessage)
+
+    async def get_messages_page(
+        self,
+        db: AsyncSession,
+        *,
+        delivery_status: Optional[DeliveryStatusEnum] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        include_total: bool = False
+    ) -> KeysetPage[ContactMessage]:
+        """Mensajes más recientes primero; delivery_status filtra si cualquiera de los dos emails lo tiene"""
+        filters = None
+        if delivery_status is not None:
+            filters = [
+                or_(
+                    ContactMessage.notification_status == delivery_status,
+                    ContactMessage.confirmation_status == delivery_status
+                )
+            ]
+
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=filters,
+            include_total=include_total
+        )
+
+    async def set_delivery_status(
+        self,
+        db: AsyncSession,
+        message_id: int,
+        field: str,
+        delivery_status: DeliveryStatusEnum
+    ) -> None:
+        """Actualiza notification_status o confirmation_status; el llamador hace commit"""
+        await db.execute(
+            update(ContactMessage)
+            .where(ContactMessage.id == message_id)
+            .values({field: delivery_status})
+            .execution_options(synchronize_session=False)
+        )
+
+
+contact_repository = ContactRepository()
@@ -0,0 +1,98 @@
+# app/db/repositories/digest.py
+
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete
+
+from app.db.repositories.base import BaseRepository
+from app.models.digest import DigestItem
+from app.models.subscriber import DigestFrequencyEnum
+
+
+class DigestRepository(BaseRepository[DigestItem, dict, dict]):
+
+    # Frecuencia -> columna que marca los items ya incluidos en un resumen
+    SENT_COLUMNS = {
+        DigestFrequencyEnum.HOURLY: DigestItem.hourly_sent_at,
+        DigestFrequencyEnum.DAILY: DigestItem.daily_sent_at,
+    }
+
+    def __init__(self):
+        super().__init__(DigestItem)
+
+    def add_item(self, db: AsyncSession, entity_type: str, entity_id: int) -> None:
+        """Registrar un item publicado; se guarda con la transacción del llamador"""
+        db.add(DigestItem(entity_type=entity_type, entity_id=entity_id))
+
+    async def has_pending(
+        self,
+        db: AsyncSession,
+        frequency: DigestFrequencyEnum,
+        created_before: datetime
+    ) -> bool:
+        """
+        Si hay items creados hasta created_before que aún no entraron en un
+        resumen de esta frecuencia. La comparación se hace en la base: en SQL
+        Server created_at vuelve como datetime con zona horaria.
+        """
+        sent_at = self.SENT_COLUMNS[frequency]
+        item_id = await db.scalar(
+            select(DigestItem.id)
+            .where(sent_at.is_(None), DigestItem.created_at <= created_before)
+            .limit(1)
+        )
+        return item_id is not None
+
+    async def claim_pending(
+        self,
+        db: AsyncSession,
+        frequency: DigestFrequencyEnum,
+        limit: int = 100
+    ) -> List[int]:
+        """
+        Marcar como enviados los items pendientes de la frecuencia y devolver
+        sus ids. Si otro proceso marcó alguno entre la lectura y el UPDATE
+        devuelve [] y el llamador debe hacer rollback; ese proceso envía el resumen.
+        """
+        sent_at = self.SENT_COLUMNS[frequency]
+        result = await db.execute(
+            select(DigestItem.id)
+            .where(sent_at.is_(None))
+            .order_by(DigestItem.id)
+            .limit(limit)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            return []
+
+        result = await db.execute(
+            update(DigestItem)
+            .where(DigestItem.id.in_(ids), sent_at.is_(None))
+            .values({sent_at.key: datetime.utcnow()})
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(ids):
+            return []
+        return ids
+
+    async def get_by_ids(self, db: AsyncSession, ids: List[int]) -> List[DigestItem]:
+        result = await db.execute(
+            select(DigestItem).where(DigestItem.id.in_(ids)).order_by(DigestItem.id)
+        )
+        return list(result.scalars().all())
+
+    async def purge_sent(self, db: AsyncSession) -> int:
+        """Borrar los items que ya entraron en ambos resúmenes; el llamador hace commit"""
+        result = await db.execute(
+            delete(DigestItem)
+            .where(
+                DigestItem.hourly_sent_at.is_not(None),
+                DigestItem.daily_sent_at.is_not(None)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+digest_repository = DigestRepository()
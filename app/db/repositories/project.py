@@ -1,20 +1,207 @@
 # app/db/repositories/project.py
 
-from typing import Optional, Sequence
+from typing import Optional, Sequence, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, update, delete, insert, func, and_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from app.db.repositories.base import BaseRepository
-from app.models.project import Project
+from app.utils.pagination import KeysetPage
+from app.utils.helpers import parse_tags, normalize_tag, clean_whitespace
+from app.models.project import Project, Technology, project_technologies
 from app.schemas.project import ProjectCreate, ProjectUpdate
 
 
 class ProjectRepository(BaseRepository[Project, ProjectCreate, ProjectUpdate]):
     
+    # Columns needed by ProjectListItem, everything except content
+    LIST_COLUMNS = [
+        Project.title,
+        Project.description,
+        Project.technologies,
+        Project.github_url,
+        Project.demo_url,
+        Project.featured,
+        Project.created_at,
+        Project.updated_at,
+    ]
+    
     def __init__(self):
         super().__init__(Project)
     
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: ProjectCreate,
+        commit: bool = True
+    ) -> Project:
+        project = await super().create(db, obj_in=obj_in, commit=False)
+        await db.flush()
+        await self.sync_technologies(db, project.id, project.technologies)
+        
+        if commit:
+            await self.commit(db, project)
+        
+        return project
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Project,
+        obj_in: ProjectUpdate | dict[str, Any],
+        commit: bool = True
+    ) -> Project:
+        project = await super().update(db, db_obj=db_obj, obj_in=obj_in, commit=False)
+        await self.sync_technologies(db, project.id, project.technologies)
+        
+        if commit:
+            await self.commit(db, project)
+        
+        return project
+    
+    async def delete(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        commit: bool = True
+    ) -> bool:
+        if not await self.exists(db, filters=[Project.id == id]):
+            return False
+        
+        await self.sync_technologies(db, id, None)
+        return await super().delete(db, id=id, commit=commit)
+    
+    async def _get_or_create_technology_ids(
+        self,
+        db: AsyncSession,
+        labels: Dict[str, str]
+    ) -> List[int]:
+        names = list(labels)
+        result = await db.execute(
+            select(Technology.name, Technology.id).where(Technology.name.in_(names))
+        )
+        technology_ids = dict(result.all())
+        
+        for name in names:
+            if name in technology_ids:
+                continue
+            try:
+                async with db.begin_nested():
+                    technology = Technology(name=name, label=labels[name], project_count=0)
+                    db.add(technology)
+                    await db.flush()
+                    technology_ids[name] = technology.id
+            except IntegrityError:
+                # Another request created the technology concurrently
+                result = await db.execute(select(Technology.id).where(Technology.name == name))
+                technology_ids[name] = result.scalar_one()
+        
+        return [technology_ids[name] for name in names]
+    
+    async def sync_technologies(
+        self,
+        db: AsyncSession,
+        project_id: int,
+        technologies_string: Optional[str]
+    ) -> List[str]:
+        """
+        Reconcile the technology index rows of a project with its
+        comma-separated technologies and adjust project_count of every
+        technology added or removed, inside the caller's transaction
+        """
+        labels: Dict[str, str] = {}
+        for label in parse_tags(technologies_string):
+            name = normalize_tag(label)
+            if name and name not in labels:
+                labels[name] = clean_whitespace(label)[:100]
+        
+        desired = set(await self._get_or_create_technology_ids(db, labels)) if labels else set()
+        
+        result = await db.execute(
+            select(project_technologies.c.technology_id)
+            .where(project_technologies.c.project_id == project_id)
+        )
+        current = set(result.scalars().all())
+        
+        removed = current - desired
+        added = desired - current
+        
+        if removed:
+            await db.execute(
+                delete(project_technologies).where(
+                    and_(
+                        project_technologies.c.project_id == project_id,
+                        project_technologies.c.technology_id.in_(removed)
+                    )
+                )
+            )
+            await db.execute(
+                update(Technology)
+                .where(Technology.id.in_(removed))
+                .values(project_count=Technology.project_count - 1)
+            )
+        
+        if added:
+            await db.execute(
+                insert(project_technologies),
+                [{"project_id": project_id, "technology_id": tech_id} for tech_id in sorted(added)]
+            )
+            await db.execute(
+                update(Technology)
+                .where(Technology.id.in_(added))
+                .values(project_count=Technology.project_count + 1)
+            )
+        
+        return list(labels)
+    
+    async def rebuild_technology_index(self, db: AsyncSession) -> int:
+        """
+        Re-index the technologies of every project and recount project_count
+        from the association rows, returns the number of projects processed
+        """
+        result = await db.execute(select(Project.id, Project.technologies).order_by(Project.id))
+        rows = result.all()
+        
+        for project_id, technologies_string in rows:
+            await self.sync_technologies(db, project_id, technologies_string)
+        
+        await db.execute(
+            update(Technology).values(
+                project_count=select(func.count())
+                .where(project_technologies.c.technology_id == Technology.id)
+                .scalar_subquery()
+            )
+        )
+        
+        await db.commit()
+        return len(rows)
+    
+    async def get_technology_facets(
+        self,
+        db: AsyncSession,
+        limit: Optional[int] = None
+    ) -> Sequence[Technology]:
+        query = select(Technology).where(
+            Technology.project_count > 0
+        ).order_by(desc(Technology.project_count), Technology.name)
+        
+        if limit:
+            query = query.limit(limit)
+        
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    def _technology_filter(self, technology: str):
+        return Project.id.in_(
+            select(project_technologies.c.project_id)
+            .join(Technology, Technology.id == project_technologies.c.technology_id)
+            .where(Technology.name == normalize_tag(technology))
+        )
+    
     async def get_with_details(
         self,
         db: AsyncSession,
@@ -23,10 +210,7 @@ class ProjectRepository(BaseRepository[Project, ProjectCreate, ProjectUpdate]):
         return await self.get(
             db,
             project_id,
-            options=[
-                selectinload(Project.comments),
-                selectinload(Project.videos)
-            ]
+            options=[selectinload(Project.videos)]
         )
     
     async def get_featured(
@@ -40,7 +224,8 @@ class ProjectRepository(BaseRepository[Project, ProjectCreate, ProjectUpdate]):
             skip=skip,
             limit=limit,
             filters=[Project.featured == True],
-            order_by=[desc(Project.created_at)]
+            order_by=[desc(Project.created_at)],
+            columns=self.LIST_COLUMNS
         )
     
     async def get_all_ordered(
@@ -59,22 +244,49 @@ class ProjectRepository(BaseRepository[Project, ProjectCreate, ProjectUpdate]):
             skip=skip,
             limit=limit,
             filters=filters if filters else None,
-            order_by=[desc(Project.created_at)]
+            order_by=[desc(Project.created_at)],
+            columns=self.LIST_COLUMNS
+        )
+    
+    async def get_ordered_page(
+        self,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        featured: Optional[bool] = None,
+        technology: Optional[str] = None,
+        include_total: bool = False
+    ) -> KeysetPage[Project]:
+        filters = []
+        if featured is not None:
+            filters.append(Project.featured == featured)
+        if technology:
+            filters.append(self._technology_filter(technology))
+        
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=filters if filters else None,
+            columns=self.LIST_COLUMNS,
+            include_total=include_total
         )
     
     async def search_by_technology(
         self,
         db: AsyncSession,
         technology: str,
-        skip: int = 0,
-        limit: int = 10
-    ):
-        query = select(Project).where(
-            Project.technologies.contains(technology)
-        ).order_by(desc(Project.created_at)).offset(skip).limit(limit)
-        
-        result = await db.execute(query)
-        return result.scalars().all()
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        include_total: bool = False
+    ) -> KeysetPage[Project]:
+        return await self.get_ordered_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            technology=technology,
+            include_total=include_total
+        )
 
 
 project_repository = ProjectRepository()
\ No newline at end of file
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func, desc
 
 from app.db.repositories.base import BaseRepository
+from app.utils.pagination import KeysetPage
 from app.models.reaction import Reaction, ReactionTypeEnum
 from app.schemas.reaction import ReactionCreate, ReactionUpdate
 
@@ -50,6 +51,26 @@ class ReactionRepository(BaseRepository[Reaction, ReactionCreate, ReactionUpdate
             order_by=[desc(Reaction.created_at)]
         )
     
+    async def get_entity_page(
+        self,
+        db: AsyncSession,
+        entity_id: int,
+        entity_type: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        include_total: bool = False
+    ) -> KeysetPage[Reaction]:
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=[
+                Reaction.entity_id == entity_id,
+                Reaction.entity_type == entity_type
+            ],
+            include_total=include_total
+        )
+    
     async def count_by_entity(
         self,
         db: AsyncSession,
@@ -1,10 +1,11 @@
-from typing import Optional, Sequence
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.db.repositories.base import BaseRepository
-from app.models.subscriber import Subscriber
+from app.models.subscriber import Subscriber, DigestFrequencyEnum
 from app.schemas.subscriber import SubscriberCreate
+from app.utils.pagination import KeysetPage
 
 
 class SubscriberRepository(BaseRepository[Subscriber, SubscriberCreate, dict]):
@@ -20,53 +21,99 @@ class SubscriberRepository(BaseRepository[Subscriber, SubscriberCreate, dict]):
         """Obtener suscriptor por email"""
         return await self.get_by_field(db, "email", email)
     
-    async def get_by_token(
+    async def get_active_verified_chunk(
         self,
         db: AsyncSession,
-        token: str
-    ) -> Optional[Subscriber]:
-        """Obtener suscriptor por token de verificación"""
-        return await self.get_by_field(db, "verification_token", token)
+        after_id: int = 0,
+        limit: int = 500,
+        digest_frequency: DigestFrequencyEnum = DigestFrequencyEnum.IMMEDIATE
+    ) -> List[Tuple[int, str]]:
+        """
+        (id, email) de suscriptores activos y verificados con id > after_id
+        que reciben las notificaciones con la frecuencia indicada.
+        
+        Pensado para recorrer la lista completa por bloques, cada uno en su
+        propia sesión corta.
+        """
+        result = await db.execute(
+            select(Subscriber.id, Subscriber.email)
+            .where(
+                Subscriber.digest_frequency == digest_frequency,
+                Subscriber.is_active == True,
+                Subscriber.is_verified == True,
+                Subscriber.id > after_id
+            )
+            .order_by(Subscriber.id)
+            .limit(limit)
+        )
+        return [(row.id, row.email) for row in result.all()]
     
-    async def get_active_verified(
+    async def get_subscribers_page(
         self,
         db: AsyncSession,
-        skip: int = 0,
-        limit: int = 1000
-    ) -> Sequence[Subscriber]:
-        """Obtener todos los suscriptores activos y verificados"""
-        return await self.get_multi(
-            db,
-            skip=skip,
-            limit=limit,
-            filters=[
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        active_verified_only: bool = False,
+        include_total: bool = False
+    ) -> KeysetPage[Subscriber]:
+        """Obtener suscriptores paginados por cursor (más recientes primero)"""
+        filters = None
+        if active_verified_only:
+            filters = [
                 Subscriber.is_active == True,
                 Subscriber.is_verified == True
             ]
+        
+        return await self.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            filters=filters,
+            include_total=include_total
         )
     
     async def verify_subscriber(
         self,
         db: AsyncSession,
-        subscriber: Subscriber
-    ) -> Subscriber:
-        """Marcar suscriptor como verificado"""
-        subscriber.is_verified = True
-        # subscriber.verification_token = None
+        subscriber_id: int
+    ) -> bool:
+        """Marcar suscriptor como verificado; False si no existe o ya estaba verificado"""
+        result = await db.execute(
+            update(Subscriber)
+            .where(Subscriber.id == subscriber_id, Subscriber.is_verified == False)
+            .values(is_verified=True)
+        )
         await db.commit()
-        await db.refresh(subscriber)
-        return subscriber
+        return result.rowcount == 1
+    
+    async def set_digest_frequency(
+        self,
+        db: AsyncSession,
+        subscriber_id: int,
+        digest_frequency: DigestFrequencyEnum
+    ) -> bool:
+        """Cambiar la frecuencia de las notificaciones; False si el suscriptor no existe"""
+        result = await db.execute(
+            update(Subscriber)
+            .where(Subscriber.id == subscriber_id)
+            .values(digest_frequency=digest_frequency)
+        )
+        await db.commit()
+        return result.rowcount == 1
     
     async def deactivate_subscriber(
         self,
         db: AsyncSession,
-        subscriber: Subscriber
-    ) -> Subscriber:
-        """Desactivar suscriptor (unsubscribe)"""
-        subscriber.is_active = False
+        subscriber_id: int
+    ) -> bool:
+        """Desactivar suscriptor (unsubscribe); False si no existe o ya estaba inactivo"""
+        result = await db.execute(
+            update(Subscriber)
+            .where(Subscriber.id == subscriber_id, Subscriber.is_active == True)
+            .values(is_active=False)
+        )
         await db.commit()
-        await db.refresh(subscriber)
-        return subscriber
+        return result.rowcount == 1
 
 
 subscriber_repository = SubscriberRepository()
\ No newline at end of file
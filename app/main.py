@@ -1,18 +1,63 @@
 # app/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from typing import Optional
+import secrets
 
 from app.config import settings
 from app.db.session import init_db, close_db
+from app.core.storage import storage_service
+from app.core.image_processing import image_processor
+from app.core.cache import cache_service
+from app.core.metrics import metrics
+from app.core.scheduler import scheduler
+from app.services.view_counter import view_counter_service
+from app.services.search import search_service
+from app.services.email import email_service
+from app.services.outbox import outbox_service
+from app.services.notification import notification_service  # registers outbox handlers
+from app.services.comment_summary import comment_summary_service
 from app.api.v1.router import api_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await storage_service.start()
+    await search_service.rebuild()
+    cache_service.start_sweeper(settings.CACHE_SWEEP_INTERVAL_SECONDS)
+    view_counter_service.start()
+    if settings.OUTBOX_ENABLED:
+        outbox_service.start()
+    if settings.DIGEST_ENABLED:
+        scheduler.add_job(
+            "subscriber_digests",
+            notification_service.run_due_digests,
+            settings.DIGEST_CHECK_INTERVAL_SECONDS
+        )
+    scheduler.add_job(
+        "comment_summaries",
+        comment_summary_service.send_summary,
+        settings.COMMENT_SUMMARY_INTERVAL_SECONDS
+    )
+    scheduler.add_job(
+        "search_index_rebuild",
+        search_service.rebuild,
+        settings.SEARCH_REBUILD_INTERVAL_SECONDS
+    )
+    scheduler.start()
     yield
+    await scheduler.stop()
+    await outbox_service.stop()
+    await view_counter_service.stop()
+    await cache_service.stop_sweeper()
+    await email_service.close()
+    await storage_service.close()
+    await image_processor.close()
     await close_db()
 
 
@@ -35,6 +80,14 @@ app.add_middleware(
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+if settings.STORAGE_BACKEND.lower() == "local":
+    # The directory is created when the backend starts
+    app.mount(
+        settings.LOCAL_STORAGE_URL_PATH,
+        StaticFiles(directory=settings.LOCAL_STORAGE_PATH, check_dir=False),
+        name="media"
+    )
+
 
 @app.get("/")
 async def root():
@@ -51,4 +104,23 @@ async def health_check():
         "status": "healthy",
         "app": settings.APP_NAME,
         "version": settings.APP_VERSION
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics_endpoint(authorization: Optional[str] = Header(None)):
+    """
+    Email delivery and outbox metrics in the Prometheus text format. Off by
+    default; when METRICS_TOKEN is set the scraper must send it as a bearer token.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
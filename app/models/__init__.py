@@ -2,11 +2,14 @@
 
 from app.models.user import User, TwoFactorCode, LoginAttempt
 from app.models.profile import Profile
-from app.models.project import Project, Comment
-from app.models.blog import BlogPost
+from app.models.project import Project, Comment, Technology, project_technologies
+from app.models.blog import BlogPost, Tag, blog_post_tags
 from app.models.media import Image, Video, VideoSourceEnum
-from app.models.reaction import Reaction, ReactionTypeEnum
-from app.models.contact import ContactMessage
+from app.models.reaction import Reaction, ReactionTypeEnum, ReactionCounter
+from app.models.contact import ContactMessage, DeliveryStatusEnum
+from app.models.outbox import EmailOutbox, OutboxStatusEnum
+from app.models.subscriber import Subscriber, DigestFrequencyEnum
+from app.models.digest import DigestItem
 
 __all__ = [
     "User",
@@ -15,11 +18,22 @@ __all__ = [
     "Profile",
     "Project",
     "Comment",
+    "Technology",
+    "project_technologies",
     "BlogPost",
+    "Tag",
+    "blog_post_tags",
     "Image",
     "Video",
     "VideoSourceEnum",
     "Reaction",
     "ReactionTypeEnum",
-    "ContactMessage"
+    "ReactionCounter",
+    "ContactMessage",
+    "DeliveryStatusEnum",
+    "EmailOutbox",
+    "OutboxStatusEnum",
+    "Subscriber",
+    "DigestFrequencyEnum",
+    "DigestItem"
 ]
\ No newline at end of file
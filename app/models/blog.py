@@ -1,11 +1,20 @@
 # app/models/blog.py
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, Table, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
 
 
+blog_post_tags = Table(
+    "blog_post_tags",
+    Base.metadata,
+    Column("post_id", Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_blog_post_tags_tag", "tag_id", "post_id"),
+)
+
+
 class BlogPost(Base):
     __tablename__ = "blog_posts"
     
@@ -22,4 +31,17 @@ class BlogPost(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     comments = relationship("Comment", back_populates="blog_post", cascade="all, delete-orphan")
-    videos = relationship("Video", back_populates="blog_post", cascade="all, delete-orphan")
\ No newline at end of file
+    videos = relationship("Video", back_populates="blog_post", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index('ix_blog_posts_created', 'created_at', 'id'),
+        Index('ix_blog_posts_published_created', 'published', 'created_at', 'id'),
+    )
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, index=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
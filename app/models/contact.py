@@ -1,10 +1,17 @@
 # app/models/contact.py
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Enum as SQLEnum, Index
 from sqlalchemy.sql import func
+import enum
 from app.db.base import Base
 
 
+class DeliveryStatusEnum(str, enum.Enum):
+    QUEUED = "queued"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 class ContactMessage(Base):
     __tablename__ = "contact_messages"
     
@@ -14,4 +21,24 @@ class ContactMessage(Base):
     subject = Column(String(255), nullable=True)
     message = Column(Text, nullable=False)
     read = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
\ No newline at end of file
+    
+    # Estado de los emails enviados por el outbox. Los mensajes anteriores a
+    # estas columnas ya se enviaron: el server_default (nombre del enum) los marca
+    notification_status = Column(
+        SQLEnum(DeliveryStatusEnum),
+        default=DeliveryStatusEnum.QUEUED,
+        server_default=DeliveryStatusEnum.SENT.name,
+        nullable=False
+    )
+    confirmation_status = Column(
+        SQLEnum(DeliveryStatusEnum),
+        default=DeliveryStatusEnum.QUEUED,
+        server_default=DeliveryStatusEnum.SENT.name,
+        nullable=False
+    )
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_contact_messages_created', 'created_at', 'id'),
+    )
@@ -0,0 +1,28 @@
+# app/models/digest.py
+
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from app.db.base import Base
+
+
+class DigestItem(Base):
+    """
+    Blog post o proyecto publicado, pendiente de incluirse en los resúmenes
+    horario y diario. Cada frecuencia marca su columna *_sent_at cuando el
+    item entra en un resumen; con ambas marcadas la fila se puede borrar.
+    """
+    __tablename__ = "digest_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    
+    # utcnow en Python para compararlo con la ventana del resumen
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    hourly_sent_at = Column(DateTime(timezone=True), nullable=True)
+    daily_sent_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index('ix_digest_items_hourly_pending', 'hourly_sent_at', 'created_at'),
+        Index('ix_digest_items_daily_pending', 'daily_sent_at', 'created_at'),
+    )
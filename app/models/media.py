@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -18,10 +18,17 @@ class Image(Base):
     entity_type = Column(String(50), nullable=False, index=True)
     image_url = Column(String(500), nullable=False)
     blob_name = Column(String(500), nullable=True)  # Azure blob identifier for deletion
+    # SHA-256, rows sharing it share the blobs. NULL for images uploaded before
+    # content addressing: their blobs are per-upload, never shared, and are
+    # deleted with the row
+    content_hash = Column(String(64), nullable=True, index=True)
     image_order = Column(Integer, default=0, nullable=True)
     alt_text = Column(String(255), nullable=True)
     file_size = Column(Integer, nullable=True)  # Size in bytes
     content_type = Column(String(50), nullable=True)  # MIME type
+    width = Column(Integer, nullable=True)  # Original dimensions, in pixels
+    height = Column(Integer, nullable=True)
+    variants = Column(Text, nullable=True)  # JSON list of resized copies: width, height, url, blob_name, content_type
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
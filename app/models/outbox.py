@@ -0,0 +1,49 @@
+# app/models/outbox.py
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLEnum, Index
+from sqlalchemy.sql import func
+from datetime import datetime
+import enum
+from app.db.base import Base
+
+
+class OutboxStatusEnum(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    SENT = "sent"
+    DEAD = "dead"
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    message_type = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)
+    
+    # Registro que originó el email (p. ej. 'contact_message'), si lo hay
+    entity_id = Column(Integer, nullable=True)
+    entity_type = Column(String(50), nullable=True)
+    
+    # Menor valor = más urgente; ver OutboxService.PRIORITY_*
+    priority = Column(Integer, default=0, nullable=False)
+    
+    status = Column(SQLEnum(OutboxStatusEnum), default=OutboxStatusEnum.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=6, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    
+    claim_token = Column(String(64), nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    
+    last_error = Column(Text, nullable=True)
+    provider_message_id = Column(String(255), nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index('ix_email_outbox_status_priority', 'status', 'priority', 'next_attempt_at', 'id'),
+        Index('ix_email_outbox_claim_token', 'claim_token'),
+        Index('ix_email_outbox_entity', 'entity_type', 'entity_id'),
+    )
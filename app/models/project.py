@@ -1,11 +1,20 @@
 # app/models/project.py
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, Table
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import false, func
 from app.db.base import Base
 
 
+project_technologies = Table(
+    "project_technologies",
+    Base.metadata,
+    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+    Column("technology_id", Integer, ForeignKey("technologies.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_project_technologies_technology", "technology_id", "project_id"),
+)
+
+
 class Project(Base):
     __tablename__ = "projects"
     
@@ -22,6 +31,25 @@ class Project(Base):
     
     comments = relationship("Comment", back_populates="project", cascade="all, delete-orphan")
     videos = relationship("Video", back_populates="project", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index('ix_projects_created', 'created_at', 'id'),
+        Index('ix_projects_featured_created', 'featured', 'created_at', 'id'),
+    )
+
+
+class Technology(Base):
+    __tablename__ = "technologies"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, index=True, nullable=False)
+    label = Column(String(100), nullable=False)
+    project_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_technologies_project_count', 'project_count'),
+    )
 
 
 class Comment(Base):
@@ -32,10 +60,21 @@ class Comment(Base):
     email = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
     approved = Column(Boolean, default=False, nullable=False)
+    # Ya incluido en un resumen de moderación enviado al admin
+    notified = Column(Boolean, default=False, server_default=false(), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=True)
     blog_post_id = Column(Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), nullable=True)
     
     project = relationship("Project", back_populates="comments")
-    blog_post = relationship("BlogPost", back_populates="comments")
\ No newline at end of file
+    blog_post = relationship("BlogPost", back_populates="comments")
+    
+    # created_at vuelve en el propio INSERT (RETURNING / OUTPUT), sin un SELECT aparte
+    __mapper_args__ = {"eager_defaults": True}
+    
+    __table_args__ = (
+        Index('ix_comments_blog_post_approved_created', 'blog_post_id', 'approved', 'created_at', 'id'),
+        Index('ix_comments_project_approved_created', 'project_id', 'approved', 'created_at', 'id'),
+        Index('ix_comments_notified', 'notified', 'id'),
+    )
\ No newline at end of file
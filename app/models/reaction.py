@@ -33,4 +33,25 @@ class Reaction(Base):
         UniqueConstraint('email', 'entity_id', 'entity_type', name='uq_reaction_per_entity'),
         Index('ix_reactions_entity', 'entity_id', 'entity_type'),
         Index('ix_reactions_type', 'entity_id', 'entity_type', 'reaction_type'),
-    )
\ No newline at end of file
+        Index('ix_reactions_entity_created', 'entity_id', 'entity_type', 'created_at', 'id'),
+    )
+
+
+class ReactionCounter(Base):
+    __tablename__ = "reaction_counters"
+    
+    entity_type = Column(String(50), primary_key=True)
+    entity_id = Column(Integer, primary_key=True)
+    
+    like_count = Column(Integer, default=0, nullable=False)
+    love_count = Column(Integer, default=0, nullable=False)
+    congratulations_count = Column(Integer, default=0, nullable=False)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+COUNTER_COLUMNS = {
+    ReactionTypeEnum.LIKE: "like_count",
+    ReactionTypeEnum.LOVE: "love_count",
+    ReactionTypeEnum.CONGRATULATIONS: "congratulations_count",
+}
\ No newline at end of file
@@ -1,8 +1,15 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum, Index
 from sqlalchemy.sql import func
+import enum
 from app.db.base import Base
 
 
+class DigestFrequencyEnum(str, enum.Enum):
+    IMMEDIATE = "immediate"
+    HOURLY = "hourly"
+    DAILY = "daily"
+
+
 class Subscriber(Base):
     __tablename__ = "subscribers"
     
@@ -11,5 +18,18 @@ class Subscriber(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     verification_token = Column(String(255), nullable=True)
     is_verified = Column(Boolean, default=False, nullable=False)
+    digest_frequency = Column(
+        SQLEnum(DigestFrequencyEnum),
+        default=DigestFrequencyEnum.IMMEDIATE,
+        server_default=DigestFrequencyEnum.IMMEDIATE.name,
+        nullable=False
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_subscribers_created', 'created_at', 'id'),
+        Index('ix_subscribers_active_verified_created', 'is_active', 'is_verified', 'created_at', 'id'),
+        # Fan-out por bloques de id para cada frecuencia
+        Index('ix_subscribers_frequency_active_verified', 'digest_frequency', 'is_active', 'is_verified', 'id'),
+    )
@@ -27,6 +27,8 @@ from app.schemas.project import (
     ProjectUpdate,
     ProjectResponse,
     ProjectWithDetails,
+    ProjectListItem,
+    TechnologyFacet,
     CommentBase,
     CommentCreate,
     CommentResponse
@@ -36,6 +38,7 @@ from app.schemas.blog import (
     BlogPostCreate,
     BlogPostUpdate,
     BlogPostResponse,
+    BlogPostListItem,
     BlogPostWithDetails
 )
 from app.schemas.media import (
@@ -61,6 +64,7 @@ from app.schemas.contact import (
     ContactMessageResponse,
     MessageResponse
 )
+from app.schemas.search import SearchResult
 
 __all__ = [
     "Token",
@@ -83,6 +87,8 @@ __all__ = [
     "ProjectUpdate",
     "ProjectResponse",
     "ProjectWithDetails",
+    "ProjectListItem",
+    "TechnologyFacet",
     "CommentBase",
     "CommentCreate",
     "CommentResponse",
@@ -90,6 +96,7 @@ __all__ = [
     "BlogPostCreate",
     "BlogPostUpdate",
     "BlogPostResponse",
+    "BlogPostListItem",
     "BlogPostWithDetails",
     "ImageBase",
     "ImageCreate",
@@ -107,5 +114,6 @@ __all__ = [
     "ContactMessageBase",
     "ContactMessageCreate",
     "ContactMessageResponse",
-    "MessageResponse"
+    "MessageResponse",
+    "SearchResult"
 ]
\ No newline at end of file
@@ -39,6 +39,24 @@ class BlogPostResponse(BlogPostBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BlogPostListItem(BaseModel):
+    """Card representation used by list endpoints, without content"""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    author: str
+    tags: Optional[str] = None
+    published: bool
+    views: int
+    created_at: datetime
+    updated_at: datetime
+    images: List[ImageResponse] = []
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
 class BlogPostWithDetails(BlogPostResponse):
-    comments: List[CommentResponse] = []
+    comments: List[CommentResponse] = []  # Latest approved only
+    comments_next_cursor: Optional[str] = None  # Continues on /{post_id}/comments
     videos: List[VideoResponse] = []
\ No newline at end of file
@@ -4,6 +4,8 @@ from pydantic import BaseModel, EmailStr, Field, ConfigDict
 from typing import Optional
 from datetime import datetime
 
+from app.models.contact import DeliveryStatusEnum
+
 
 class ContactMessageBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
@@ -19,6 +21,8 @@ class ContactMessageCreate(ContactMessageBase):
 class ContactMessageResponse(ContactMessageBase):
     id: int
     read: bool
+    notification_status: DeliveryStatusEnum
+    confirmation_status: DeliveryStatusEnum
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
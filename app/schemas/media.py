@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
+from typing import List, Optional
 from datetime import datetime
+import json
 from app.models.media import VideoSourceEnum
 
 
@@ -22,6 +23,14 @@ class ImageUpdate(BaseModel):
     alt_text: Optional[str] = None
 
 
+class ImageVariantResponse(BaseModel):
+    """Resized copy of an image"""
+    url: str
+    width: int
+    height: int
+    content_type: str
+
+
 class ImageResponse(BaseModel):
     """Schema for image response"""
     id: int
@@ -33,10 +42,34 @@ class ImageResponse(BaseModel):
     alt_text: Optional[str] = None
     file_size: Optional[int] = None
     content_type: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: List[ImageVariantResponse] = []
     created_at: datetime
     updated_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
+    
+    @field_validator('variants', mode='before')
+    @classmethod
+    def parse_variants(cls, v):
+        # Stored as JSON text on the Image row
+        if v is None:
+            return []
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+    
+    @computed_field
+    @property
+    def srcset(self) -> Optional[str]:
+        """Value for <img srcset>: the variants plus the original, by width"""
+        if not self.variants:
+            return None
+        candidates = [f"{variant.url} {variant.width}w" for variant in self.variants]
+        if self.width:
+            candidates.append(f"{self.image_url} {self.width}w")
+        return ", ".join(candidates)
 
 
 class ImageUploadResponse(BaseModel):
@@ -39,6 +39,30 @@ class ProjectResponse(ProjectBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProjectListItem(BaseModel):
+    """Card representation used by list endpoints, without content"""
+    id: int
+    title: str
+    description: str
+    technologies: Optional[str] = None
+    github_url: Optional[str] = None
+    demo_url: Optional[str] = None
+    featured: bool
+    created_at: datetime
+    updated_at: datetime
+    images: List[ImageResponse] = []
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TechnologyFacet(BaseModel):
+    name: str
+    label: str
+    project_count: int
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
 class CommentBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     email: str
@@ -60,5 +84,6 @@ class CommentResponse(CommentBase):
 
 
 class ProjectWithDetails(ProjectResponse):
-    comments: List[CommentResponse] = []
+    comments: List[CommentResponse] = []  # Latest approved only
+    comments_next_cursor: Optional[str] = None  # Continues on /{project_id}/comments
     videos: List[VideoResponse] = []
\ No newline at end of file
@@ -0,0 +1,18 @@
+# app/schemas/search.py
+
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+class SearchResult(BaseModel):
+    entity_type: str = Field(..., description="blog_post or project")
+    id: int
+    title: str
+    slug: Optional[str] = Field(None, description="Blog post slug, null for projects")
+    created_at: Optional[datetime] = None
+    score: float = Field(..., description="BM25 relevance score")
+    title_highlight: str = Field(..., description="HTML-escaped title with matches wrapped in <mark>")
+    snippet: Optional[str] = Field(None, description="HTML-escaped excerpt around the first match")
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -2,19 +2,22 @@ from pydantic import BaseModel, EmailStr, ConfigDict
 from datetime import datetime
 from typing import Optional
 
+from app.models.subscriber import DigestFrequencyEnum
+
 
 class SubscriberBase(BaseModel):
     email: EmailStr
 
 
 class SubscriberCreate(SubscriberBase):
-    pass
+    digest_frequency: DigestFrequencyEnum = DigestFrequencyEnum.IMMEDIATE
 
 
 class SubscriberResponse(SubscriberBase):
     id: int
     is_active: bool
     is_verified: bool
+    digest_frequency: DigestFrequencyEnum
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
@@ -25,4 +28,10 @@ class SubscriberVerify(BaseModel):
 
 
 class UnsubscribeRequest(BaseModel):
-    email: EmailStr
\ No newline at end of file
+    token: str
+
+
+class SubscriberPreferencesUpdate(BaseModel):
+    """token: el del enlace de baja incluido en cada email"""
+    token: str
+    digest_frequency: DigestFrequencyEnum
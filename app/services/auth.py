@@ -93,7 +93,7 @@ class AuthService:
     def generate_2fa_code(self) -> str:
         return ''.join(secrets.choice(string.digits) for _ in range(6))
     
-    async def create_2fa_code(self, db: AsyncSession, user_id: int) -> str:
+    async def create_2fa_code(self, db: AsyncSession, user_id: int, *, commit: bool = True) -> str:
         code = self.generate_2fa_code()
         expires_at = datetime.utcnow() + timedelta(minutes=10)
         
@@ -103,7 +103,10 @@ class AuthService:
             expires_at=expires_at
         )
         db.add(two_fa_code)
-        await db.commit()
+        
+        if commit:
+            await db.commit()
+        
         return code
     
     async def verify_2fa_code(self, db: AsyncSession, user_id: int, code: str) -> bool:
@@ -0,0 +1,74 @@
+# app/services/comment_summary.py
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import logging
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.db.repositories.comment import comment_repository
+from app.services.email import email_service
+from app.services.outbox import outbox_service
+
+logger = logging.getLogger(__name__)
+
+
+class CommentSummaryService:
+    """
+    Resúmenes de moderación de comentarios para el admin.
+
+    Crear un comentario solo inserta la fila (notified=False). El scheduler
+    llama a send_summary cada COMMENT_SUMMARY_INTERVAL_SECONDS, que marca los
+    comentarios pendientes y encola un único email con el total y los más
+    recientes, en la misma transacción; una ola de spam produce un email
+    por intervalo en vez de uno por comentario.
+    """
+
+    MESSAGE_TYPE = "comment_summary"
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        *,
+        latest: int = 10
+    ):
+        self.session_factory = session_factory
+        self.latest = latest
+
+    async def send_summary(self) -> int:
+        """Encolar el resumen de los comentarios pendientes, devuelve cuántos incluye"""
+        async with self.session_factory() as db:
+            ids = await comment_repository.claim_unnotified(db)
+            if not ids:
+                await db.rollback()
+                return 0
+
+            rows = await comment_repository.get_summary_rows(db, ids[-self.latest:])
+            comments = []
+            for row in rows:
+                if row.blog_post_id is not None:
+                    item_type, item_title = "blog post", row.blog_title
+                    item_url = f"{settings.FRONTEND_URL}/blog/{row.blog_slug}"
+                else:
+                    item_type, item_title = "project", row.project_title
+                    item_url = f"{settings.FRONTEND_URL}/projects/{row.project_id}"
+                comments.append({
+                    "commenter_name": row.name,
+                    "commenter_email": row.email,
+                    "comment_content": row.content,
+                    "item_type": item_type,
+                    "item_title": item_title,
+                    "item_url": item_url
+                })
+
+            await outbox_service.enqueue(
+                db,
+                self.MESSAGE_TYPE,
+                email_service.build_comment_summary(len(ids), comments)
+            )
+            await db.commit()
+
+        logger.info(f"Queued moderation summary for {len(ids)} comments")
+        return len(ids)
+
+
+comment_summary_service = CommentSummaryService(latest=settings.COMMENT_SUMMARY_LATEST)
@@ -0,0 +1,95 @@
+# app/services/contact.py
+
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app.models.contact import ContactMessage, DeliveryStatusEnum
+from app.models.outbox import EmailOutbox, OutboxStatusEnum
+from app.db.repositories.contact import contact_repository
+from app.schemas.contact import ContactMessageCreate
+from app.services.email import email_service
+from app.services.outbox import outbox_service
+
+logger = logging.getLogger(__name__)
+
+
+class ContactService:
+    """
+    Guarda los mensajes de contacto y encola sus dos emails en el outbox.
+
+    La petición solo escribe en la base de datos; el worker del outbox
+    envía los emails y deja el resultado en notification_status y
+    confirmation_status del mensaje.
+    """
+
+    ENTITY_TYPE = "contact_message"
+    NOTIFICATION = "contact_notification"
+    CONFIRMATION = "contact_confirmation"
+
+    # message_type del outbox -> columna de estado en ContactMessage
+    STATUS_FIELDS = {
+        NOTIFICATION: "notification_status",
+        CONFIRMATION: "confirmation_status",
+    }
+
+    async def submit(self, db: AsyncSession, message_data: ContactMessageCreate) -> ContactMessage:
+        message = ContactMessage(
+            **message_data.model_dump(),
+            notification_status=DeliveryStatusEnum.QUEUED,
+            confirmation_status=DeliveryStatusEnum.QUEUED
+        )
+        db.add(message)
+        await db.flush()
+
+        await outbox_service.enqueue(
+            db,
+            self.NOTIFICATION,
+            email_service.build_contact_message_notification(
+                name=message_data.name,
+                email=message_data.email,
+                subject=message_data.subject,
+                message=message_data.message
+            ),
+            entity_id=message.id,
+            entity_type=self.ENTITY_TYPE
+        )
+        await outbox_service.enqueue(
+            db,
+            self.CONFIRMATION,
+            email_service.build_confirmation_to_user(
+                name=message_data.name,
+                email=message_data.email,
+                subject=message_data.subject
+            ),
+            entity_id=message.id,
+            entity_type=self.ENTITY_TYPE
+        )
+
+        await db.commit()
+        return message
+
+    async def record_delivery(
+        self,
+        db: AsyncSession,
+        row: EmailOutbox,
+        status: OutboxStatusEnum
+    ) -> None:
+        if row.entity_type != self.ENTITY_TYPE or row.entity_id is None:
+            return
+
+        delivery_status = DeliveryStatusEnum.SENT if status == OutboxStatusEnum.SENT else DeliveryStatusEnum.FAILED
+        await contact_repository.set_delivery_status(
+            db,
+            row.entity_id,
+            self.STATUS_FIELDS[row.message_type],
+            delivery_status
+        )
+
+        if delivery_status == DeliveryStatusEnum.FAILED:
+            logger.warning(f"Contact message {row.entity_id}: {row.message_type} could not be delivered")
+
+
+contact_service = ContactService()
+
+outbox_service.add_status_listener(ContactService.NOTIFICATION, contact_service.record_delivery)
+outbox_service.add_status_listener(ContactService.CONFIRMATION, contact_service.record_delivery)
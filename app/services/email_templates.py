@@ -0,0 +1,171 @@
+# app/services/email_templates.py
+
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Tuple
+from collections import OrderedDict
+from html import escape
+from pathlib import Path
+from string import Template
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+
+class SafeHTML(str):
+    """Already rendered HTML, inserted into HTML templates without escaping"""
+
+
+class CompiledTemplate:
+    """
+    A template split once into literal text and placeholders.
+
+    Sources use string.Template syntax ($name, ${name}, $$ for a literal $).
+    Rendering only joins the precomputed pieces with the context values,
+    escaped when the template is HTML (unless they are SafeHTML).
+    """
+
+    def __init__(self, name: str, source: str, *, html: bool):
+        self.name = name
+        self.html = html
+        self._literals: List[str] = []
+        self._fields: List[str] = []
+
+        position = 0
+        literal = []
+        for match in Template.pattern.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+
+            if match.group("escaped") is not None:
+                literal.append("$")
+                continue
+
+            field = match.group("named") or match.group("braced")
+            if field is None:
+                raise ValueError(f"Invalid placeholder in email template {name} at offset {match.start()}")
+
+            self._literals.append("".join(literal))
+            self._fields.append(field)
+            literal = []
+
+        literal.append(source[position:])
+        self._literals.append("".join(literal))
+
+    @property
+    def fields(self) -> frozenset:
+        return frozenset(self._fields)
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        parts = [self._literals[0]]
+        for field, literal in zip(self._fields, self._literals[1:]):
+            try:
+                value = context[field]
+            except KeyError:
+                raise KeyError(f"Email template {self.name} needs '{field}'") from None
+            if value is None:
+                value = ""
+            parts.append(escape(str(value)) if self.html and not isinstance(value, SafeHTML) else str(value))
+            parts.append(literal)
+        return "".join(parts)
+
+
+class EmailTemplateEngine:
+    """
+    Loads and compiles every email template once. Rendered bodies are only
+    cached when the caller opts in with cache=True: a subscriber notification
+    or digest renders the same body for every batch of the fan-out, so after
+    the first batch it is served from the cache. One-off mails (contact,
+    verification, two-factor codes) are rendered every time and never kept
+    in memory.
+
+    The key is the sorted tuple of context items, so Python's cached string
+    hashes make a hit cheaper than a render; contexts with unhashable values
+    skip the cache.
+    """
+
+    # Nunca se cachean, aunque el llamador lo pida: contienen secretos de un solo uso
+    NEVER_CACHED = frozenset({"two_factor_code"})
+
+    def __init__(self, directory: Path = TEMPLATES_DIR, *, cache_size: int = 256):
+        self.directory = directory
+        self.cache_size = cache_size
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._cache: "OrderedDict[Tuple[str, Hashable], str]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self.load()
+
+    def load(self) -> int:
+        """(Re)compile all templates in the directory, returns how many were loaded"""
+        templates = {}
+        for path in sorted(self.directory.iterdir()):
+            if path.suffix not in (".html", ".txt"):
+                continue
+            templates[path.name] = CompiledTemplate(
+                path.name,
+                path.read_text(encoding="utf-8"),
+                html=path.suffix == ".html"
+            )
+
+        self._templates = templates
+        self._cache.clear()
+        logger.debug(f"Loaded {len(templates)} email templates from {self.directory}")
+        return len(templates)
+
+    def get(self, name: str) -> CompiledTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise ValueError(f"Unknown email template: {name}") from None
+
+    def _content_key(self, context: Mapping[str, Any]) -> Optional[Hashable]:
+        if self.cache_size <= 0:
+            return None
+        key = tuple(sorted(context.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def render(self, name: str, context: Mapping[str, Any], *, content_key: Optional[Hashable] = None) -> str:
+        if content_key is None:
+            self._misses += 1
+            return self.get(name).render(context)
+
+        key = (name, content_key)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return cached
+
+        self._misses += 1
+        rendered = self._cache[key] = self.get(name).render(context)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rendered
+
+    def render_message(self, name: str, context: Mapping[str, Any], *, cache: bool = False) -> Dict[str, str]:
+        """Render <name>.txt and <name>.html into the Azure content fields, caching them only if cache=True"""
+        content_key = None
+        if cache and name not in self.NEVER_CACHED:
+            content_key = self._content_key(context)
+        return {
+            "plainText": self.render(f"{name}.txt", context, content_key=content_key),
+            "html": self.render(f"{name}.html", context, content_key=content_key)
+        }
+
+    def cache_info(self) -> Dict[str, int]:
+        return {
+            "templates": len(self._templates),
+            "entries": len(self._cache),
+            "hits": self._hits,
+            "misses": self._misses
+        }
+
+
+email_templates = EmailTemplateEngine(cache_size=settings.EMAIL_TEMPLATE_CACHE_SIZE)
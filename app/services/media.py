@@ -1,19 +1,196 @@
-from typing import List, Optional, Literal
+from typing import Any, Dict, Iterable, List, Optional, Literal, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, delete
 from fastapi import HTTPException, status, UploadFile
+import asyncio
+import json
+import logging
 
 from app.models.media import Image, Video
-from app.core.azure_storage import azure_storage_service
+from app.core.image_processing import image_processor
+from app.core.storage import BatchDeleteError, storage_service
+from app.services.outbox import OutboxJob, OutboxService, outbox_service
+
+logger = logging.getLogger(__name__)
 
 
 EntityType = Literal["project", "blog_post", "profile"]
 
 
+def _image_blob_names(blob_name: Optional[str], variants: Optional[str]) -> List[str]:
+    """Blobs of an image: the original and its resized variants"""
+    blob_names = [blob_name] if blob_name else []
+    if variants:
+        blob_names.extend(variant["blob_name"] for variant in json.loads(variants))
+    return blob_names
+
+
 class MediaService:
-    """Service for managing media (images and videos) with Azure Blob Storage integration"""
-    
-    
+    """
+    Service for managing media (images and videos) stored through the storage backend
+
+    Blobs of deleted or replaced images are removed by a BLOB_DELETION outbox
+    job enqueued in the same transaction as the row change, so requests never
+    wait on storage and a failed delete is retried instead of leaking the blob.
+
+    Uploaded images also get resized variants (IMAGE_VARIANT_WIDTHS), stored
+    next to the original and listed on Image.variants for the srcset.
+
+    Blobs are content-addressed and shared: an upload whose SHA-256 matches
+    an existing image reuses its blobs and variants without uploading. The
+    Image rows with a content_hash are that content's reference count, so
+    blobs are only queued for deletion when the last row goes away, and the
+    deletion job checks again before deleting.
+    """
+
+    BLOB_DELETION = "blob_deletion"
+
+    async def _enqueue_blob_deletion(self, db: AsyncSession, blob_names: List[str]) -> None:
+        if blob_names:
+            await outbox_service.enqueue(
+                db, self.BLOB_DELETION, {"blob_names": blob_names}, priority=OutboxService.PRIORITY_BULK
+            )
+
+    async def _referenced_hashes(self, db: AsyncSession, content_hashes: Iterable[Optional[str]]) -> Set[str]:
+        """Content hashes still used by at least one Image row"""
+        content_hashes = {content_hash for content_hash in content_hashes if content_hash}
+        if not content_hashes:
+            return set()
+
+        result = await db.execute(
+            select(Image.content_hash).where(Image.content_hash.in_(content_hashes)).distinct()
+        )
+        return set(result.scalars().all())
+
+    async def _release_blobs(
+        self,
+        db: AsyncSession,
+        released: List[Tuple[Optional[str], Optional[str], Optional[str]]]
+    ) -> None:
+        """
+        Queue the blobs of removed or replaced images, given as (blob_name,
+        variants, content_hash), unless other images still share their content
+        """
+        await db.flush()
+        referenced = await self._referenced_hashes(db, (content_hash for _, _, content_hash in released))
+
+        blob_names = [
+            name
+            for blob_name, variants, content_hash in released
+            if content_hash not in referenced
+            for name in _image_blob_names(blob_name, variants)
+        ]
+        await self._enqueue_blob_deletion(db, list(dict.fromkeys(blob_names)))
+
+    async def delete_blobs(self, job: OutboxJob) -> None:
+        """
+        Outbox handler: delete the job's blobs in one batch call. Blobs that
+        could not be deleted are saved back to the payload before re-raising,
+        so the retry only sends those. Content an image has started using
+        again since the job was queued is kept.
+        """
+        blob_names = job.payload["blob_names"]
+
+        async with job.session() as db:
+            referenced = await self._referenced_hashes(db, map(storage_service.content_hash_of, blob_names))
+        if referenced:
+            blob_names = [name for name in blob_names if storage_service.content_hash_of(name) not in referenced]
+            if not blob_names:
+                return None
+
+        try:
+            results = await storage_service.backend.delete_batch(blob_names)
+        except BatchDeleteError as e:
+            async with job.session() as db:
+                await job.checkpoint(db, blob_names=e.failed)
+                await db.commit()
+            raise
+
+        missing = sum(1 for deleted in results.values() if not deleted)
+        logger.info(f"Blob deletion {job.id}: {len(results) - missing} deleted, {missing} already missing")
+        return None
+
+    async def _create_variants(self, file: UploadFile, blob_name: str) -> Dict[str, Any]:
+        """
+        Resize the uploaded image in the process pool and store the variants
+        next to blob_name. Returns the Image columns to set; an image that
+        cannot be processed keeps only the original.
+        """
+        columns = {"width": None, "height": None, "variants": None}
+        if not image_processor.supports(file.filename):
+            return columns
+
+        try:
+            processed = await image_processor.process_file(file.file)
+        except Exception as e:
+            logger.warning(f"Could not create variants of {blob_name}: {e}")
+            return columns
+        finally:
+            await file.seek(0)
+
+        columns.update(width=processed.width, height=processed.height)
+        if not processed.variants:
+            return columns
+
+        results = await asyncio.gather(*(
+            storage_service.upload_variant(
+                blob_name,
+                variant.width,
+                variant.data,
+                image_processor.content_type,
+                image_processor.extension
+            )
+            for variant in processed.variants
+        ), return_exceptions=True)
+
+        stored = [result for result in results if not isinstance(result, BaseException)]
+        if len(stored) < len(results):
+            # Stored ones are kept: their names are content-addressed, a new upload reuses them
+            logger.warning(f"Could not store variants of {blob_name}, serving the original only")
+            return columns
+
+        columns["variants"] = json.dumps([
+            {
+                "width": variant.width,
+                "height": variant.height,
+                "url": variant_url,
+                "blob_name": variant_name,
+                "content_type": image_processor.content_type
+            }
+            for variant, (variant_url, variant_name) in zip(processed.variants, stored)
+        ])
+        return columns
+
+    async def _store_image(self, db: AsyncSession, file: UploadFile) -> Tuple[Dict[str, Any], bool]:
+        """
+        Hash the upload and return the Image columns of its blobs: copied from
+        an image with the same content if there is one (nothing is uploaded),
+        otherwise from a new upload and its variants. The flag tells whether
+        new blobs were created, which the caller removes if its write fails.
+        """
+        content_hash = await storage_service.hash_image(file)
+
+        query = select(Image).where(
+            Image.content_hash == content_hash,
+            Image.blob_name.is_not(None)
+        ).limit(1)
+        existing = (await db.execute(query)).scalar_one_or_none()
+
+        if existing is not None:
+            return {
+                "image_url": existing.image_url,
+                "blob_name": existing.blob_name,
+                "content_hash": content_hash,
+                "width": existing.width,
+                "height": existing.height,
+                "variants": existing.variants
+            }, False
+
+        blob_url, blob_name, created = await storage_service.upload_image(file, content_hash)
+        columns = {"image_url": blob_url, "blob_name": blob_name, "content_hash": content_hash}
+        columns.update(await self._create_variants(file, blob_name))
+        return columns, created
+
     async def get_images(
         self,
         db: AsyncSession,
@@ -62,7 +239,7 @@ class MediaService:
         commit: bool = True
     ) -> Image:
         """
-        Upload image to Azure Blob Storage and create database record
+        Upload image to the storage backend and create database record
         
         Args:
             db: Database session
@@ -74,14 +251,13 @@ class MediaService:
             commit: Whether to commit the transaction
             
         Returns:
-            Created Image object with Azure blob URL
+            Created Image object with the stored image URL
         """
+        columns: Dict[str, Any] = {}
+        created = False
+        
         try:
-            blob_url, blob_name = await azure_storage_service.upload_image(
-                file=file,
-                entity_type=entity_type,
-                entity_id=entity_id
-            )
+            columns, created = await self._store_image(db, file)
             
             file.file.seek(0, 2)
             file_size = file.file.tell()
@@ -90,12 +266,11 @@ class MediaService:
             image = Image(
                 entity_id=entity_id,
                 entity_type=entity_type,
-                image_url=blob_url,
-                blob_name=blob_name,
                 image_order=image_order,
                 alt_text=alt_text,
                 file_size=file_size,
-                content_type=file.content_type
+                content_type=file.content_type,
+                **columns
             )
             
             db.add(image)
@@ -109,8 +284,10 @@ class MediaService:
         except HTTPException:
             raise
         except Exception as e:
-            if 'blob_name' in locals():
-                await azure_storage_service.delete_image(blob_name)
+            if created:
+                await storage_service.delete_images_batch(
+                    _image_blob_names(columns["blob_name"], columns.get("variants"))
+                )
             
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -200,7 +377,7 @@ class MediaService:
     ) -> Optional[Image]:
         """
         Replace an existing image with a new file
-        Deletes old blob and uploads new one
+        Uploads the new blob; the old one is deleted in the background
         """
         # Get existing image
         image = await self.get_image(db, image_id, entity_id, entity_type)
@@ -208,15 +385,13 @@ class MediaService:
         if not image:
             return None
         
-        old_blob_name = image.blob_name
+        old_blobs = (image.blob_name, image.variants, image.content_hash)
+        columns: Dict[str, Any] = {}
+        created = False
         
         try:
-            # Upload new image to Azure
-            blob_url, blob_name = await azure_storage_service.upload_image(
-                file=new_file,
-                entity_type=entity_type,
-                entity_id=entity_id
-            )
+            # Upload new image and its variants to storage, unless already stored
+            columns, created = await self._store_image(db, new_file)
             
             # Get file size
             new_file.file.seek(0, 2)
@@ -224,8 +399,8 @@ class MediaService:
             new_file.file.seek(0)
             
             # Update image record
-            image.image_url = blob_url
-            image.blob_name = blob_name
+            for column, value in columns.items():
+                setattr(image, column, value)
             image.file_size = file_size
             image.content_type = new_file.content_type
             
@@ -235,22 +410,22 @@ class MediaService:
             if alt_text is not None:
                 image.alt_text = alt_text
             
+            await self._release_blobs(db, [old_blobs])
+            
             if commit:
                 await db.commit()
                 await db.refresh(image)
             
-            # Delete old blob from Azure (fire and forget)
-            if old_blob_name:
-                await azure_storage_service.delete_image(old_blob_name)
-            
             return image
             
         except HTTPException:
             raise
         except Exception as e:
-            # Clean up new blob if database update fails
-            if 'blob_name' in locals():
-                await azure_storage_service.delete_image(blob_name)
+            # Clean up new blobs if database update fails
+            if created:
+                await storage_service.delete_images_batch(
+                    _image_blob_names(columns["blob_name"], columns.get("variants"))
+                )
             
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -267,23 +442,22 @@ class MediaService:
         commit: bool = True
     ) -> bool:
         """
-        Delete image from database and Azure Blob Storage
+        Delete image from database; its blobs are deleted in the background
+        once no other image shares them
         """
         image = await self.get_image(db, image_id, entity_id, entity_type)
         
         if not image:
             return False
         
-        blob_name = image.blob_name
+        released = (image.blob_name, image.variants, image.content_hash)
         
         await db.delete(image)
+        await self._release_blobs(db, [released])
         
         if commit:
             await db.commit()
         
-        if blob_name:
-            await azure_storage_service.delete_image(blob_name)
-        
         return True
     
     async def delete_all_images(
@@ -295,26 +469,28 @@ class MediaService:
         commit: bool = True
     ) -> int:
         """
-        Delete all images for an entity from database and Azure Blob Storage
+        Delete all images for an entity from database; their blobs (unless
+        shared with other images) are deleted in the background by one batch job
         """
-        images = await self.get_images(db, entity_id, entity_type)
-        blob_names = [img.blob_name for img in images if img.blob_name]
+        entity_filter = and_(
+            Image.entity_id == entity_id,
+            Image.entity_type == entity_type
+        )
         
-        query = delete(Image).where(
-            and_(
-                Image.entity_id == entity_id,
-                Image.entity_type == entity_type
+        stored = await db.execute(
+            select(Image.blob_name, Image.variants, Image.content_hash).where(
+                entity_filter,
+                Image.blob_name.is_not(None)
             )
         )
+        released = [tuple(row) for row in stored]
         
-        result = await db.execute(query)
+        result = await db.execute(delete(Image).where(entity_filter))
+        await self._release_blobs(db, released)
         
         if commit:
             await db.commit()
         
-        if blob_names:
-            await azure_storage_service.delete_images_batch(blob_names)
-        
         return result.rowcount
     
     async def load_images_for_entities(
@@ -446,4 +622,6 @@ class MediaService:
         return True
 
 
-media_service = MediaService()
\ No newline at end of file
+media_service = MediaService()
+
+outbox_service.register(MediaService.BLOB_DELETION, media_service.delete_blobs)
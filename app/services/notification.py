@@ -1,101 +1,323 @@
-from typing import List
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import asyncio
 import logging
 
+from app.config import settings
+from app.core.security import SUBSCRIBER_TOKEN_UNSUBSCRIBE, create_subscriber_token
+from app.db.session import AsyncSessionLocal
 from app.db.repositories.subscriber import subscriber_repository
+from app.db.repositories.blog import blog_repository
+from app.db.repositories.project import project_repository
+from app.db.repositories.digest import digest_repository
+from app.models.blog import BlogPost
+from app.models.project import Project
+from app.models.subscriber import DigestFrequencyEnum
 from app.services.email import email_service
+from app.services.email_transport import PermanentDeliveryError
+from app.services.outbox import OutboxJob, OutboxService, outbox_service
 
 logger = logging.getLogger(__name__)
 
 
 class NotificationService:
-    """Servicio para gestionar notificaciones a suscriptores"""
-    
-    async def notify_new_blog_post(
+    """
+    Servicio para gestionar notificaciones a suscriptores.
+
+    Los endpoints solo encolan un job en el outbox dentro de su transacción;
+    el worker del outbox ejecuta el fan-out, que recorre los suscriptores por
+    bloques y encola un job de envío por lote. Cada bloque usa una sesión
+    corta y guarda su avance en el job, así la conexión vuelve al pool entre
+    lotes y un reintento continúa donde quedó.
+
+    El cuerpo se renderiza una sola vez; cada suscriptor recibe su propio
+    email con un enlace de baja firmado (sin escribir nada por destinatario).
+    Dentro de un lote hasta SUBSCRIBER_SEND_CONCURRENCY envíos van en
+    paralelo, y el worker del outbox ejecuta hasta OUTBOX_CONCURRENCY lotes a
+    la vez; el total lo limita el token bucket de OUTBOX_SEND_RATE_PER_SECOND.
+    Con los valores por defecto (10/s) un lote de 50 tarda unos 5 segundos y
+    1.000 suscriptores unos 100 segundos.
+
+    Solo los suscriptores con frecuencia 'immediate' reciben un email por
+    publicación. Cada publicación también queda como DigestItem y
+    run_due_digests (llamado por el scheduler) encola un único resumen por
+    ventana para los suscriptores 'hourly' y 'daily', que se reparte con el
+    mismo fan-out por lotes.
+    """
+
+    NEW_BLOG_POST = "new_blog_post"
+    NEW_PROJECT = "new_project"
+    SUBSCRIBER_DIGEST = "subscriber_digest"
+    SUBSCRIBER_NOTIFICATION = "subscriber_notification"
+
+    # Un resumen se envía cuando su item pendiente más antiguo tiene esta edad
+    DIGEST_WINDOWS = {
+        DigestFrequencyEnum.HOURLY: timedelta(hours=1),
+        DigestFrequencyEnum.DAILY: timedelta(days=1),
+    }
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        send_concurrency: int = 5
+    ):
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.send_concurrency = send_concurrency
+
+    async def enqueue_new_blog_post(self, db: AsyncSession, post_id: int) -> None:
+        await outbox_service.enqueue(
+            db, self.NEW_BLOG_POST, {"post_id": post_id}, priority=OutboxService.PRIORITY_BULK
+        )
+        digest_repository.add_item(db, self.NEW_BLOG_POST, post_id)
+
+    async def enqueue_new_project(self, db: AsyncSession, project_id: int) -> None:
+        await outbox_service.enqueue(
+            db, self.NEW_PROJECT, {"project_id": project_id}, priority=OutboxService.PRIORITY_BULK
+        )
+        digest_repository.add_item(db, self.NEW_PROJECT, project_id)
+
+    def unsubscribe_url(self, subscriber_id: int) -> str:
+        token = create_subscriber_token(subscriber_id, SUBSCRIBER_TOKEN_UNSUBSCRIBE)
+        return f"{settings.FRONTEND_URL}/unsubscribe?token={token}"
+
+    async def _fan_out(
         self,
-        db: AsyncSession,
-        blog_title: str,
-        blog_slug: str,
-        blog_excerpt: str
-    ) -> bool:
+        job: OutboxJob,
+        content: Dict[str, str],
+        digest_frequency: DigestFrequencyEnum = DigestFrequencyEnum.IMMEDIATE
+    ) -> Tuple[int, int]:
         """
-        Notificar a todos los suscriptores activos sobre un nuevo blog post
+        Encolar un job de envío por lote de suscriptores con esa frecuencia,
+        cada lote en su propia sesión y transacción junto con el checkpoint del job
         """
-        try:
-            # Obtener todos los suscriptores activos y verificados
-            subscribers = await subscriber_repository.get_active_verified(db)
-            
-            if not subscribers:
-                logger.info("No active subscribers to notify")
-                return True
-            
-            # Extraer emails
-            subscriber_emails = [sub.email for sub in subscribers]
-            
-            # Enviar notificación en lotes de 50 para evitar límites de email
-            batch_size = 50
-            for i in range(0, len(subscriber_emails), batch_size):
-                batch = subscriber_emails[i:i + batch_size]
-                
-                success = await email_service.send_new_blog_notification(
-                    subscribers=batch,
-                    blog_title=blog_title,
-                    blog_slug=blog_slug,
-                    blog_excerpt=blog_excerpt or "Check out my latest blog post!"
+        after_id = job.payload.get("after_id", 0)
+        batches = notified = 0
+
+        while True:
+            async with job.session() as db:
+                chunk = await subscriber_repository.get_active_verified_chunk(
+                    db,
+                    after_id=after_id,
+                    limit=self.batch_size,
+                    digest_frequency=digest_frequency
                 )
-                
-                if not success:
-                    logger.error(f"Failed to send notification to batch {i//batch_size + 1}")
-            
-            logger.info(f"Blog notifications sent to {len(subscriber_emails)} subscribers")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error notifying subscribers about new blog: {str(e)}")
-            return False
-    
-    async def notify_new_project(
-        self,
-        db: AsyncSession,
-        project_title: str,
-        project_id: int,
-        project_description: str
-    ) -> bool:
+                if not chunk:
+                    break
+
+                after_id = chunk[-1][0]
+                await outbox_service.enqueue(
+                    db,
+                    self.SUBSCRIBER_NOTIFICATION,
+                    {"content": content, "recipients": chunk},
+                    priority=OutboxService.PRIORITY_BULK
+                )
+                await job.checkpoint(db, after_id=after_id)
+                await db.commit()
+
+            batches += 1
+            notified += len(chunk)
+
+        return batches, notified
+
+    async def fan_out_new_blog_post(self, job: OutboxJob) -> None:
+        async with job.session() as db:
+            post = await blog_repository.get(db, job.payload["post_id"])
+
+        if not post or not post.published:
+            logger.info(f"Blog post {job.payload['post_id']} no longer published, skipping notification")
+            return None
+
+        batches, notified = await self._fan_out(
+            job,
+            email_service.build_new_blog_content(
+                blog_title=post.title,
+                blog_slug=post.slug,
+                blog_excerpt=post.excerpt or "Check out my latest blog post!"
+            )
+        )
+
+        logger.info(f"Blog notifications queued for {notified} subscribers in {batches} batches")
+        return None
+
+    async def fan_out_new_project(self, job: OutboxJob) -> None:
+        async with job.session() as db:
+            project = await project_repository.get(db, job.payload["project_id"])
+
+        if not project:
+            logger.info(f"Project {job.payload['project_id']} no longer exists, skipping notification")
+            return None
+
+        batches, notified = await self._fan_out(
+            job,
+            email_service.build_new_project_content(
+                project_title=project.title,
+                project_id=project.id,
+                project_description=project.description
+            )
+        )
+
+        logger.info(f"Project notifications queued for {notified} subscribers in {batches} batches")
+        return None
+
+    async def run_due_digests(self) -> int:
         """
-        Notificar a todos los suscriptores activos sobre un nuevo proyecto
+        Encolar el resumen de cada frecuencia cuya ventana ya venció, devuelve
+        cuántos se encolaron. Los items se marcan en la misma transacción que
+        el job, así dos instancias no envían el mismo resumen.
         """
-        try:
-            # Obtener todos los suscriptores activos y verificados
-            subscribers = await subscriber_repository.get_active_verified(db)
-            
-            if not subscribers:
-                logger.info("No active subscribers to notify")
-                return True
-            
-            # Extraer emails
-            subscriber_emails = [sub.email for sub in subscribers]
-            
-            # Enviar notificación en lotes de 50
-            batch_size = 50
-            for i in range(0, len(subscriber_emails), batch_size):
-                batch = subscriber_emails[i:i + batch_size]
-                
-                success = await email_service.send_new_project_notification(
-                    subscribers=batch,
-                    project_title=project_title,
-                    project_id=project_id,
-                    project_description=project_description
+        queued = 0
+        now = datetime.utcnow()
+
+        for frequency, window in self.DIGEST_WINDOWS.items():
+            async with self.session_factory() as db:
+                if not await digest_repository.has_pending(db, frequency, now - window):
+                    continue
+
+                item_ids = await digest_repository.claim_pending(db, frequency)
+                if not item_ids:
+                    await db.rollback()
+                    continue
+
+                await outbox_service.enqueue(
+                    db,
+                    self.SUBSCRIBER_DIGEST,
+                    {"frequency": frequency.value, "item_ids": item_ids},
+                    priority=OutboxService.PRIORITY_BULK
                 )
-                
-                if not success:
-                    logger.error(f"Failed to send notification to batch {i//batch_size + 1}")
-            
-            logger.info(f"Project notifications sent to {len(subscriber_emails)} subscribers")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error notifying subscribers about new project: {str(e)}")
-            return False
-
-
-notification_service = NotificationService()
\ No newline at end of file
+                await db.commit()
+
+            queued += 1
+            logger.info(f"Queued {frequency.value} digest with {len(item_ids)} items")
+
+        async with self.session_factory() as db:
+            await digest_repository.purge_sent(db)
+            await db.commit()
+
+        return queued
+
+    async def _load_digest_items(self, db: AsyncSession, item_ids: List[int]) -> List[Dict[str, str]]:
+        """Items del resumen en orden de publicación, omitiendo los que ya no están publicados"""
+        items = await digest_repository.get_by_ids(db, item_ids)
+        post_ids = [item.entity_id for item in items if item.entity_type == self.NEW_BLOG_POST]
+        project_ids = [item.entity_id for item in items if item.entity_type == self.NEW_PROJECT]
+
+        posts = {}
+        if post_ids:
+            posts = {
+                post.id: post
+                for post in await blog_repository.get_multi(
+                    db,
+                    filters=[BlogPost.id.in_(post_ids), BlogPost.published == True],
+                    columns=[BlogPost.title, BlogPost.slug, BlogPost.excerpt],
+                    limit=len(post_ids)
+                )
+            }
+        projects = {}
+        if project_ids:
+            projects = {
+                project.id: project
+                for project in await project_repository.get_multi(
+                    db,
+                    filters=[Project.id.in_(project_ids)],
+                    columns=[Project.title, Project.description],
+                    limit=len(project_ids)
+                )
+            }
+
+        entries = []
+        for item in items:
+            if item.entity_type == self.NEW_BLOG_POST and item.entity_id in posts:
+                post = posts[item.entity_id]
+                entries.append({
+                    "kind": "Blog post",
+                    "title": post.title,
+                    "summary": post.excerpt or "",
+                    "url": f"{settings.FRONTEND_URL}/blog/{post.slug}"
+                })
+            elif item.entity_type == self.NEW_PROJECT and item.entity_id in projects:
+                project = projects[item.entity_id]
+                entries.append({
+                    "kind": "Project",
+                    "title": project.title,
+                    "summary": project.description,
+                    "url": f"{settings.FRONTEND_URL}/projects/{project.id}"
+                })
+        return entries
+
+    async def fan_out_digest(self, job: OutboxJob) -> None:
+        frequency = DigestFrequencyEnum(job.payload["frequency"])
+
+        async with job.session() as db:
+            entries = await self._load_digest_items(db, job.payload["item_ids"])
+
+        if not entries:
+            logger.info(f"Nothing left to send in {frequency.value} digest {job.id}")
+            return None
+
+        batches, notified = await self._fan_out(
+            job,
+            email_service.build_digest_content(frequency.value, entries),
+            digest_frequency=frequency
+        )
+
+        logger.info(f"{frequency.value.capitalize()} digest queued for {notified} subscribers in {batches} batches")
+        return None
+
+    async def send_subscriber_batch(self, job: OutboxJob) -> None:
+        """
+        Enviar el contenido compartido a cada suscriptor del lote, con su
+        enlace firmado para darse de baja, hasta send_concurrency a la vez.
+        Ante un error transitorio se guardan los destinatarios pendientes para
+        que el reintento no repita los ya enviados.
+        """
+        content = job.payload["content"]
+        recipients = job.payload["recipients"]
+        pending = job.payload.get("pending", list(range(len(recipients))))
+
+        semaphore = asyncio.Semaphore(self.send_concurrency)
+
+        async def send(index: int) -> Optional[Exception]:
+            subscriber_id, email = recipients[index]
+            message = email_service.build_subscriber_message(content, email, self.unsubscribe_url(subscriber_id))
+            async with semaphore:
+                try:
+                    await outbox_service.send_email(message, self.SUBSCRIBER_NOTIFICATION)
+                except PermanentDeliveryError as e:
+                    logger.warning(f"Notification to subscriber {subscriber_id} rejected: {str(e)}")
+                    return e
+                except Exception as e:
+                    return e
+            return None
+
+        errors = await asyncio.gather(*(send(index) for index in pending))
+        rejected = sum(isinstance(error, PermanentDeliveryError) for error in errors)
+        failed = [
+            index for index, error in zip(pending, errors)
+            if error is not None and not isinstance(error, PermanentDeliveryError)
+        ]
+
+        if failed:
+            if len(failed) < len(pending):
+                async with job.session() as db:
+                    await job.checkpoint(db, pending=failed)
+                    await db.commit()
+            raise errors[pending.index(failed[0])]
+
+        logger.info(
+            f"Subscriber batch {job.id}: {len(pending) - rejected} sent, {rejected} rejected"
+        )
+        return None
+
+
+notification_service = NotificationService(
+    batch_size=settings.SUBSCRIBER_NOTIFICATION_BATCH_SIZE,
+    send_concurrency=settings.SUBSCRIBER_SEND_CONCURRENCY
+)
+
+outbox_service.register(NotificationService.NEW_BLOG_POST, notification_service.fan_out_new_blog_post)
+outbox_service.register(NotificationService.NEW_PROJECT, notification_service.fan_out_new_project)
+outbox_service.register(NotificationService.SUBSCRIBER_DIGEST, notification_service.fan_out_digest)
+outbox_service.register(NotificationService.SUBSCRIBER_NOTIFICATION, notification_service.send_subscriber_batch)
@@ -0,0 +1,425 @@
+# app/services/outbox.py
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+from dataclasses import dataclass
+from sqlalchemy import select, update, and_, or_, event
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import asyncio
+import json
+import random
+import time
+import uuid
+import logging
+
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.rate_limit import TokenBucket
+from app.db.session import AsyncSessionLocal
+from app.models.outbox import EmailOutbox, OutboxStatusEnum
+from app.services.email import email_service
+from app.services.email_transport import PermanentDeliveryError
+
+logger = logging.getLogger(__name__)
+
+_WAKE_FLAG = "outbox_wake"
+
+OUTBOX_PROCESSED = metrics.counter(
+    "outbox_messages_processed_total",
+    "Outbox rows processed, by message type and resulting status (sent, pending = retry, dead)",
+    ["message_type", "status"]
+)
+OUTBOX_RATE_LIMIT_WAIT_SECONDS = metrics.histogram(
+    "outbox_rate_limit_wait_seconds",
+    "Time sends waited for the outbox rate limiter",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+
+class LeaseLostError(Exception):
+    """The row was claimed again by another worker after its lease expired"""
+
+
+@dataclass
+class OutboxBatchResult:
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    dead: int = 0
+
+
+class OutboxJob:
+    """
+    Execution context handed to job handlers.
+
+    A job never gets a long-lived session: it opens a short one per unit of
+    work with session() and commits it together with a checkpoint(), so the
+    connection goes back to the pool between chunks and a retried job
+    resumes after the last committed chunk instead of starting over.
+    """
+
+    def __init__(self, service: "OutboxService", row: EmailOutbox):
+        self._service = service
+        self._row = row
+        self.id = row.id
+        self.payload: Dict[str, Any] = json.loads(row.payload)
+
+    def session(self) -> AsyncSession:
+        return self._service.session_factory()
+
+    async def checkpoint(self, db: AsyncSession, **state: Any) -> None:
+        """Merge state into the payload and extend the lease; the caller commits"""
+        self.payload.update(state)
+        result = await db.execute(
+            update(EmailOutbox)
+            .where(and_(EmailOutbox.id == self._row.id, EmailOutbox.claim_token == self._row.claim_token))
+            .values(
+                payload=json.dumps(self.payload),
+                locked_until=datetime.utcnow() + self._service.lease
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            raise LeaseLostError(f"Outbox job {self.id} is no longer claimed by this worker")
+
+
+OutboxHandler = Callable[[OutboxJob], Awaitable[None]]
+StatusListener = Callable[[AsyncSession, EmailOutbox, OutboxStatusEnum], Awaitable[None]]
+
+
+class OutboxService:
+    """
+    Transactional email outbox.
+
+    Request handlers call enqueue() with the same session as their business
+    write, so the email is stored if and only if that write commits. A
+    background worker claims due rows in batches, delivers them with bounded
+    concurrency, retries failures with exponential backoff and moves rows
+    that keep failing (or are rejected permanently) to the dead state.
+
+    Rows whose message_type has a registered handler are jobs (for example a
+    subscriber fan-out) run through an OutboxJob; every other row carries a
+    built Azure message that is sent as is. No session is held while a
+    message is being sent.
+
+    Rows have a priority and are split in two lanes, each with its own
+    worker loop and concurrency: transactional mail (2FA codes, contact
+    confirmations, verification links) and bulk work (subscriber fan-out,
+    digests, blob deletion). Only bulk sends wait on the optional token
+    bucket that caps the rate at which the provider is called, so a large
+    fan-out never delays a login code.
+
+    Status listeners let the code that enqueued a message record its final
+    outcome (sent or dead) on its own rows, in the same transaction that
+    updates the outbox row.
+    """
+
+    # Lower values are claimed first; rows at or above PRIORITY_BULK run in the bulk lane
+    PRIORITY_TRANSACTIONAL = 0
+    PRIORITY_BULK = 10
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        *,
+        batch_size: int = 20,
+        concurrency: int = 5,
+        poll_interval: float = 5,
+        max_attempts: int = 6,
+        backoff_base: float = 30,
+        backoff_max: float = 3600,
+        lease: int = 300,
+        rate_limiter: Optional[TokenBucket] = None
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease = timedelta(seconds=lease)
+        self.rate_limiter = rate_limiter
+        self._handlers: Dict[str, OutboxHandler] = {}
+        self._status_listeners: Dict[str, StatusListener] = {}
+        self._wake = {False: asyncio.Event(), True: asyncio.Event()}
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+
+    def register(self, message_type: str, handler: OutboxHandler) -> None:
+        self._handlers[message_type] = handler
+
+    def add_status_listener(self, message_type: str, listener: StatusListener) -> None:
+        self._status_listeners[message_type] = listener
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        message_type: str,
+        payload: Dict[str, Any],
+        *,
+        delay: Optional[timedelta] = None,
+        max_attempts: Optional[int] = None,
+        entity_id: Optional[int] = None,
+        entity_type: Optional[str] = None,
+        priority: int = PRIORITY_TRANSACTIONAL
+    ) -> EmailOutbox:
+        """Add an outbox row to the caller's transaction; the caller commits"""
+        row = EmailOutbox(
+            message_type=message_type,
+            payload=json.dumps(payload),
+            priority=priority,
+            entity_id=entity_id,
+            entity_type=entity_type,
+            status=OutboxStatusEnum.PENDING,
+            attempts=0,
+            max_attempts=max_attempts or self.max_attempts,
+            next_attempt_at=datetime.utcnow() + (delay or timedelta())
+        )
+        db.add(row)
+        db.sync_session.info[_WAKE_FLAG] = True
+        return row
+
+    def wake(self) -> None:
+        for event in self._wake.values():
+            event.set()
+
+    def backoff(self, attempts: int) -> timedelta:
+        delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+        return timedelta(seconds=delay + random.uniform(0, delay * 0.1))
+
+    async def _claim(self, bulk: Optional[bool] = None) -> List[EmailOutbox]:
+        """Claim due rows of one lane (or of both when bulk is None), most urgent first"""
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        claimable = or_(
+            and_(
+                EmailOutbox.status == OutboxStatusEnum.PENDING,
+                EmailOutbox.next_attempt_at <= now
+            ),
+            and_(
+                EmailOutbox.status == OutboxStatusEnum.PROCESSING,
+                EmailOutbox.locked_until < now
+            )
+        )
+        if bulk is not None:
+            is_bulk = EmailOutbox.priority >= self.PRIORITY_BULK
+            claimable = and_(claimable, is_bulk if bulk else ~is_bulk)
+
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(EmailOutbox.id)
+                .where(claimable)
+                .order_by(EmailOutbox.priority, EmailOutbox.next_attempt_at, EmailOutbox.id)
+                .limit(self.batch_size)
+            )
+            ids = list(result.scalars().all())
+            if not ids:
+                return []
+
+            # The claimable condition is repeated so concurrent workers never
+            # claim the same row twice
+            await db.execute(
+                update(EmailOutbox)
+                .where(and_(EmailOutbox.id.in_(ids), claimable))
+                .values(
+                    status=OutboxStatusEnum.PROCESSING,
+                    claim_token=token,
+                    locked_until=now + self.lease
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+            result = await db.execute(
+                select(EmailOutbox).where(EmailOutbox.claim_token == token)
+            )
+            return list(result.scalars().all())
+
+    async def _finish(self, db: AsyncSession, row: EmailOutbox, **values: Any) -> None:
+        result = await db.execute(
+            update(EmailOutbox)
+            .where(and_(EmailOutbox.id == row.id, EmailOutbox.claim_token == row.claim_token))
+            .values(
+                attempts=row.attempts + 1,
+                claim_token=None,
+                locked_until=None,
+                **values
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        status = values.get("status")
+        listener = self._status_listeners.get(row.message_type)
+        if listener is None or result.rowcount == 0 or status not in (OutboxStatusEnum.SENT, OutboxStatusEnum.DEAD):
+            return
+
+        try:
+            async with db.begin_nested():
+                await listener(db, row, status)
+        except Exception as e:
+            # A broken listener must not cause the message to be sent again
+            logger.error(f"Outbox status listener failed for message {row.id}: {str(e)}")
+
+    async def send_email(
+        self,
+        payload: Dict[str, Any],
+        message_type: str = "direct",
+        *,
+        rate_limited: bool = True
+    ) -> str:
+        """Send through the rate limiter, also used by jobs that deliver messages themselves"""
+        if rate_limited and self.rate_limiter is not None:
+            start = time.perf_counter()
+            await self.rate_limiter.acquire()
+            OUTBOX_RATE_LIMIT_WAIT_SECONDS.observe(time.perf_counter() - start)
+        return await email_service.send_message(payload, message_type)
+
+    async def _process(self, row: EmailOutbox, semaphore: asyncio.Semaphore) -> OutboxStatusEnum:
+        handler = self._handlers.get(row.message_type)
+
+        async with semaphore:
+            try:
+                provider_message_id = None
+                if handler is not None:
+                    await handler(OutboxJob(self, row))
+                else:
+                    provider_message_id = await self.send_email(
+                        json.loads(row.payload),
+                        row.message_type,
+                        rate_limited=row.priority >= self.PRIORITY_BULK
+                    )
+            except Exception as e:
+                return await self._record_failure(row, e)
+
+            try:
+                async with self.session_factory() as db:
+                    await self._finish(
+                        db,
+                        row,
+                        status=OutboxStatusEnum.SENT,
+                        sent_at=datetime.utcnow(),
+                        provider_message_id=provider_message_id,
+                        last_error=None
+                    )
+                    await db.commit()
+            except Exception as e:
+                # Delivered but not recorded: the row is retried once its lease expires
+                logger.error(f"Failed to mark outbox message {row.id} as sent: {str(e)}")
+            return OutboxStatusEnum.SENT
+
+    async def _record_failure(self, row: EmailOutbox, error: Exception) -> OutboxStatusEnum:
+        attempts = row.attempts + 1
+        error_text = f"{type(error).__name__}: {error}"
+
+        if isinstance(error, PermanentDeliveryError) or attempts >= row.max_attempts:
+            values = {"status": OutboxStatusEnum.DEAD}
+            logger.error(
+                f"Outbox message {row.id} ({row.message_type}) dead-lettered "
+                f"after {attempts} attempts: {error_text}"
+            )
+        else:
+            values = {
+                "status": OutboxStatusEnum.PENDING,
+                "next_attempt_at": datetime.utcnow() + self.backoff(attempts)
+            }
+            logger.warning(
+                f"Outbox message {row.id} ({row.message_type}) failed, "
+                f"attempt {attempts}/{row.max_attempts}: {error_text}"
+            )
+
+        try:
+            async with self.session_factory() as db:
+                await self._finish(db, row, last_error=error_text[:4000], **values)
+                await db.commit()
+        except Exception as e:
+            # The row stays claimed and is picked up again once its lease expires
+            logger.error(f"Failed to record outbox failure for message {row.id}: {str(e)}")
+
+        return values["status"]
+
+    async def process_batch(self, bulk: Optional[bool] = None) -> OutboxBatchResult:
+        """Claim and deliver one batch, returns how each claimed row ended"""
+        rows = await self._claim(bulk)
+        if not rows:
+            return OutboxBatchResult()
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        statuses = await asyncio.gather(*(self._process(row, semaphore) for row in rows))
+        for row, status in zip(rows, statuses):
+            OUTBOX_PROCESSED.inc(message_type=row.message_type, status=status.value)
+
+        result = OutboxBatchResult(
+            claimed=len(rows),
+            sent=statuses.count(OutboxStatusEnum.SENT),
+            retried=statuses.count(OutboxStatusEnum.PENDING),
+            dead=statuses.count(OutboxStatusEnum.DEAD)
+        )
+        logger.info(
+            f"Outbox batch processed: {result.sent} sent, "
+            f"{result.retried} to retry, {result.dead} dead"
+        )
+        return result
+
+    async def _run(self, bulk: bool) -> None:
+        wake = self._wake[bulk]
+        while not self._stopping:
+            wake.clear()
+            try:
+                claimed = (await self.process_batch(bulk)).claimed
+            except Exception as e:
+                logger.error(f"Outbox worker error: {str(e)}")
+                claimed = 0
+
+            if claimed < self.batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        """Start one worker loop per lane"""
+        if not self._tasks or all(task.done() for task in self._tasks):
+            self._stopping = False
+            self._tasks = [asyncio.create_task(self._run(bulk)) for bulk in (False, True)]
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Let the batches in progress finish (up to timeout) and stop the workers"""
+        if not self._tasks:
+            return
+
+        self._stopping = True
+        self.wake()
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+
+outbox_service = OutboxService(
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    concurrency=settings.OUTBOX_CONCURRENCY,
+    poll_interval=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    backoff_base=settings.OUTBOX_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.OUTBOX_BACKOFF_MAX_SECONDS,
+    lease=settings.OUTBOX_LEASE_SECONDS,
+    rate_limiter=(
+        TokenBucket(settings.OUTBOX_SEND_RATE_PER_SECOND, settings.OUTBOX_SEND_BURST)
+        if settings.OUTBOX_SEND_RATE_PER_SECOND > 0 else None
+    )
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_outbox_after_commit(session: Session) -> None:
+    if session.info.pop(_WAKE_FLAG, False):
+        outbox_service.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_outbox_flag(session: Session) -> None:
+    session.info.pop(_WAKE_FLAG, None)
@@ -1,19 +1,58 @@
 # app/services/reaction.py
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, delete
+from sqlalchemy import select, func, and_, delete, update
+from sqlalchemy.exc import IntegrityError
 from typing import Optional, Tuple
 import logging
 
-from app.models.reaction import Reaction, ReactionTypeEnum
+from app.models.reaction import Reaction, ReactionTypeEnum, ReactionCounter, COUNTER_COLUMNS
 from app.models.blog import BlogPost
 from app.models.project import Project
+from app.db.repositories.reaction import reaction_repository
+from app.utils.pagination import KeysetPage
 
 logger = logging.getLogger(__name__)
 
 
 class ReactionService:
     
+    async def _adjust_counter(
+        self,
+        db: AsyncSession,
+        entity_id: int,
+        entity_type: str,
+        reaction_type: ReactionTypeEnum,
+        delta: int
+    ) -> None:
+        """
+        Apply delta to the denormalized counter in the caller's transaction,
+        creating the counter row on first reaction. Pending changes must be
+        flushed before, so the savepoint only covers the counter insert.
+        """
+        column = getattr(ReactionCounter, COUNTER_COLUMNS[reaction_type])
+        counter_update = update(ReactionCounter).where(
+            and_(
+                ReactionCounter.entity_type == entity_type,
+                ReactionCounter.entity_id == entity_id
+            )
+        ).values({column: column + delta})
+        
+        result = await db.execute(counter_update)
+        if result.rowcount or delta < 0:
+            return
+        
+        try:
+            async with db.begin_nested():
+                db.add(ReactionCounter(
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    **{COUNTER_COLUMNS[reaction_type]: delta}
+                ))
+        except IntegrityError:
+            # Another request created the row concurrently
+            await db.execute(counter_update)
+    
     async def upsert_reaction(
         self,
         db: AsyncSession,
@@ -40,6 +79,11 @@ class ReactionService:
             existing_reaction.reaction_type = reaction_type
             existing_reaction.name = name
             
+            if old_type != reaction_type:
+                await db.flush()
+                await self._adjust_counter(db, entity_id, entity_type, old_type, -1)
+                await self._adjust_counter(db, entity_id, entity_type, reaction_type, 1)
+            
             await db.commit()
             await db.refresh(existing_reaction)
             
@@ -60,6 +104,10 @@ class ReactionService:
             )
             
             db.add(new_reaction)
+            # Insert the reaction first: a duplicate must fail here, not inside
+            # the counter savepoint below
+            await db.flush()
+            await self._adjust_counter(db, entity_id, entity_type, reaction_type, 1)
             await db.commit()
             await db.refresh(new_reaction)
             
@@ -77,56 +125,91 @@ class ReactionService:
         entity_id: int,
         entity_type: str
     ) -> bool:
+        reaction_filter = and_(
+            Reaction.email == email,
+            Reaction.entity_id == entity_id,
+            Reaction.entity_type == entity_type
+        )
+        
         result = await db.execute(
-            delete(Reaction).where(
-                and_(
-                    Reaction.email == email,
-                    Reaction.entity_id == entity_id,
-                    Reaction.entity_type == entity_type
-                )
-            )
+            select(Reaction.reaction_type).where(reaction_filter)
         )
-        await db.commit()
+        reaction_type = result.scalar_one_or_none()
         
+        if reaction_type is None:
+            return False
+        
+        result = await db.execute(delete(Reaction).where(reaction_filter))
         deleted = result.rowcount > 0
         
+        if deleted:
+            await self._adjust_counter(db, entity_id, entity_type, reaction_type, -1)
+        
+        await db.commit()
+        
         if deleted:
             logger.info(f"Reaction deleted: {email} on {entity_type}:{entity_id}")
         
         return deleted
     
+    async def delete_all_reactions(
+        self,
+        db: AsyncSession,
+        entity_id: int,
+        entity_type: str
+    ) -> int:
+        """
+        Delete the reactions and counters of a deleted entity, in the caller's
+        transaction (the caller commits). Without it the summary would keep
+        serving the counters of an entity that no longer exists.
+        """
+        await db.execute(
+            delete(ReactionCounter).where(
+                and_(
+                    ReactionCounter.entity_type == entity_type,
+                    ReactionCounter.entity_id == entity_id
+                )
+            )
+        )
+        result = await db.execute(
+            delete(Reaction).where(
+                and_(
+                    Reaction.entity_id == entity_id,
+                    Reaction.entity_type == entity_type
+                )
+            )
+        )
+        return result.rowcount
+    
     async def get_reaction_summary(
         self,
         db: AsyncSession,
         entity_id: int,
         entity_type: str,
         user_email: Optional[str] = None
-    ) -> dict:
+    ) -> Optional[dict]:
+        """
+        Read the summary from the denormalized counters (single primary key
+        lookup). Returns None when the entity has no counters and does not exist.
+        """
         result = await db.execute(
-            select(
-                Reaction.reaction_type,
-                func.count(Reaction.id).label('count')
-            ).where(
+            select(ReactionCounter).where(
                 and_(
-                    Reaction.entity_id == entity_id,
-                    Reaction.entity_type == entity_type
+                    ReactionCounter.entity_type == entity_type,
+                    ReactionCounter.entity_id == entity_id
                 )
-            ).group_by(Reaction.reaction_type)
+            )
         )
+        counter = result.scalar_one_or_none()
         
-        counts = result.all()
-        
-        like_count = 0
-        love_count = 0
-        congratulations_count = 0
-        
-        for reaction_type, count in counts:
-            if reaction_type == ReactionTypeEnum.LIKE:
-                like_count = count
-            elif reaction_type == ReactionTypeEnum.LOVE:
-                love_count = count
-            elif reaction_type == ReactionTypeEnum.CONGRATULATIONS:
-                congratulations_count = count
+        if counter is None:
+            if not await self.verify_entity_exists(db, entity_id, entity_type):
+                return None
+            like_count = love_count = congratulations_count = 0
+        else:
+            like_count = counter.like_count
+            love_count = counter.love_count
+            congratulations_count = counter.congratulations_count
         
         total = like_count + love_count + congratulations_count
         
@@ -196,22 +279,57 @@ class ReactionService:
         db: AsyncSession,
         entity_id: int,
         entity_type: str,
+        cursor: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
-    ):
+        include_total: bool = False
+    ) -> KeysetPage[Reaction]:
+        return await reaction_repository.get_entity_page(
+            db,
+            entity_id,
+            entity_type,
+            cursor=cursor,
+            limit=limit,
+            include_total=include_total
+        )
+
+    
+    async def rebuild_counters(self, db: AsyncSession) -> int:
+        """
+        Recompute every counter row from the raw reactions table.
+        Returns the number of counter rows written.
+        """
         result = await db.execute(
-            select(Reaction)
-            .where(
-                and_(
-                    Reaction.entity_id == entity_id,
-                    Reaction.entity_type == entity_type
-                )
+            select(
+                Reaction.entity_type,
+                Reaction.entity_id,
+                Reaction.reaction_type,
+                func.count(Reaction.id)
+            ).group_by(
+                Reaction.entity_type,
+                Reaction.entity_id,
+                Reaction.reaction_type
             )
-            .order_by(Reaction.created_at.desc())
-            .limit(limit)
-            .offset(offset)
         )
-        return result.scalars().all()
+        
+        counters = {}
+        for entity_type, entity_id, reaction_type, count in result.all():
+            key = (entity_type, entity_id)
+            if key not in counters:
+                counters[key] = ReactionCounter(
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    like_count=0,
+                    love_count=0,
+                    congratulations_count=0
+                )
+            setattr(counters[key], COUNTER_COLUMNS[reaction_type], count)
+        
+        await db.execute(delete(ReactionCounter))
+        db.add_all(counters.values())
+        await db.commit()
+        
+        logger.info(f"Rebuilt {len(counters)} reaction counters")
+        return len(counters)
 
 
 reaction_service = ReactionService()
\ No newline at end of file
@@ -0,0 +1,351 @@
+# app/services/search.py
+
+from typing import Dict, List, Optional, Tuple, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from collections import Counter
+from html import escape
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import math
+import re
+import unicodedata
+import logging
+
+from app.db.session import AsyncSessionLocal
+from app.models.blog import BlogPost
+from app.models.project import Project
+from app.utils.helpers import sanitize_html
+
+logger = logging.getLogger(__name__)
+
+DocKey = Tuple[str, int]
+
+_WORD_RE = re.compile(r"[^\W_]+(?:[+#]+)?")
+
+_STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "with",
+    "el", "la", "los", "las", "un", "una", "y", "o", "de", "del", "en", "con",
+    "por", "para", "que", "se", "es", "al", "lo", "su",
+})
+
+# (suffix, replacement) applied once, first match wins
+_SUFFIX_RULES = (
+    ("iones", "ion"),
+    ("sses", "ss"),
+    ("ies", "y"),
+    ("ing", ""),
+    ("edly", ""),
+    ("ed", ""),
+    ("ly", ""),
+    ("s", ""),
+)
+
+
+def fold(word: str) -> str:
+    """Lowercase and strip accents ("Programación" -> "programacion")"""
+    decomposed = unicodedata.normalize("NFKD", word.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def stem(token: str) -> str:
+    if len(token) <= 3 or token.endswith("ss"):
+        return token
+    for suffix, replacement in _SUFFIX_RULES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def _term(word: str) -> Optional[str]:
+    folded = fold(word)
+    if len(folded) < 2 or folded in _STOP_WORDS:
+        return None
+    return stem(folded)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [term for term in (_term(m.group()) for m in _WORD_RE.finditer(text)) if term]
+
+
+@dataclass
+class _IndexedDocument:
+    entity_type: str
+    entity_id: int
+    title: str
+    slug: Optional[str]
+    created_at: Optional[datetime]
+    body: str
+    term_freqs: Dict[str, float] = field(default_factory=dict)
+    length: float = 0.0
+
+
+@dataclass
+class SearchHit:
+    entity_type: str
+    id: int
+    title: str
+    slug: Optional[str]
+    created_at: Optional[datetime]
+    score: float
+    title_highlight: str
+    snippet: Optional[str]
+
+
+class SearchIndex:
+    """
+    In-memory inverted index ranked with BM25.
+
+    Each document is a set of weighted fields; term frequencies are summed
+    with the field weight so a match in the title counts more than one in
+    the body. Mutations are synchronous, so they never interleave with a
+    search running on the same event loop.
+    """
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75, snippet_length: int = 160):
+        self.k1 = k1
+        self.b = b
+        self.snippet_length = snippet_length
+        self._documents: Dict[DocKey, _IndexedDocument] = {}
+        self._postings: Dict[str, Dict[DocKey, float]] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def upsert(
+        self,
+        entity_type: str,
+        entity_id: int,
+        *,
+        title: str,
+        fields: Iterable[Tuple[Optional[str], float]],
+        body: str = "",
+        slug: Optional[str] = None,
+        created_at: Optional[datetime] = None
+    ) -> None:
+        key = (entity_type, entity_id)
+        self.remove(entity_type, entity_id)
+
+        term_freqs: Counter = Counter()
+        for text, weight in fields:
+            for term in tokenize(text):
+                term_freqs[term] += weight
+
+        document = _IndexedDocument(
+            entity_type=entity_type,
+            entity_id=entity_id,
+            title=title,
+            slug=slug,
+            created_at=created_at,
+            body=body,
+            term_freqs=dict(term_freqs),
+            length=sum(term_freqs.values())
+        )
+
+        self._documents[key] = document
+        self._total_length += document.length
+        for term, freq in document.term_freqs.items():
+            self._postings.setdefault(term, {})[key] = freq
+
+    def remove(self, entity_type: str, entity_id: int) -> bool:
+        key = (entity_type, entity_id)
+        document = self._documents.pop(key, None)
+        if document is None:
+            return False
+
+        self._total_length -= document.length
+        for term in document.term_freqs:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+        return True
+
+    def clear(self) -> None:
+        self._documents.clear()
+        self._postings.clear()
+        self._total_length = 0.0
+
+    def search(
+        self,
+        query: str,
+        *,
+        entity_type: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 10
+    ) -> Tuple[int, List[SearchHit]]:
+        """Return (total matches, hits for the requested window)"""
+        terms = set(tokenize(query))
+        if not terms or not self._documents:
+            return 0, []
+
+        doc_count = len(self._documents)
+        avg_length = self._total_length / doc_count or 1.0
+        scores: Dict[DocKey, float] = {}
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, freq in postings.items():
+                if entity_type and key[0] != entity_type:
+                    continue
+                length = self._documents[key].length
+                norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * freq * (self.k1 + 1) / (freq + norm)
+
+        ranked = sorted(scores.items(), key=self._rank_key)
+
+        hits = []
+        for key, score in ranked[offset:offset + limit]:
+            document = self._documents[key]
+            hits.append(SearchHit(
+                entity_type=document.entity_type,
+                id=document.entity_id,
+                title=document.title,
+                slug=document.slug,
+                created_at=document.created_at,
+                score=round(score, 4),
+                title_highlight=self.highlight(document.title, terms),
+                snippet=self.snippet(document.body, terms)
+            ))
+
+        return len(ranked), hits
+
+    def _rank_key(self, item: Tuple[DocKey, float]):
+        key, score = item
+        created_at = self._documents[key].created_at
+        return (-score, -created_at.timestamp() if created_at else 0.0, key)
+
+    @staticmethod
+    def highlight(text: str, terms: set) -> str:
+        """Escape text and wrap every word matching a query term in <mark>"""
+        parts = []
+        last = 0
+        for match in _WORD_RE.finditer(text):
+            if _term(match.group()) in terms:
+                parts.append(escape(text[last:match.start()]))
+                parts.append(f"<mark>{escape(match.group())}</mark>")
+                last = match.end()
+        parts.append(escape(text[last:]))
+        return "".join(parts)
+
+    def snippet(self, text: str, terms: set) -> Optional[str]:
+        if not text:
+            return None
+
+        first_match = next(
+            (m for m in _WORD_RE.finditer(text) if _term(m.group()) in terms),
+            None
+        )
+        start = max(0, first_match.start() - self.snippet_length // 3) if first_match else 0
+        if start > 0:
+            space = text.find(" ", start)
+            start = space + 1 if 0 <= space < first_match.start() else start
+        end = start + self.snippet_length
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            end = space if space > start else end
+
+        fragment = self.highlight(text[start:end].strip(), terms)
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        return f"{prefix}{fragment}{suffix}"
+
+
+class SearchService:
+    """
+    Full-text search over published blog posts and projects.
+
+    The index lives in process: it is rebuilt from the database on startup
+    and every SEARCH_REBUILD_INTERVAL_SECONDS by the scheduler, which is how
+    writes served by other workers and replicas reach this one. The blog and
+    project endpoints also index their own committed creates, updates and
+    deletes right away.
+    """
+
+    TITLE_WEIGHT = 3.0
+    KEYWORDS_WEIGHT = 2.0
+    SUMMARY_WEIGHT = 1.5
+    BODY_WEIGHT = 1.0
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.index = SearchIndex()
+
+    def index_blog_post(self, post: BlogPost) -> None:
+        if not post.published:
+            self.index.remove("blog_post", post.id)
+            return
+
+        content = sanitize_html(post.content or "")
+        self.index.upsert(
+            "blog_post",
+            post.id,
+            title=post.title,
+            slug=post.slug,
+            created_at=post.created_at,
+            body=content or post.excerpt or "",
+            fields=[
+                (post.title, self.TITLE_WEIGHT),
+                (post.tags, self.KEYWORDS_WEIGHT),
+                (post.excerpt, self.SUMMARY_WEIGHT),
+                (content, self.BODY_WEIGHT),
+            ]
+        )
+
+    def index_project(self, project: Project) -> None:
+        description = sanitize_html(project.description or "")
+        self.index.upsert(
+            "project",
+            project.id,
+            title=project.title,
+            created_at=project.created_at,
+            body=description,
+            fields=[
+                (project.title, self.TITLE_WEIGHT),
+                (project.technologies, self.KEYWORDS_WEIGHT),
+                (description, self.BODY_WEIGHT),
+            ]
+        )
+
+    def remove(self, entity_type: str, entity_id: int) -> None:
+        self.index.remove(entity_type, entity_id)
+
+    def search(
+        self,
+        query: str,
+        *,
+        entity_type: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 10
+    ) -> Tuple[int, List[SearchHit]]:
+        return self.index.search(query, entity_type=entity_type, offset=offset, limit=limit)
+
+    async def rebuild(self, db: Optional[AsyncSession] = None) -> int:
+        """Index every published post and every project, returns the document count"""
+        if db is None:
+            async with self.session_factory() as session:
+                return await self.rebuild(session)
+
+        posts = (await db.execute(select(BlogPost).where(BlogPost.published == True))).scalars().all()
+        projects = (await db.execute(select(Project))).scalars().all()
+
+        self.index.clear()
+        for post in posts:
+            self.index_blog_post(post)
+        for project in projects:
+            self.index_project(project)
+
+        logger.info(f"Search index rebuilt with {len(self.index)} documents")
+        return len(self.index)
+
+
+search_service = SearchService()
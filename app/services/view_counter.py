@@ -0,0 +1,113 @@
+# app/services/view_counter.py
+
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import asyncio
+import logging
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.db.repositories.blog import blog_repository
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounterService:
+    """
+    Write-behind counter for blog post views.
+
+    Reads only bump an in-memory delta; deltas are written to the database
+    in a single transaction every flush_interval seconds, as soon as
+    flush_threshold views have accumulated, and on shutdown.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        *,
+        flush_interval: float = 30,
+        flush_threshold: int = 500
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._pending: Dict[int, int] = {}
+        self._in_flight: Dict[int, int] = {}
+        self._pending_total = 0
+        self._flush_lock = asyncio.Lock()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._threshold_task: Optional[asyncio.Task] = None
+
+    def record(self, post_id: int) -> int:
+        """
+        Register one view and return the number of views for the post
+        that are not yet stored in the database (including this one)
+        """
+        self._pending[post_id] = self._pending.get(post_id, 0) + 1
+        self._pending_total += 1
+
+        if self._pending_total >= self.flush_threshold and (
+            self._threshold_task is None or self._threshold_task.done()
+        ):
+            self._threshold_task = asyncio.create_task(self.flush())
+
+        return self.pending(post_id)
+
+    def pending(self, post_id: int) -> int:
+        return self._pending.get(post_id, 0) + self._in_flight.get(post_id, 0)
+
+    async def flush(self) -> int:
+        """Write all accumulated deltas, returns the number of views stored"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            self._in_flight, self._pending = self._pending, {}
+            self._pending_total = 0
+
+            try:
+                async with self.session_factory() as db:
+                    for post_id, delta in sorted(self._in_flight.items()):
+                        await blog_repository.increment_views(
+                            db, post_id, amount=delta, commit=False
+                        )
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to flush blog views, will retry: {str(e)}")
+                for post_id, delta in self._in_flight.items():
+                    self._pending[post_id] = self._pending.get(post_id, 0) + delta
+                    self._pending_total += delta
+                self._in_flight = {}
+                return 0
+
+            flushed = sum(self._in_flight.values())
+            self._in_flight = {}
+            logger.debug(f"Flushed {flushed} blog views")
+            return flushed
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write whatever is still pending"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+        await self.flush()
+
+
+view_counter_service = ViewCounterService(
+    flush_interval=settings.VIEW_COUNTER_FLUSH_INTERVAL_SECONDS,
+    flush_threshold=settings.VIEW_COUNTER_FLUSH_THRESHOLD
+)
@@ -3,7 +3,11 @@
 from app.utils.pagination import (
     PaginationParams,
     PaginatedResponse,
-    paginate
+    paginate,
+    CursorPage,
+    KeysetPage,
+    encode_cursor,
+    decode_cursor
 )
 from app.utils.validators import (
     validate_email,
@@ -24,6 +28,10 @@ __all__ = [
     "PaginationParams",
     "PaginatedResponse",
     "paginate",
+    "CursorPage",
+    "KeysetPage",
+    "encode_cursor",
+    "decode_cursor",
     "validate_email",
     "validate_url",
     "validate_slug",
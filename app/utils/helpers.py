@@ -102,5 +102,9 @@ def parse_tags(tags_string: str) -> list[str]:
     return [tag for tag in tags if tag]
 
 
+def normalize_tag(tag: str) -> str:
+    return clean_whitespace(tag).lower()[:100]
+
+
 def tags_to_string(tags: list[str]) -> str:
     return ', '.join(tags)
\ No newline at end of file
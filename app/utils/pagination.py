@@ -1,13 +1,22 @@
 # app/utils/pagination.py
 
-from typing import TypeVar, Generic, List, Sequence
+from typing import TypeVar, Generic, List, Sequence, Optional, Literal
+from dataclasses import dataclass, field
+from datetime import datetime
 from pydantic import BaseModel, Field
 from math import ceil
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+import base64
+import binascii
+import json
+
+from app.core.exceptions import BadRequestException
 
 T = TypeVar('T')
 
+CursorDirection = Literal["next", "prev"]
+
 
 class PaginationParams(BaseModel):
     page: int = Field(default=1, ge=1)
@@ -67,4 +76,61 @@ async def paginate(
     result = await db.execute(items_query)
     items = list(result.scalars().all())
     
-    return items, total
\ No newline at end of file
+    return items, total
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+@dataclass
+class CursorPosition:
+    created_at: datetime
+    id: int
+    direction: CursorDirection = "next"
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    """Result of a keyset query, ready to be validated into a CursorPage"""
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total: Optional[int] = None
+    
+    def to_dict(self) -> dict:
+        return {
+            "items": self.items,
+            "next_cursor": self.next_cursor,
+            "prev_cursor": self.prev_cursor,
+            "total": self.total
+        }
+
+
+def encode_cursor(created_at: datetime, id: int, direction: CursorDirection = "next") -> str:
+    payload = json.dumps(
+        {"c": created_at.isoformat(), "i": id, "d": direction},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorPosition:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict):
+            raise ValueError(payload)
+        direction = payload.get("d", "next")
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return CursorPosition(
+            created_at=datetime.fromisoformat(payload["c"]),
+            id=int(payload["i"]),
+            direction=direction
+        )
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise BadRequestException("Invalid pagination cursor")
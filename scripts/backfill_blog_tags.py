@@ -0,0 +1,36 @@
+# scripts/backfill_blog_tags.py
+
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.session import AsyncSessionLocal, init_db, close_db
+from app.db.repositories.blog import blog_repository
+
+
+async def backfill_tags():
+    print("=" * 60)
+    print("Blog Tag Index Backfill")
+    print("=" * 60)
+    print()
+    
+    try:
+        await init_db()
+        
+        async with AsyncSessionLocal() as db:
+            print("Indexing tags from blog_posts.tags...")
+            total = await blog_repository.rebuild_tag_index(db)
+            print(f"✅ Tags indexed for {total} blog posts!")
+        
+    except Exception as e:
+        print(f"❌ Error backfilling blog tags: {e}")
+        sys.exit(1)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_tags())
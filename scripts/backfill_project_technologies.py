@@ -0,0 +1,36 @@
+# scripts/backfill_project_technologies.py
+
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.session import AsyncSessionLocal, init_db, close_db
+from app.db.repositories.project import project_repository
+
+
+async def backfill_technologies():
+    print("=" * 60)
+    print("Project Technology Index Backfill")
+    print("=" * 60)
+    print()
+    
+    try:
+        await init_db()
+        
+        async with AsyncSessionLocal() as db:
+            print("Indexing technologies from projects.technologies...")
+            total = await project_repository.rebuild_technology_index(db)
+            print(f"✅ Technologies indexed for {total} projects!")
+        
+    except Exception as e:
+        print(f"❌ Error backfilling project technologies: {e}")
+        sys.exit(1)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_technologies())
@@ -0,0 +1,182 @@
+# scripts/benchmark_blob_upload.py
+
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PIL import Image as PILImage
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from starlette.datastructures import UploadFile
+
+from app.core.azure_storage import AzureBlobStorageBackend
+from app.core.image_processing import image_processor
+from app.core.storage import StorageService, storage_service
+from app.models.media import Image
+from app.services.media import media_service
+
+
+BANDWIDTH = 50 * 1024 * 1024  # bytes/s the stand-in "network" accepts
+FILE_SIZE = 10 * 1024 * 1024
+IMAGE_SIDE = 1800  # random RGB pixels, a PNG of about 9MB
+
+
+class _SyncBlobStandIn:
+    """Behaves like the sync SDK: the calling thread waits for the transfer"""
+
+    url = "http://localhost/standin/blob"
+
+    def upload_blob(self, data, **kwargs):
+        time.sleep(len(data) / BANDWIDTH)
+
+
+class _AsyncBlobStandIn:
+    """Behaves like the aio SDK: the transfer is awaited, the loop keeps running"""
+
+    url = "http://localhost/standin/blob"
+
+    async def upload_blob(self, data, **kwargs):
+        await asyncio.sleep(len(data) / BANDWIDTH)
+
+    async def stage_block(self, block_id, data, length=None, **kwargs):
+        await asyncio.sleep(len(data) / BANDWIDTH)
+
+    async def commit_block_list(self, block_list, **kwargs):
+        await asyncio.sleep(0.005)
+
+
+class _ServiceStandIn:
+    def __init__(self, blob):
+        self._blob = blob
+
+    def get_blob_client(self, container, blob):
+        return self._blob
+
+
+def _make_upload(payload: bytes) -> UploadFile:
+    # Same spooling as Starlette's multipart parser: 1MB in memory, then disk
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(payload)
+    spool.seek(0)
+    return UploadFile(spool, filename="photo.jpg")
+
+
+async def _upload_whole_file(file: UploadFile):
+    """What upload_image did before: read everything, then a blocking upload"""
+    blob = _SyncBlobStandIn()
+    file_content = await file.read()
+    blob.upload_blob(file_content, overwrite=False)
+
+
+def _make_image() -> bytes:
+    pixels = os.urandom(IMAGE_SIDE * IMAGE_SIDE * 3)
+    buffer = io.BytesIO()
+    PILImage.frombytes("RGB", (IMAGE_SIDE, IMAGE_SIDE), pixels).save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+async def _variants_from_bytes(file: UploadFile):
+    """What _create_variants did before: read the upload and pickle it into the pool"""
+    await image_processor.process(await file.read())
+
+
+async def _measure(label: str, upload, payload: bytes = None) -> None:
+    if payload is None:
+        payload = os.urandom(FILE_SIZE)
+    file = _make_upload(payload)
+    del payload
+
+    stall = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal stall
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall = max(stall, time.perf_counter() - start - 0.005)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.02)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    await upload(file)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    running = False
+    await ticker_task
+    await file.close()
+
+    print(
+        f"  {label:<34} {elapsed * 1000:8.0f} ms   "
+        f"peak {peak / 1024 / 1024:6.2f} MB   max loop stall {stall * 1000:8.1f} ms"
+    )
+
+
+async def run_benchmark():
+    print("=" * 60)
+    print("Blob Upload Benchmark (local stand-in, no network)")
+    print("=" * 60)
+    print()
+    print(f"Uploading {FILE_SIZE / 1024 / 1024:.0f}MB at {BANDWIDTH / 1024 / 1024:.0f}MB/s\n")
+
+    standin = _ServiceStandIn(_AsyncBlobStandIn())
+    for block_size in (1024 * 1024, 4 * 1024 * 1024):
+        service = StorageService(
+            AzureBlobStorageBackend(None, "standin", block_size=block_size, client=standin)
+        )
+        if block_size == 1024 * 1024:
+            await _measure("read() + sync upload_blob", _upload_whole_file)
+        await _measure(
+            f"streamed, {block_size // 1024 // 1024}MB blocks",
+            lambda file: service.upload_image(file)
+        )
+
+    image = _make_image()
+    print(f"\nFull upload_and_create_image path, {len(image) / 1024 / 1024:.1f}MB PNG")
+    print("(in-memory SQLite, variants in the process pool)\n")
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Image.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    storage_service._backend = AzureBlobStorageBackend(None, "standin", client=standin)
+    # Start the workers outside the measurements
+    await image_processor.process(_make_upload(image).file.read())
+
+    await _measure("variants: read() + bytes to pool", _variants_from_bytes, image)
+    await _measure("variants: file path to pool", lambda file: image_processor.process_file(file.file), image)
+
+    async def create_image(file: UploadFile):
+        async with session_factory() as db:
+            await media_service.upload_and_create_image(db, file, 1, "project")
+            # Every run is a new upload, not a reuse of the previous blobs
+            await db.execute(Image.__table__.delete())
+            await db.commit()
+
+    # The first insert also compiles and caches the statements
+    await create_image(_make_upload(image))
+    await _measure("upload_and_create_image", create_image, image)
+
+    await image_processor.close()
+    await engine.dispose()
+
+    print()
+    print("✅ Benchmark finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,100 @@
+# scripts/benchmark_email_templates.py
+
+import sys
+import timeit
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.email_templates import EmailTemplateEngine
+
+
+CONTEXT = {
+    "blog_title": "Keyset pagination in SQL Server",
+    "blog_excerpt": "Why OFFSET gets slower on every page, and what to do instead. " * 4,
+    "blog_url": "https://example.com/blog/keyset-pagination",
+    "unsubscribe_url": "https://example.com/unsubscribe",
+}
+
+
+def render_fstring(blog_title: str, blog_excerpt: str, blog_url: str, unsubscribe_url: str):
+    """The inline f-string bodies EmailService built before the template engine"""
+    plain_text = f"""
+    Hi!
+
+    I just published a new blog post that might interest you:
+
+    {blog_title}
+
+    {blog_excerpt}
+
+    Read more: {blog_url}
+
+    ---
+    You're receiving this because you subscribed to updates from my portfolio.
+    Unsubscribe: {unsubscribe_url}
+                    """
+    html = f"""
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f9f9f9; border-radius: 10px;">
+            <h2 style="color: #0078D4; border-bottom: 2px solid #0078D4; padding-bottom: 10px;">
+                📝 New Blog Post
+            </h2>
+
+            <div style="background-color: white; padding: 20px; border-radius: 5px; margin: 20px 0;">
+                <h3 style="color: #333; margin-top: 0;">{blog_title}</h3>
+                <p style="color: #666;">{blog_excerpt}</p>
+
+                <div style="text-align: center; margin-top: 20px;">
+                    <a href="{blog_url}"
+                    style="background-color: #0078D4;
+                            color: white;
+                            padding: 12px 25px;
+                            text-decoration: none;
+                            border-radius: 5px;
+                            display: inline-block;">
+                        Read Full Post
+                    </a>
+                </div>
+            </div>
+
+            <p style="color: #666; font-size: 11px; text-align: center; margin-top: 20px;">
+                You're receiving this because you subscribed to updates from my portfolio.<br>
+                <a href="{unsubscribe_url}" style="color: #0078D4;">Unsubscribe</a>
+            </p>
+        </div>
+    </body>
+    </html>
+                    """
+    return {"plainText": plain_text, "html": html}
+
+
+def run_benchmark(number: int = 20000):
+    print("=" * 60)
+    print("Email Template Rendering Benchmark")
+    print("=" * 60)
+    print()
+
+    uncached = EmailTemplateEngine(cache_size=0)
+    cached = EmailTemplateEngine()
+
+    cases = [
+        ("f-string (unescaped)", lambda: render_fstring(**CONTEXT)),
+        ("compiled template, no cache", lambda: uncached.render_message("new_blog_post", CONTEXT, cache=True)),
+        ("compiled template, cached", lambda: cached.render_message("new_blog_post", CONTEXT, cache=True)),
+    ]
+
+    print(f"Rendering the new blog post body {number} times (one render per BCC batch)\n")
+    for label, render in cases:
+        seconds = min(timeit.repeat(render, number=number, repeat=3))
+        print(f"  {label:<30} {number / seconds:>12,.0f} renders/s   {seconds / number * 1e6:8.2f} µs/render")
+
+    print()
+    print(f"Cache: {cached.cache_info()}")
+    print("✅ Benchmark finished")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
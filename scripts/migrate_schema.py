@@ -0,0 +1,40 @@
+# scripts/migrate_schema.py
+
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.migrations import upgrade_schema
+from app.db.session import engine, init_db, close_db
+
+
+async def migrate_schema():
+    print("=" * 60)
+    print("Database Schema Upgrade")
+    print("=" * 60)
+    print()
+    
+    try:
+        print("Creating missing tables...")
+        await init_db()
+        
+        print("Adding missing columns and indexes...")
+        async with engine.begin() as conn:
+            applied = await conn.run_sync(upgrade_schema)
+        
+        for change in applied:
+            print(f"  + {change}")
+        print(f"✅ Schema up to date ({len(applied)} changes applied)")
+        
+    except Exception as e:
+        print(f"❌ Error upgrading the schema: {e}")
+        sys.exit(1)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_schema())
@@ -0,0 +1,36 @@
+# scripts/rebuild_reaction_counters.py
+
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.session import AsyncSessionLocal, init_db, close_db
+from app.services.reaction import reaction_service
+
+
+async def rebuild_counters():
+    print("=" * 60)
+    print("Reaction Counters Reconciliation")
+    print("=" * 60)
+    print()
+    
+    try:
+        await init_db()
+        
+        async with AsyncSessionLocal() as db:
+            print("Rebuilding reaction counters from raw reactions...")
+            total = await reaction_service.rebuild_counters(db)
+            print(f"✅ {total} reaction counters rebuilt successfully!")
+        
+    except Exception as e:
+        print(f"❌ Error rebuilding reaction counters: {e}")
+        sys.exit(1)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_counters())
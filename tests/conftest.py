@@ -171,36 +171,9 @@ async def test_blog_post(test_db: AsyncSession) -> BlogPost:
 
 @pytest.fixture
 def mock_email_service(monkeypatch):
-    async def mock_send_contact_message(*args, **kwargs):
-        return True
-    
-    async def mock_send_confirmation(*args, **kwargs):
-        return True
-    
-    async def mock_send_comment_notification(*args, **kwargs):
-        return True
-    
-    async def mock_send_2fa_code(*args, **kwargs):
-        return True
-    
     from app.services import email
-    monkeypatch.setattr(
-        email.email_service,
-        "send_contact_message_notification",
-        mock_send_contact_message
-    )
-    monkeypatch.setattr(
-        email.email_service,
-        "send_confirmation_to_user",
-        mock_send_confirmation
-    )
-    monkeypatch.setattr(
-        email.email_service,
-        "send_comment_notification",
-        mock_send_comment_notification
-    )
-    monkeypatch.setattr(
-        email.email_service,
-        "send_2fa_code",
-        mock_send_2fa_code
-    )
\ No newline at end of file
+    from app.services.email_transport import InMemoryEmailTransport
+    
+    transport = InMemoryEmailTransport()
+    monkeypatch.setattr(email.email_service, "transport", transport)
+    return transport
@@ -2,6 +2,10 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.models.reaction import Reaction, ReactionTypeEnum
+from app.services.reaction import reaction_service
 
 
 class TestBlogAPI:
@@ -12,8 +16,36 @@ class TestBlogAPI:
         
         assert response.status_code == 200
         data = response.json()
-        assert isinstance(data, list)
-        assert len(data) > 0
+        assert isinstance(data["items"], list)
+        assert len(data["items"]) > 0
+        assert "content" not in data["items"][0]
+        assert data["total"] is None
+    
+    @pytest.mark.asyncio
+    async def test_get_blog_posts_invalid_cursor(self, client: AsyncClient):
+        response = await client.get("/api/v1/blog/?cursor=not-a-cursor")
+        
+        assert response.status_code == 400
+    
+    @pytest.mark.asyncio
+    async def test_get_blog_posts_by_tag(self, client: AsyncClient, admin_headers):
+        await client.post(
+            "/api/v1/blog/",
+            headers=admin_headers,
+            json={
+                "title": "Tagged Post",
+                "slug": "tagged-post",
+                "content": "Post content",
+                "author": "Test Author",
+                "tags": "FastAPI, Testing"
+            }
+        )
+        
+        response = await client.get("/api/v1/blog/tags/fastapi")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["slug"] for p in data["items"]] == ["tagged-post"]
     
     @pytest.mark.asyncio
     async def test_get_blog_post_by_slug(self, client: AsyncClient, test_blog_post):
@@ -56,4 +88,17 @@ class TestBlogAPI:
             }
         )
         
-        assert response.status_code == 400
\ No newline at end of file
+        assert response.status_code == 400
+    
+    @pytest.mark.asyncio
+    async def test_deleted_post_has_no_reaction_summary(self, client: AsyncClient, admin_headers, test_db, test_blog_post):
+        await reaction_service.upsert_reaction(
+            test_db, "a@example.com", "A", ReactionTypeEnum.LIKE, test_blog_post.id, "blog_post"
+        )
+        
+        response = await client.delete(f"/api/v1/blog/{test_blog_post.id}", headers=admin_headers)
+        assert response.status_code == 204
+        
+        response = await client.get(f"/api/v1/reactions/blog_post/{test_blog_post.id}/summary")
+        assert response.status_code == 404
+        assert (await test_db.execute(select(func.count()).select_from(Reaction))).scalar() == 0
@@ -0,0 +1,41 @@
+# tests/integration/test_contact_api.py
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models.outbox import EmailOutbox
+
+
+class TestContactAPI:
+    
+    @pytest.mark.asyncio
+    async def test_send_contact_message_queues_emails(self, client: AsyncClient, test_db, admin_headers):
+        response = await client.post(
+            "/api/v1/contact/",
+            json={
+                "name": "Visitor",
+                "email": "visitor@example.com",
+                "subject": "Hello",
+                "message": "I liked your portfolio"
+            }
+        )
+        
+        assert response.status_code == 201
+        result = await test_db.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+        rows = result.scalars().all()
+        assert [row.message_type for row in rows] == ["contact_notification", "contact_confirmation"]
+        
+        response = await client.get("/api/v1/contact/admin/messages", headers=admin_headers)
+        
+        assert response.status_code == 200
+        [message] = response.json()["items"]
+        assert message["notification_status"] == "queued"
+        assert message["confirmation_status"] == "queued"
+        assert rows[0].entity_id == message["id"]
+    
+    @pytest.mark.asyncio
+    async def test_admin_messages_require_admin(self, client: AsyncClient, auth_headers):
+        response = await client.get("/api/v1/contact/admin/messages", headers=auth_headers)
+        
+        assert response.status_code == 403
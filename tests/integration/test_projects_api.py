@@ -2,18 +2,41 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 
 
 class TestProjectsAPI:
     
     @pytest.mark.asyncio
     async def test_get_projects(self, client: AsyncClient, test_project):
-        response = await client.get("/api/v1/projects/")
+        response = await client.get("/api/v1/projects/?include_total=true")
         
         assert response.status_code == 200
         data = response.json()
-        assert isinstance(data, list)
-        assert len(data) > 0
+        assert isinstance(data["items"], list)
+        assert len(data["items"]) > 0
+        assert data["total"] == len(data["items"])
+    
+    @pytest.mark.asyncio
+    async def test_technology_facets_and_filter(self, client: AsyncClient, test_db):
+        from app.db.repositories.project import project_repository
+        from app.schemas.project import ProjectCreate
+        
+        project = await project_repository.create(test_db, obj_in=ProjectCreate(
+            title="Faceted", description="Desc", technologies="Rust, WebAssembly"
+        ))
+        
+        response = await client.get("/api/v1/projects/technologies")
+        
+        assert response.status_code == 200
+        assert {f["name"]: f["project_count"] for f in response.json()} == {
+            "rust": 1, "webassembly": 1
+        }
+        
+        response = await client.get("/api/v1/projects/?technology=rust")
+        
+        assert response.status_code == 200
+        assert [p["id"] for p in response.json()["items"]] == [project.id]
     
     @pytest.mark.asyncio
     async def test_get_project_by_id(self, client: AsyncClient, test_project):
@@ -24,6 +47,71 @@ class TestProjectsAPI:
         assert data["id"] == test_project.id
         assert data["title"] == test_project.title
     
+    @pytest.mark.asyncio
+    async def test_only_approved_comments_are_returned(self, client: AsyncClient, test_db, test_project):
+        from sqlalchemy import select, func
+        from app.models.project import Comment
+        
+        test_db.add_all([
+            Comment(name="A", email="a@example.com", content="Nice", approved=True, project_id=test_project.id),
+            Comment(name="B", email="b@example.com", content="Spam", approved=False, project_id=test_project.id),
+        ])
+        await test_db.commit()
+        
+        response = await client.get(f"/api/v1/projects/{test_project.id}")
+        
+        assert response.status_code == 200
+        assert [c["content"] for c in response.json()["comments"]] == ["Nice"]
+        
+        response = await client.get(f"/api/v1/projects/{test_project.id}/comments?limit=1&include_total=true")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [c["content"] for c in data["items"]] == ["Nice"]
+        assert data["total"] == 1
+        assert data["next_cursor"] is None
+        
+        total = await test_db.scalar(select(func.count(Comment.id)))
+        assert total == 2
+    
+    @pytest.mark.asyncio
+    async def test_details_embed_only_the_latest_comments(self, client: AsyncClient, test_db, test_project):
+        from datetime import datetime, timedelta
+        from app.config import settings
+        from app.models.project import Comment
+        
+        now = datetime.utcnow()
+        test_db.add_all([
+            Comment(
+                name=f"User {i}", email=f"user{i}@example.com", content=f"Comment {i}",
+                approved=True, project_id=test_project.id, created_at=now - timedelta(minutes=i)
+            )
+            for i in range(settings.DETAIL_COMMENTS_LIMIT + 2)
+        ])
+        await test_db.commit()
+        
+        response = await client.get(f"/api/v1/projects/{test_project.id}")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [c["content"] for c in data["comments"]] == [
+            f"Comment {i}" for i in range(settings.DETAIL_COMMENTS_LIMIT)
+        ]
+        
+        response = await client.get(
+            f"/api/v1/projects/{test_project.id}/comments?cursor={data['comments_next_cursor']}"
+        )
+        
+        assert [c["content"] for c in response.json()["items"]] == [
+            f"Comment {settings.DETAIL_COMMENTS_LIMIT}", f"Comment {settings.DETAIL_COMMENTS_LIMIT + 1}"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_comments_for_missing_project(self, client: AsyncClient):
+        response = await client.get("/api/v1/projects/999/comments")
+        
+        assert response.status_code == 404
+    
     @pytest.mark.asyncio
     async def test_create_project(self, client: AsyncClient, admin_headers):
         response = await client.post(
@@ -79,4 +167,27 @@ class TestProjectComments:
         assert response.status_code == 201
         data = response.json()
         assert data["name"] == "Test Commenter"
-        assert data["approved"] is False
\ No newline at end of file
+        assert data["approved"] is False
+    
+    @pytest.mark.asyncio
+    async def test_add_comment_is_a_single_insert(self, client: AsyncClient, test_db, test_project):
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = test_db.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = await client.post(
+                f"/api/v1/projects/{test_project.id}/comments",
+                json={"name": "Test Commenter", "email": "commenter@example.com", "content": "Great project!"}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert response.status_code == 201
+        assert response.json()["created_at"]
+        comment_statements = [s for s in statements if "comments" in s]
+        assert len(comment_statements) == 1
+        assert comment_statements[0].startswith("INSERT")
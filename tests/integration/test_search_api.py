@@ -0,0 +1,63 @@
+# tests/integration/test_search_api.py
+
+import pytest
+from httpx import AsyncClient
+
+from app.models.blog import BlogPost
+from app.services.search import search_service
+
+
+class TestSearchAPI:
+    
+    @pytest.mark.asyncio
+    async def test_search_finds_new_post(self, client: AsyncClient, test_db, admin_headers):
+        await search_service.rebuild(test_db)
+        
+        await client.post(
+            "/api/v1/blog/",
+            headers=admin_headers,
+            json={
+                "title": "Keyset pagination",
+                "slug": "keyset-pagination",
+                "content": "Why OFFSET gets slower on every page",
+                "author": "Test Author",
+                "tags": "sql, performance"
+            }
+        )
+        
+        response = await client.get("/api/v1/search/?q=pagination")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["items"][0]["slug"] == "keyset-pagination"
+        assert data["items"][0]["title_highlight"] == "Keyset <mark>pagination</mark>"
+    
+    @pytest.mark.asyncio
+    async def test_deleted_post_leaves_the_index(self, client: AsyncClient, test_db, admin_headers, test_blog_post):
+        await search_service.rebuild(test_db)
+        assert (await client.get(f"/api/v1/search/?q={test_blog_post.slug}")).json()["total"] == 1
+        
+        await client.delete(f"/api/v1/blog/{test_blog_post.id}", headers=admin_headers)
+        
+        assert (await client.get(f"/api/v1/search/?q={test_blog_post.slug}")).json()["total"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_rebuild_picks_up_writes_from_other_processes(self, client: AsyncClient, test_db):
+        await search_service.rebuild(test_db)
+        # Written by another worker: this process never indexed it
+        test_db.add(BlogPost(
+            title="Written elsewhere", slug="written-elsewhere", content="Replica", author="Author", published=True
+        ))
+        await test_db.commit()
+        assert (await client.get("/api/v1/search/?q=elsewhere")).json()["total"] == 0
+        
+        await search_service.rebuild(test_db)
+        
+        assert (await client.get("/api/v1/search/?q=elsewhere")).json()["total"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_search_requires_query(self, client: AsyncClient):
+        response = await client.get("/api/v1/search/")
+        
+        assert response.status_code == 422
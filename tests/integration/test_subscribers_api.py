@@ -0,0 +1,75 @@
+# tests/integration/test_subscribers_api.py
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.security import (
+    SUBSCRIBER_TOKEN_UNSUBSCRIBE,
+    SUBSCRIBER_TOKEN_VERIFY,
+    create_subscriber_token
+)
+from app.db.repositories.subscriber import subscriber_repository
+from app.models.subscriber import DigestFrequencyEnum
+
+
+class TestSubscribersAPI:
+    
+    @pytest.mark.asyncio
+    async def test_verify_and_unsubscribe_with_signed_tokens(self, client: AsyncClient, test_db):
+        response = await client.post("/api/v1/subscribes/subscribe", json={"email": "reader@example.com"})
+        assert response.status_code == 201
+        subscriber = await subscriber_repository.get_by_email(test_db, "reader@example.com")
+        
+        verify_token = create_subscriber_token(subscriber.id, SUBSCRIBER_TOKEN_VERIFY)
+        response = await client.post("/api/v1/subscribes/verify", json={"token": verify_token})
+        assert response.json()["message"] == "Email verified successfully! You'll now receive updates."
+        
+        response = await client.post("/api/v1/subscribes/verify", json={"token": verify_token})
+        assert response.json()["message"] == "Email already verified!"
+        
+        unsubscribe_token = create_subscriber_token(subscriber.id, SUBSCRIBER_TOKEN_UNSUBSCRIBE)
+        response = await client.post("/api/v1/subscribes/unsubscribe", json={"token": unsubscribe_token})
+        assert response.status_code == 200
+        
+        await test_db.refresh(subscriber)
+        assert subscriber.is_verified is True
+        assert subscriber.is_active is False
+    
+    @pytest.mark.asyncio
+    async def test_unsubscribe_rejects_verify_token(self, client: AsyncClient):
+        token = create_subscriber_token(1, SUBSCRIBER_TOKEN_VERIFY)
+        
+        response = await client.post("/api/v1/subscribes/unsubscribe", json={"token": token})
+        
+        assert response.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_update_digest_frequency(self, client: AsyncClient, test_db):
+        response = await client.post(
+            "/api/v1/subscribes/subscribe",
+            json={"email": "digest@example.com", "digest_frequency": "daily"}
+        )
+        assert response.status_code == 201
+        subscriber = await subscriber_repository.get_by_email(test_db, "digest@example.com")
+        assert subscriber.digest_frequency == DigestFrequencyEnum.DAILY
+        
+        token = create_subscriber_token(subscriber.id, SUBSCRIBER_TOKEN_UNSUBSCRIBE)
+        response = await client.put(
+            "/api/v1/subscribes/preferences",
+            json={"token": token, "digest_frequency": "hourly"}
+        )
+        
+        assert response.status_code == 200
+        await test_db.refresh(subscriber)
+        assert subscriber.digest_frequency == DigestFrequencyEnum.HOURLY
+    
+    @pytest.mark.asyncio
+    async def test_update_preferences_rejects_verify_token(self, client: AsyncClient):
+        token = create_subscriber_token(1, SUBSCRIBER_TOKEN_VERIFY)
+        
+        response = await client.put(
+            "/api/v1/subscribes/preferences",
+            json={"token": token, "digest_frequency": "daily"}
+        )
+        
+        assert response.status_code == 404
@@ -0,0 +1,129 @@
+# tests/unit/test_azure_storage.py
+
+import io
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.core.azure_storage import AzureBlobStorageBackend
+from app.core.storage import BatchDeleteError
+
+
+class _FakeBlob:
+    url = "https://account.blob.core.windows.net/container/blob"
+
+    def __init__(self):
+        self.uploads = []
+        self.blocks = []
+        self.committed = None
+
+    async def upload_blob(self, data, **kwargs):
+        self.uploads.append(len(data))
+
+    async def stage_block(self, block_id, data, length=None, **kwargs):
+        self.blocks.append((block_id, len(data)))
+
+    async def commit_block_list(self, block_list, **kwargs):
+        self.committed = [block.id for block in block_list]
+
+
+class _FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class _FakeContainer:
+    def __init__(self):
+        self.batches = []
+        self.status = {}
+        self.fail_batch = None
+
+    async def delete_blobs(self, *names, raise_on_any_failure=True):
+        self.batches.append(list(names))
+        if len(self.batches) == self.fail_batch:
+            raise RuntimeError("Batch request failed")
+
+        async def responses():
+            for name in names:
+                yield _FakeResponse(self.status.get(name, 202))
+
+        return responses()
+
+
+class _FakeService:
+    def __init__(self):
+        self.blob = _FakeBlob()
+        self.container = _FakeContainer()
+
+    def get_blob_client(self, container, blob):
+        return self.blob
+
+    def get_container_client(self, container):
+        return self.container
+
+
+@pytest.fixture
+def backend():
+    return AzureBlobStorageBackend(None, "container", block_size=1024, client=_FakeService())
+
+
+def _upload(size: int) -> UploadFile:
+    return UploadFile(io.BytesIO(b"x" * size), filename="photo.png")
+
+
+class TestStreamingUpload:
+
+    @pytest.mark.asyncio
+    async def test_small_file_is_a_single_request(self, backend):
+        url = await backend.put_stream("project/1/photo.png", _upload(100), "image/png")
+
+        blob = backend._get_client().blob
+        assert url == blob.url
+        assert blob.uploads == [100]
+        assert blob.blocks == []
+
+    @pytest.mark.asyncio
+    async def test_large_file_is_staged_in_blocks(self, backend):
+        await backend.put_stream("project/1/photo.png", _upload(2500), "image/png")
+
+        blob = backend._get_client().blob
+        assert [size for _, size in blob.blocks] == [1024, 1024, 452]
+        assert blob.committed == [block_id for block_id, _ in blob.blocks]
+        assert len({len(block_id) for block_id in blob.committed}) == 1
+
+    def test_missing_connection_string_fails_on_first_use(self):
+        backend = AzureBlobStorageBackend(None, "container")
+
+        with pytest.raises(RuntimeError):
+            backend.url_for("project/1/photo.png")
+
+
+class TestBatchDelete:
+
+    @pytest.mark.asyncio
+    async def test_large_batches_are_split_at_the_api_limit(self, backend):
+        names = [f"project/1/{index}.png" for index in range(600)]
+
+        results = await backend.delete_batch(names)
+
+        container = backend._get_client().container
+        assert [len(batch) for batch in container.batches] == [256, 256, 88]
+        assert results == {name: True for name in names}
+
+    @pytest.mark.asyncio
+    async def test_missing_blobs_are_reported_not_failed(self, backend):
+        backend._get_client().container.status = {"b.png": 404}
+
+        assert await backend.delete_batch(["a.png", "b.png"]) == {"a.png": True, "b.png": False}
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_blob(self, backend):
+        names = [f"{index}.png" for index in range(300)]
+        container = backend._get_client().container
+        container.status = {"0.png": 500}
+        container.fail_batch = 2  # The second sub-batch (blobs 256-299) fails as a whole
+
+        with pytest.raises(BatchDeleteError) as error:
+            await backend.delete_batch(names)
+
+        assert error.value.failed == ["0.png"] + names[256:]
+        assert set(error.value.results) == set(names[1:256])
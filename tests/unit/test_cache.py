@@ -0,0 +1,140 @@
+# tests/unit/test_cache.py
+
+import pytest
+from datetime import timedelta
+
+from app.core.cache import CacheService
+
+
+class TestCacheService:
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self):
+        cache = CacheService()
+
+        await cache.set("key", {"value": 1})
+
+        assert await cache.get("key") == {"value": 1}
+        assert await cache.exists("key") is True
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_is_counted(self):
+        cache = CacheService()
+
+        assert await cache.get("missing") is None
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_not_returned(self, monkeypatch):
+        cache = CacheService()
+        now = [1000.0]
+        monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+
+        await cache.set("key", "value", expire=timedelta(seconds=10))
+        assert await cache.get("key") == "value"
+
+        now[0] += 11
+        assert await cache.get("key") is None
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_purge_expired(self, monkeypatch):
+        cache = CacheService()
+        now = [1000.0]
+        monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+
+        await cache.set("short", "a", expire=timedelta(seconds=1))
+        await cache.set("long", "b", expire=timedelta(seconds=60))
+
+        now[0] += 5
+        assert cache.purge_expired() == 1
+        assert await cache.exists("long") is True
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_entries(self):
+        cache = CacheService(max_entries=2)
+
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        assert await cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_bytes(self):
+        cache = CacheService(max_bytes=10)
+
+        await cache.set("a", b"12345")
+        await cache.set("b", b"12345")
+        await cache.set("c", b"12345")
+
+        assert await cache.get("a") is None
+        assert cache.stats()["bytes"] == 10
+
+    @pytest.mark.asyncio
+    async def test_delete_prefix(self):
+        cache = CacheService()
+
+        await cache.set("blog:list:1", 1)
+        await cache.set("blog:list:2", 2)
+        await cache.set("projects:list:1", 3)
+
+        assert await cache.delete_prefix("blog:list:") == 2
+        assert await cache.exists("projects:list:1") is True
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache(self):
+        cache = CacheService(enabled=False)
+
+        await cache.set("key", "value")
+
+        assert await cache.get("key") is None
+
+
+class TestResponseCache:
+
+    @pytest.mark.asyncio
+    async def test_store_and_hit(self):
+        from typing import List
+        from pydantic import BaseModel, TypeAdapter
+        from app.core.response_cache import ResponseCache
+
+        class Item(BaseModel):
+            id: int
+
+        class Row:
+            def __init__(self, id):
+                self.id = id
+
+        response_cache = ResponseCache(CacheService(), ttl=timedelta(minutes=1))
+        adapter = TypeAdapter(List[Item])
+        key = response_cache.build_key("blog_post", skip=0, limit=10, published=True)
+
+        miss = await response_cache.store(key, adapter, [Row(1), Row(2)])
+        hit = await response_cache.get(key)
+
+        assert miss.headers["X-Cache"] == "MISS"
+        assert hit.headers["X-Cache"] == "HIT"
+        assert hit.body == b'[{"id":1},{"id":2}]'
+
+    @pytest.mark.asyncio
+    async def test_invalidate_only_touches_entity_type(self):
+        from app.core.response_cache import ResponseCache
+
+        cache = CacheService()
+        response_cache = ResponseCache(cache, ttl=timedelta(minutes=1))
+        blog_key = response_cache.build_key("blog_post", skip=0, limit=10, published=True)
+        project_key = response_cache.build_key("project", skip=0, limit=10, featured=None)
+        await cache.set(blog_key, b"[]")
+        await cache.set(project_key, b"[]")
+
+        await response_cache.invalidate("blog_post")
+
+        assert await cache.exists(blog_key) is False
+        assert await cache.exists(project_key) is True
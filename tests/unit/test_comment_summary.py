@@ -0,0 +1,53 @@
+# tests/unit/test_comment_summary.py
+
+import json
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.outbox import EmailOutbox
+from app.models.project import Comment
+from app.services.comment_summary import CommentSummaryService
+
+
+@pytest.fixture
+def summary_service(test_engine):
+    session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    return CommentSummaryService(session_factory, latest=2)
+
+
+class TestCommentSummaryService:
+
+    @pytest.mark.asyncio
+    async def test_pending_comments_are_coalesced_into_one_email(
+        self, test_db, test_blog_post, test_project, summary_service
+    ):
+        test_db.add_all([
+            Comment(name="Ana", email="ana@example.com", content="First", blog_post_id=test_blog_post.id),
+            Comment(name="Bob", email="bob@example.com", content="Second", blog_post_id=test_blog_post.id),
+            Comment(name="Eve", email="eve@example.com", content="<script>", project_id=test_project.id),
+        ])
+        await test_db.commit()
+
+        assert await summary_service.send_summary() == 3
+        assert await summary_service.send_summary() == 0
+
+        [row] = (await test_db.execute(select(EmailOutbox))).scalars().all()
+        content = json.loads(row.payload)["content"]
+        assert content["subject"] == "3 new comments awaiting approval"
+        # Only the latest two, newest first
+        assert "First" not in content["plainText"]
+        assert content["plainText"].index("Eve") < content["plainText"].index("Bob")
+        assert "/blog/test-blog-post" in content["html"]
+        assert f"/projects/{test_project.id}" in content["html"]
+        assert "&lt;script&gt;" in content["html"]
+
+    @pytest.mark.asyncio
+    async def test_adding_a_comment_queues_no_email(self, client, test_db, test_project):
+        response = await client.post(
+            f"/api/v1/projects/{test_project.id}/comments",
+            json={"name": "Ana", "email": "ana@example.com", "content": "Nice"}
+        )
+
+        assert response.status_code == 201
+        assert (await test_db.execute(select(EmailOutbox))).scalars().all() == []
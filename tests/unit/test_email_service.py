@@ -0,0 +1,42 @@
+# tests/unit/test_email_service.py
+
+import pytest
+
+from app.services.email import EmailService
+from app.services.email_transport import InMemoryEmailTransport, create_email_transport
+
+
+class TestEmailService:
+    
+    @pytest.mark.asyncio
+    async def test_send_uses_transport(self):
+        transport = InMemoryEmailTransport()
+        service = EmailService(transport=transport)
+        
+        message_id = await service.send_message(service.build_2fa_code("user@example.com", "123456", "User"), "2fa_code")
+        
+        assert message_id
+        assert transport.recipients() == ["user@example.com"]
+        assert "123456" in transport.sent[0]["content"]["plainText"]
+    
+    @pytest.mark.asyncio
+    async def test_transport_failure_is_raised(self):
+        service = EmailService(transport=InMemoryEmailTransport(fail=True))
+        
+        with pytest.raises(RuntimeError):
+            await service.send_message(service.build_confirmation_to_user("Name", "user@example.com", "Hello"))
+    
+    def test_subscriber_message_gets_own_unsubscribe_link(self):
+        service = EmailService(transport=InMemoryEmailTransport())
+        content = service.build_new_blog_content("Title", "title", "Excerpt")
+        
+        message = service.build_subscriber_message(content, "a@example.com", "https://example.com/unsubscribe?token=1.2.x&a=b")
+        
+        assert message["recipients"] == {"to": [{"address": "a@example.com"}]}
+        assert "unsubscribe?token=1.2.x&a=b" in message["content"]["plainText"]
+        assert "unsubscribe?token=1.2.x&amp;a=b" in message["content"]["html"]
+        assert "__unsubscribe_url__" not in message["content"]["html"]
+    
+    def test_unknown_transport(self):
+        with pytest.raises(ValueError):
+            create_email_transport("carrier-pigeon")
@@ -0,0 +1,80 @@
+# tests/unit/test_email_templates.py
+
+import pytest
+
+from app.services.email import EmailService
+from app.services.email_templates import CompiledTemplate, EmailTemplateEngine, SafeHTML
+from app.services.email_transport import InMemoryEmailTransport
+
+
+class TestCompiledTemplate:
+    
+    def test_html_values_are_escaped(self):
+        template = CompiledTemplate("t.html", "<p>${name} costs $$5</p>", html=True)
+        
+        assert template.render({"name": "<b>Ana</b>"}) == "<p>&lt;b&gt;Ana&lt;/b&gt; costs $5</p>"
+    
+    def test_safe_html_is_not_escaped_again(self):
+        template = CompiledTemplate("t.html", "<div>${items}</div>", html=True)
+        
+        assert template.render({"items": SafeHTML("<p>&amp;</p>")}) == "<div><p>&amp;</p></div>"
+    
+    def test_text_values_are_not_escaped(self):
+        template = CompiledTemplate("t.txt", "Hi $name,", html=False)
+        
+        assert template.render({"name": "<b>Ana</b>"}) == "Hi <b>Ana</b>,"
+    
+    def test_missing_value_raises(self):
+        template = CompiledTemplate("t.txt", "Hi $name", html=False)
+        
+        with pytest.raises(KeyError):
+            template.render({})
+    
+    def test_invalid_placeholder_fails_at_compile_time(self):
+        with pytest.raises(ValueError):
+            CompiledTemplate("t.txt", "Price: $ 5", html=False)
+
+
+class TestEmailTemplateEngine:
+    
+    def test_all_templates_compile(self):
+        engine = EmailTemplateEngine()
+        
+        assert engine.cache_info()["templates"] == 20
+    
+    def test_fan_out_body_is_rendered_once(self):
+        engine = EmailTemplateEngine()
+        service = EmailService(transport=InMemoryEmailTransport(), templates=engine)
+        
+        first = service.build_new_blog_content("<Title>", "title", "Excerpt")
+        second = service.build_new_blog_content("<Title>", "title", "Excerpt")
+        
+        assert first == second
+        assert "&lt;Title&gt;" in first["html"]
+        assert "<Title>" in first["plainText"]
+        assert engine.cache_info()["misses"] == 2
+        assert engine.cache_info()["hits"] == 2
+    
+    def test_one_off_messages_are_not_cached(self):
+        engine = EmailTemplateEngine()
+        service = EmailService(transport=InMemoryEmailTransport(), templates=engine)
+        
+        service.build_confirmation_to_user("Ana", "ana@example.com", "Hola")
+        service.build_2fa_code("ana@example.com", "123456", "Ana")
+        engine.render_message("two_factor_code", {"name": "Ana", "code": "123456", "app_name": "App"}, cache=True)
+        
+        assert engine.cache_info()["entries"] == 0
+    
+    def test_digest_escapes_each_item_once(self):
+        service = EmailService(transport=InMemoryEmailTransport(), templates=EmailTemplateEngine())
+        
+        content = service.build_digest_content("daily", [
+            {"kind": "Blog post", "title": "<Title>", "summary": "A & B", "url": "https://example.com/blog/a"},
+            {"kind": "Project", "title": "Second", "summary": "", "url": "https://example.com/projects/2"},
+        ])
+        
+        assert content["subject"] == "Your daily digest: 2 new updates"
+        assert "&lt;Title&gt;" in content["html"]
+        assert "A &amp; B" in content["html"]
+        assert "&amp;lt;" not in content["html"]
+        assert "* Project: Second" in content["plainText"]
@@ -0,0 +1,129 @@
+# tests/unit/test_image_processing.py
+
+import io
+import os
+import pytest
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image as PILImage
+from starlette.datastructures import UploadFile
+
+from app.core.image_processing import ImageProcessor, render_variants
+from app.core.storage import LocalStorageBackend, storage_service
+from app.schemas.media import ImageResponse
+from app.services.media import media_service
+
+
+def _png(width: int, height: int, mode: str = "RGBA") -> bytes:
+    buffer = io.BytesIO()
+    PILImage.new(mode, (width, height), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestRenderVariants:
+
+    def test_variants_are_resized_and_never_upscaled(self):
+        processed = render_variants(_png(2000, 1000), [1280, 320, 640, 4000], "WEBP", 80)
+
+        assert (processed.width, processed.height) == (2000, 1000)
+        assert [(v.width, v.height) for v in processed.variants] == [(320, 160), (640, 320), (1280, 640)]
+        with PILImage.open(io.BytesIO(processed.variants[0].data)) as variant:
+            assert variant.format == "WEBP"
+            assert variant.size == (320, 160)
+
+    def test_jpeg_variants_drop_transparency(self):
+        processed = render_variants(_png(800, 400), [320], "JPEG", 80)
+
+        with PILImage.open(io.BytesIO(processed.variants[0].data)) as variant:
+            assert variant.mode == "RGB"
+
+    def test_animated_images_only_report_their_size(self):
+        buffer = io.BytesIO()
+        frames = [PILImage.new("P", (800, 600), color) for color in (0, 1)]
+        frames[0].save(buffer, format="GIF", save_all=True, append_images=frames[1:])
+
+        processed = render_variants(buffer.getvalue(), [320], "WEBP", 80)
+
+        assert (processed.width, processed.height) == (800, 600)
+        assert processed.variants == []
+
+
+class TestImageProcessor:
+
+    @pytest.mark.asyncio
+    async def test_process_runs_in_the_process_pool(self):
+        processor = ImageProcessor([320], workers=1)
+
+        processed = await processor.process(_png(640, 480, "RGB"))
+        await processor.close()
+
+        assert [(v.width, v.height) for v in processed.variants] == [(320, 240)]
+
+    @pytest.mark.asyncio
+    async def test_process_file_hands_the_worker_a_path(self):
+        processor = ImageProcessor([320], executor=ThreadPoolExecutor(1))
+        sources = []
+        process = processor.process
+
+        async def spy(source):
+            sources.append(source)
+            return await process(source)
+
+        processor.process = spy
+        upload = tempfile.SpooledTemporaryFile(max_size=1024)
+        upload.write(_png(640, 480, "RGB"))
+
+        processed = await processor.process_file(upload)
+        await processor.close()
+
+        assert [(v.width, v.height) for v in processed.variants] == [(320, 240)]
+        [path] = sources
+        assert isinstance(path, str)
+        assert not os.path.exists(path)
+
+    def test_vector_images_are_skipped(self):
+        processor = ImageProcessor([320])
+
+        assert processor.supports("photo.PNG")
+        assert not processor.supports("logo.svg")
+        assert not ImageProcessor([320], enabled=False).supports("photo.png")
+
+
+class TestImageVariants:
+
+    @pytest.fixture
+    async def backend(self, tmp_path, monkeypatch):
+        backend = LocalStorageBackend(tmp_path, "http://testserver/media")
+        monkeypatch.setattr(storage_service, "_backend", backend)
+        monkeypatch.setattr(
+            "app.services.media.image_processor",
+            ImageProcessor([320, 640], executor=ThreadPoolExecutor(1))
+        )
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_upload_stores_variants_and_srcset(self, test_db, backend):
+        upload = UploadFile(io.BytesIO(_png(1000, 500)), filename="photo.png")
+
+        image = await media_service.upload_and_create_image(test_db, upload, 1, "project")
+        response = ImageResponse.model_validate(image)
+
+        assert (response.width, response.height) == (1000, 500)
+        assert [(v.width, v.content_type) for v in response.variants] == [(320, "image/webp"), (640, "image/webp")]
+        assert response.srcset == (
+            f"{response.variants[0].url} 320w, {response.variants[1].url} 640w, {image.image_url} 1000w"
+        )
+        assert response.variants[1].url.endswith(f"{image.content_hash}_w640.webp")
+        for variant in response.variants:
+            assert await backend.exists(variant.url.removeprefix("http://testserver/media/"))
+
+    @pytest.mark.asyncio
+    async def test_unreadable_image_keeps_only_the_original(self, test_db, backend):
+        upload = UploadFile(io.BytesIO(b"not an image"), filename="photo.png")
+
+        image = await media_service.upload_and_create_image(test_db, upload, 1, "project")
+        response = ImageResponse.model_validate(image)
+
+        assert response.variants == []
+        assert response.srcset is None
+        assert await backend.exists(image.blob_name)
@@ -0,0 +1,128 @@
+# tests/unit/test_media.py
+
+import io
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from PIL import Image as PILImage
+from starlette.datastructures import UploadFile
+
+from app.core.image_processing import ImageProcessor
+from app.core.storage import LocalStorageBackend, storage_service
+from app.models.media import Image
+from app.models.outbox import EmailOutbox
+from app.services.media import MediaService, media_service
+from app.services.outbox import OutboxService
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (width, height), "blue").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(tmp_path, "http://testserver/media")
+    monkeypatch.setattr(storage_service, "_backend", backend)
+    return backend
+
+
+@pytest.fixture
+def outbox(test_engine):
+    session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    service = OutboxService(session_factory, batch_size=10, max_attempts=2)
+    service.register(MediaService.BLOB_DELETION, media_service.delete_blobs)
+    return service
+
+
+async def _outbox_rows(db: AsyncSession):
+    db.expire_all()
+    result = await db.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+    return list(result.scalars().all())
+
+
+class TestMediaService:
+
+    @pytest.mark.asyncio
+    async def test_image_blobs_are_deleted_in_the_background(self, test_db, outbox, backend, monkeypatch):
+        for index in range(3):
+            name = f"project/1/{index}.png"
+            await backend.put(name, b"x", "image/png")
+            test_db.add(Image(entity_id=1, entity_type="project", image_url=backend.url_for(name), blob_name=name))
+        await test_db.commit()
+
+        assert await media_service.delete_all_images(test_db, 1, "project") == 3
+        assert await backend.exists("project/1/0.png")
+
+        failing = {"project/1/2.png"}
+        original_delete = backend.delete
+
+        async def flaky_delete(name):
+            if name in failing:
+                raise OSError("Storage unavailable")
+            return await original_delete(name)
+
+        monkeypatch.setattr(backend, "delete", flaky_delete)
+        assert (await outbox.process_batch()).retried == 1
+        [row] = await _outbox_rows(test_db)
+        assert json.loads(row.payload)["blob_names"] == ["project/1/2.png"]
+        assert not await backend.exists("project/1/0.png")
+
+        failing.clear()
+        row.next_attempt_at = datetime.utcnow()
+        await test_db.commit()
+        assert (await outbox.process_batch()).sent == 1
+        assert not await backend.exists("project/1/2.png")
+
+    @pytest.mark.asyncio
+    async def test_shared_blobs_are_deleted_with_the_last_image(self, test_db, outbox, backend, monkeypatch):
+        monkeypatch.setattr("app.services.media.image_processor", ImageProcessor([320], executor=ThreadPoolExecutor(1)))
+        data = _png(640, 480)
+
+        first = await media_service.upload_and_create_image(
+            test_db, UploadFile(io.BytesIO(data), filename="logo.png"), 1, "project"
+        )
+        monkeypatch.setattr(backend, "put_stream", None)  # A second upload would fail
+        second = await media_service.upload_and_create_image(
+            test_db, UploadFile(io.BytesIO(data), filename="logo.png"), 2, "project"
+        )
+
+        assert second.blob_name == first.blob_name
+        assert second.variants == first.variants
+        second_id = second.id
+        blob_names = [first.blob_name] + [variant["blob_name"] for variant in json.loads(first.variants)]
+        assert len(list(backend.root.rglob("*.*"))) == len(blob_names) == 2
+
+        assert await media_service.delete_all_images(test_db, 1, "project") == 1
+        assert await _outbox_rows(test_db) == []
+
+        assert await media_service.delete_image(test_db, second_id, 2, "project")
+        [row] = await _outbox_rows(test_db)
+        assert json.loads(row.payload)["blob_names"] == blob_names
+
+        assert (await outbox.process_batch()).sent == 1
+        for blob_name in blob_names:
+            assert not await backend.exists(blob_name)
+
+    @pytest.mark.asyncio
+    async def test_blob_deletion_skips_content_in_use_again(self, test_db, outbox, backend, monkeypatch):
+        content_hash = "a" * 64
+        blob_name = f"content/{content_hash}.png"
+        await backend.put(blob_name, b"x", "image/png")
+        await backend.put("project/1/legacy.png", b"x", "image/png")
+
+        await outbox.enqueue(test_db, MediaService.BLOB_DELETION, {"blob_names": [blob_name, "project/1/legacy.png"]})
+        test_db.add(Image(
+            entity_id=3, entity_type="project", image_url=backend.url_for(blob_name),
+            blob_name=blob_name, content_hash=content_hash
+        ))
+        await test_db.commit()
+
+        assert (await outbox.process_batch()).sent == 1
+        assert await backend.exists(blob_name)
+        assert not await backend.exists("project/1/legacy.png")
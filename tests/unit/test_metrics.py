@@ -0,0 +1,93 @@
+# tests/unit/test_metrics.py
+
+import pytest
+
+from app.config import settings
+from app.core.metrics import MetricsRegistry
+from app.services.email import EMAIL_SEND_SECONDS, EMAIL_SENDS, EMAIL_SENDS_IN_FLIGHT, EmailService
+from app.services.email_transport import InMemoryEmailTransport, PermanentDeliveryError
+
+
+class TestMetricsRegistry:
+
+    def test_counter_and_gauge_render(self):
+        registry = MetricsRegistry()
+        sends = registry.counter("sends_total", "Sends", ["outcome"])
+        in_flight = registry.gauge("in_flight", "In flight")
+
+        sends.inc(outcome="sent")
+        sends.inc(2, outcome='bad "quote"')
+        in_flight.inc()
+        in_flight.dec()
+
+        text = registry.render()
+        assert "# TYPE sends_total counter" in text
+        assert 'sends_total{outcome="sent"} 1' in text
+        assert 'sends_total{outcome="bad \\"quote\\""} 2' in text
+        assert "in_flight 0" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert latency.sum() == pytest.approx(3.65)
+
+    def test_labels_must_match(self):
+        registry = MetricsRegistry()
+        sends = registry.counter("sends_total", "Sends", ["outcome"])
+
+        with pytest.raises(ValueError):
+            sends.inc(status="sent")
+        with pytest.raises(ValueError):
+            registry.counter("sends_total", "Again")
+
+
+class TestEmailSendMetrics:
+
+    @pytest.mark.asyncio
+    async def test_sends_are_counted_per_type_and_outcome(self):
+        transport = InMemoryEmailTransport()
+        service = EmailService(transport=transport)
+        message = service.build_2fa_code("user@example.com", "123456", "User")
+        sent = {"message_type": "metrics_test", "transport": "memory", "outcome": "sent"}
+        rejected = {**sent, "outcome": "rejected"}
+        before_sent, before_rejected = EMAIL_SENDS.value(**sent), EMAIL_SENDS.value(**rejected)
+
+        await service.send_message(message, "metrics_test")
+        transport.fail = transport.permanent = True
+        with pytest.raises(PermanentDeliveryError):
+            await service.send_message(message, "metrics_test")
+
+        assert EMAIL_SENDS.value(**sent) == before_sent + 1
+        assert EMAIL_SENDS.value(**rejected) == before_rejected + 1
+        assert EMAIL_SEND_SECONDS.count(**sent) >= 1
+        assert EMAIL_SENDS_IN_FLIGHT.value(transport="memory") == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_is_disabled_by_default(self, client):
+        response = await client.get("/metrics")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_requires_the_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+        assert (await client.get("/metrics")).status_code == 401
+        wrong = await client.get("/metrics", headers={"Authorization": "Bearer nope"})
+        assert wrong.status_code == 401
+
+        response = await client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE email_send_duration_seconds histogram" in response.text
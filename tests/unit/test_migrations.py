@@ -0,0 +1,202 @@
+# tests/unit/test_migrations.py
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.migrations import NEW_COLUMNS, NEW_INDEXES, upgrade_schema
+from app.models.contact import ContactMessage, DeliveryStatusEnum
+from app.models.media import Image
+from app.models.project import Comment
+from app.models.subscriber import DigestFrequencyEnum, Subscriber
+
+
+# Tables as they were before the columns and indexes in NEW_COLUMNS and
+# NEW_INDEXES were added
+LEGACY_TABLES = [
+    """
+    CREATE TABLE blog_posts (
+        id INTEGER PRIMARY KEY,
+        title VARCHAR(255) NOT NULL,
+        slug VARCHAR(255) NOT NULL UNIQUE,
+        excerpt TEXT,
+        content TEXT NOT NULL,
+        author VARCHAR(255) NOT NULL,
+        tags TEXT,
+        published BOOLEAN NOT NULL,
+        views INTEGER NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE projects (
+        id INTEGER PRIMARY KEY,
+        title VARCHAR(255) NOT NULL,
+        description TEXT NOT NULL,
+        content TEXT,
+        technologies TEXT,
+        github_url VARCHAR(500),
+        demo_url VARCHAR(500),
+        featured BOOLEAN NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE reactions (
+        id INTEGER PRIMARY KEY,
+        email VARCHAR(255) NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        reaction_type VARCHAR(15) NOT NULL,
+        entity_id INTEGER NOT NULL,
+        entity_type VARCHAR(50) NOT NULL,
+        ip_address VARCHAR(50),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        CONSTRAINT uq_reaction_per_entity UNIQUE (email, entity_id, entity_type)
+    )
+    """,
+    """
+    CREATE TABLE contact_messages (
+        id INTEGER PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        subject VARCHAR(255),
+        message TEXT NOT NULL,
+        read BOOLEAN NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE subscribers (
+        id INTEGER PRIMARY KEY,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        is_active BOOLEAN NOT NULL,
+        verification_token VARCHAR(255),
+        is_verified BOOLEAN NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE comments (
+        id INTEGER PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        content TEXT NOT NULL,
+        approved BOOLEAN NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        project_id INTEGER REFERENCES projects (id) ON DELETE CASCADE,
+        blog_post_id INTEGER REFERENCES blog_posts (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE images (
+        id INTEGER PRIMARY KEY,
+        entity_id INTEGER NOT NULL,
+        entity_type VARCHAR(50) NOT NULL,
+        image_url VARCHAR(500) NOT NULL,
+        blob_name VARCHAR(500),
+        image_order INTEGER,
+        alt_text VARCHAR(255),
+        file_size INTEGER,
+        content_type VARCHAR(50),
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )
+    """,
+]
+
+LEGACY_ROWS = [
+    "INSERT INTO contact_messages (name, email, message, read) VALUES ('Ana', 'ana@example.com', 'Hola', 0)",
+    "INSERT INTO subscribers (email, is_active, is_verified) VALUES ('sub@example.com', 1, 1)",
+    "INSERT INTO comments (name, email, content, approved) VALUES ('Ana', 'ana@example.com', 'Old', 0)",
+    "INSERT INTO images (entity_id, entity_type, image_url, blob_name) "
+    "VALUES (1, 'project', 'http://testserver/media/project/1/a.png', 'project/1/a.png')",
+]
+
+
+@pytest.fixture
+def legacy_engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        for statement in LEGACY_TABLES + LEGACY_ROWS:
+            conn.execute(text(statement))
+        Base.metadata.create_all(conn)
+    yield engine
+    engine.dispose()
+
+
+class TestUpgradeSchema:
+
+    def test_new_database_needs_no_changes(self):
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            Base.metadata.create_all(conn)
+            assert upgrade_schema(conn) == []
+
+    def test_legacy_tables_are_upgraded_once(self, legacy_engine):
+        with legacy_engine.begin() as conn:
+            applied = upgrade_schema(conn)
+        with legacy_engine.begin() as conn:
+            assert upgrade_schema(conn) == []
+
+        expected = [f"{table}.{column}" for table, columns in NEW_COLUMNS.items() for column in columns]
+        expected += [index for indexes in NEW_INDEXES.values() for index in indexes]
+        assert sorted(applied) == sorted(expected)
+        inspector = inspect(legacy_engine)
+        for table, indexes in NEW_INDEXES.items():
+            assert set(indexes) <= {index["name"] for index in inspector.get_indexes(table)}
+
+    def test_existing_contact_messages_count_as_delivered(self, legacy_engine):
+        with legacy_engine.begin() as conn:
+            upgrade_schema(conn)
+
+        with Session(legacy_engine) as db:
+            message = db.scalars(select(ContactMessage)).one()
+
+        assert message.notification_status == DeliveryStatusEnum.SENT
+        assert message.confirmation_status == DeliveryStatusEnum.SENT
+
+    def test_existing_subscribers_keep_immediate_notifications(self, legacy_engine):
+        with legacy_engine.begin() as conn:
+            upgrade_schema(conn)
+
+        with Session(legacy_engine) as db:
+            subscriber = db.scalars(select(Subscriber)).one()
+
+        assert subscriber.digest_frequency == DigestFrequencyEnum.IMMEDIATE
+
+    def test_existing_comments_are_not_summarized_again(self, legacy_engine):
+        with legacy_engine.begin() as conn:
+            upgrade_schema(conn)
+
+        with Session(legacy_engine) as db:
+            old = db.scalars(select(Comment)).one()
+            db.add(Comment(name="Bea", email="bea@example.com", content="New", approved=False))
+            db.commit()
+            new = db.scalars(select(Comment).where(Comment.content == "New")).one()
+
+            assert old.notified is True
+            assert new.notified is False
+
+    def test_existing_images_have_no_content_hash(self, legacy_engine):
+        with legacy_engine.begin() as conn:
+            upgrade_schema(conn)
+
+        with Session(legacy_engine) as db:
+            blob_name, content_hash = db.execute(select(Image.blob_name, Image.content_hash)).one()
+
+        assert blob_name == "project/1/a.png"
+        assert content_hash is None
+
+    def test_existing_images_are_served_without_variants(self, legacy_engine):
+        with legacy_engine.begin() as conn:
+            upgrade_schema(conn)
+
+        with Session(legacy_engine) as db:
+            image = db.scalars(select(Image)).one()
+
+        assert (image.width, image.height, image.variants) == (None, None, None)
@@ -0,0 +1,335 @@
+# tests/unit/test_outbox.py
+
+import asyncio
+import json
+import pytest
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.rate_limit import TokenBucket
+from app.models.contact import DeliveryStatusEnum
+from app.models.outbox import EmailOutbox, OutboxStatusEnum
+from app.models.digest import DigestItem
+from app.models.subscriber import DigestFrequencyEnum, Subscriber
+from app.schemas.contact import ContactMessageCreate
+from app.services.contact import ContactService, contact_service
+from app.services.email import email_service
+from app.services.email_transport import InMemoryEmailTransport
+from app.services.notification import NotificationService, notification_service
+from app.services.outbox import OutboxService
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    transport = InMemoryEmailTransport()
+    monkeypatch.setattr(email_service, "transport", transport)
+    return transport
+
+
+@pytest.fixture
+def outbox(test_engine):
+    session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    service = OutboxService(session_factory, batch_size=10, max_attempts=2)
+    service.register(NotificationService.NEW_BLOG_POST, notification_service.fan_out_new_blog_post)
+    service.register(NotificationService.SUBSCRIBER_DIGEST, notification_service.fan_out_digest)
+    service.register(NotificationService.SUBSCRIBER_NOTIFICATION, notification_service.send_subscriber_batch)
+    return service
+
+
+async def _rows(db: AsyncSession):
+    db.expire_all()
+    result = await db.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+    return list(result.scalars().all())
+
+
+class TestOutboxService:
+
+    @pytest.mark.asyncio
+    async def test_enqueued_message_is_sent(self, test_db, outbox, transport):
+        await outbox.enqueue(test_db, "2fa_code", email_service.build_2fa_code("user@example.com", "123456", "User"))
+        await test_db.commit()
+
+        result = await outbox.process_batch()
+
+        assert result.claimed == 1
+        assert result.sent == 1
+        assert transport.recipients() == ["user@example.com"]
+        [row] = await _rows(test_db)
+        assert row.status == OutboxStatusEnum.SENT
+        assert row.attempts == 1
+        assert row.provider_message_id
+        assert row.claim_token is None
+        assert (await outbox.process_batch()).claimed == 0
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_retried_later(self, test_db, outbox, transport):
+        transport.fail = True
+        await outbox.enqueue(test_db, "2fa_code", email_service.build_2fa_code("user@example.com", "123456", "User"))
+        await test_db.commit()
+
+        result = await outbox.process_batch()
+
+        assert result.retried == 1
+        [row] = await _rows(test_db)
+        assert row.status == OutboxStatusEnum.PENDING
+        assert row.attempts == 1
+        assert row.next_attempt_at > datetime.utcnow()
+        assert "RuntimeError" in row.last_error
+        # Not due yet, so nothing is claimed
+        assert (await outbox.process_batch()).claimed == 0
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_is_dead_lettered(self, test_db, outbox, transport):
+        transport.fail = True
+        transport.permanent = True
+        await outbox.enqueue(test_db, "2fa_code", email_service.build_2fa_code("user@example.com", "123456", "User"))
+        await test_db.commit()
+
+        result = await outbox.process_batch()
+
+        assert result.dead == 1
+
+        [row] = await _rows(test_db)
+        assert row.status == OutboxStatusEnum.DEAD
+        assert row.attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_max_attempts_is_dead_lettered(self, test_db, outbox, transport):
+        transport.fail = True
+        await outbox.enqueue(
+            test_db, "2fa_code", email_service.build_2fa_code("user@example.com", "123456", "User"),
+            max_attempts=1
+        )
+        await test_db.commit()
+
+        await outbox.process_batch()
+
+        [row] = await _rows(test_db)
+        assert row.status == OutboxStatusEnum.DEAD
+
+    @pytest.mark.asyncio
+    async def test_transactional_mail_is_claimed_before_bulk_work(self, test_db, outbox, transport):
+        outbox.batch_size = 1
+        await outbox.enqueue(
+            test_db, "newsletter", email_service.build_2fa_code("bulk@example.com", "000000", "Bulk"),
+            priority=OutboxService.PRIORITY_BULK
+        )
+        await outbox.enqueue(test_db, "2fa_code", email_service.build_2fa_code("user@example.com", "123456", "User"))
+        await test_db.commit()
+
+        await outbox.process_batch()
+
+        assert transport.recipients() == ["user@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_transactional_lane_skips_the_rate_limit(self, test_db, outbox, transport):
+        outbox.rate_limiter = TokenBucket(0.01)
+        await outbox.rate_limiter.acquire()
+        await outbox.enqueue(
+            test_db, "newsletter", email_service.build_2fa_code("bulk@example.com", "000000", "Bulk"),
+            priority=OutboxService.PRIORITY_BULK
+        )
+        await outbox.enqueue(test_db, "2fa_code", email_service.build_2fa_code("user@example.com", "123456", "User"))
+        await test_db.commit()
+
+        result = await asyncio.wait_for(outbox.process_batch(bulk=False), timeout=1)
+
+        assert result.sent == 1
+        assert transport.recipients() == ["user@example.com"]
+        bulk = next(row for row in await _rows(test_db) if row.message_type == "newsletter")
+        assert bulk.status == OutboxStatusEnum.PENDING
+
+    @pytest.mark.asyncio
+    async def test_fan_out_enqueues_one_job_per_batch(self, test_db, test_blog_post, outbox, transport, monkeypatch):
+        monkeypatch.setattr(notification_service, "batch_size", 2)
+        test_db.add_all([
+            Subscriber(email=f"sub{i}@example.com", is_active=True, is_verified=True)
+            for i in range(3)
+        ])
+        test_db.add(Subscriber(email="unverified@example.com", is_active=True, is_verified=False))
+        await notification_service.enqueue_new_blog_post(test_db, test_blog_post.id)
+        await test_db.commit()
+
+        await outbox.process_batch()
+        rows = await _rows(test_db)
+
+        assert rows[0].status == OutboxStatusEnum.SENT
+        assert [row.message_type for row in rows[1:]] == ["subscriber_notification"] * 2
+        emails = [email for row in rows[1:] for _, email in json.loads(row.payload)["recipients"]]
+        assert sorted(emails) == ["sub0@example.com", "sub1@example.com", "sub2@example.com"]
+
+        result = await outbox.process_batch()
+
+        assert result.sent == 2
+        # One message per subscriber, each with its own unsubscribe link
+        assert sorted(transport.recipients()) == sorted(emails)
+        links = {message["content"]["plainText"].split("unsubscribe?token=")[1] for message in transport.sent}
+        assert len(links) == 3
+
+    @pytest.mark.asyncio
+    async def test_fan_out_resumes_after_checkpoint(self, test_db, test_blog_post, outbox, transport):
+        subscribers = [
+            Subscriber(email=f"sub{i}@example.com", is_active=True, is_verified=True)
+            for i in range(3)
+        ]
+        test_db.add_all(subscribers)
+        await test_db.commit()
+        ids = [subscriber.id for subscriber in subscribers]
+        # As if a previous attempt had committed the chunk ending at the first subscriber
+        await outbox.enqueue(
+            test_db,
+            NotificationService.NEW_BLOG_POST,
+            {"post_id": test_blog_post.id, "after_id": ids[0]}
+        )
+        await test_db.commit()
+
+        await outbox.process_batch()
+        job, *children = await _rows(test_db)
+
+        assert json.loads(job.payload)["after_id"] == ids[2]
+        emails = [email for row in children for _, email in json.loads(row.payload)["recipients"]]
+        assert sorted(emails) == ["sub1@example.com", "sub2@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_subscriber_batch_resumes_after_transient_failure(self, test_db, outbox, transport):
+        class _FailOnSecond(InMemoryEmailTransport):
+            calls = 0
+
+            async def send(self, message):
+                self.calls += 1
+                if self.calls == 2:
+                    raise RuntimeError("Temporary outage")
+                return await super().send(message)
+
+        flaky = _FailOnSecond()
+        email_service.transport = flaky
+        content = email_service.build_new_blog_content("Title", "title", "Excerpt")
+        await outbox.enqueue(
+            test_db,
+            NotificationService.SUBSCRIBER_NOTIFICATION,
+            {"content": content, "recipients": [[1, "a@example.com"], [2, "b@example.com"], [3, "c@example.com"]]}
+        )
+        await test_db.commit()
+
+        result = await outbox.process_batch()
+
+        assert result.retried == 1
+        [row] = await _rows(test_db)
+        assert json.loads(row.payload)["pending"] == [1]
+
+        row.next_attempt_at = datetime.utcnow()
+        await test_db.commit()
+        await outbox.process_batch()
+
+        assert flaky.recipients() == ["a@example.com", "c@example.com", "b@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_subscriber_batch_sends_concurrently(self, test_db, outbox, transport, monkeypatch):
+        monkeypatch.setattr(notification_service, "send_concurrency", 3)
+        transport.latency = 0.2
+        content = email_service.build_new_blog_content("Title", "title", "Excerpt")
+        recipients = [[index, f"sub{index}@example.com"] for index in range(6)]
+        await outbox.enqueue(
+            test_db, NotificationService.SUBSCRIBER_NOTIFICATION, {"content": content, "recipients": recipients}
+        )
+        await test_db.commit()
+
+        start = time.perf_counter()
+        result = await outbox.process_batch()
+
+        assert result.sent == 1
+        assert sorted(transport.recipients()) == sorted(email for _, email in recipients)
+        assert time.perf_counter() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_status_listener_records_contact_delivery(self, test_db, outbox, transport):
+        outbox.add_status_listener(ContactService.NOTIFICATION, contact_service.record_delivery)
+        outbox.add_status_listener(ContactService.CONFIRMATION, contact_service.record_delivery)
+        message = await contact_service.submit(test_db, ContactMessageCreate(
+            name="Visitor", email="visitor@example.com", subject="Hello", message="Hi"
+        ))
+
+        await outbox.process_batch()
+
+        await test_db.refresh(message)
+        assert message.notification_status == DeliveryStatusEnum.SENT
+        assert message.confirmation_status == DeliveryStatusEnum.SENT
+
+    @pytest.mark.asyncio
+    async def test_status_listener_records_contact_failure(self, test_db, outbox, transport):
+        outbox.add_status_listener(ContactService.CONFIRMATION, contact_service.record_delivery)
+        transport.fail = True
+        transport.permanent = True
+        message = await contact_service.submit(test_db, ContactMessageCreate(
+            name="Visitor", email="visitor@example.com", message="Hi"
+        ))
+
+        await outbox.process_batch()
+
+        await test_db.refresh(message)
+        assert message.confirmation_status == DeliveryStatusEnum.FAILED
+
+    @pytest.mark.asyncio
+    async def test_digest_subscribers_get_one_combined_email(
+        self, test_db, test_engine, test_blog_post, outbox, transport, monkeypatch
+    ):
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        monkeypatch.setattr(notification_service, "session_factory", session_factory)
+        test_db.add_all([
+            Subscriber(email="now@example.com", is_active=True, is_verified=True),
+            Subscriber(
+                email="hourly@example.com", is_active=True, is_verified=True,
+                digest_frequency=DigestFrequencyEnum.HOURLY
+            ),
+        ])
+        await notification_service.enqueue_new_blog_post(test_db, test_blog_post.id)
+        await notification_service.enqueue_new_blog_post(test_db, test_blog_post.id)
+        await test_db.commit()
+
+        # Immediate subscribers only: one email per post
+        await outbox.process_batch()
+        await outbox.process_batch()
+        assert transport.recipients() == ["now@example.com", "now@example.com"]
+
+        # The hourly window has not passed yet
+        assert await notification_service.run_due_digests() == 0
+
+        items = (await test_db.execute(select(DigestItem))).scalars().all()
+        for item in items:
+            item.created_at = datetime.utcnow() - timedelta(hours=2)
+        await test_db.commit()
+
+        assert await notification_service.run_due_digests() == 1
+        assert await notification_service.run_due_digests() == 0
+
+        transport.sent.clear()
+        await outbox.process_batch()
+        await outbox.process_batch()
+
+        [message] = transport.sent
+        assert transport.recipients() == ["hourly@example.com"]
+        assert message["content"]["subject"] == "Your hourly digest: 2 new updates"
+        assert message["content"]["html"].count(test_blog_post.title) == 2
+        assert "unsubscribe?token=" in message["content"]["plainText"]
+
+    @pytest.mark.asyncio
+    async def test_digest_window_with_timezone_aware_timestamps(self, test_db, test_engine, monkeypatch):
+        # SQL Server returns DATETIMEOFFSET columns as aware datetimes
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        monkeypatch.setattr(notification_service, "session_factory", session_factory)
+        item = DigestItem(
+            entity_type=NotificationService.NEW_BLOG_POST,
+            entity_id=1,
+            created_at=datetime.now(timezone.utc) - timedelta(minutes=10)
+        )
+        test_db.add(item)
+        await test_db.commit()
+
+        assert await notification_service.run_due_digests() == 0
+
+        item.created_at = datetime.now(timezone.utc) - timedelta(hours=2)
+        await test_db.commit()
+
+        assert await notification_service.run_due_digests() == 1
@@ -0,0 +1,34 @@
+# tests/unit/test_rate_limit.py
+
+import time
+import pytest
+
+from app.core.rate_limit import TokenBucket
+
+
+class TestTokenBucket:
+
+    @pytest.mark.asyncio
+    async def test_burst_is_immediate(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+
+        assert time.monotonic() - start < 0.1
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+
+        # Two refills at 20 tokens/s
+        assert time.monotonic() - start >= 0.09
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
@@ -0,0 +1,68 @@
+# tests/unit/test_reaction_service.py
+
+import pytest
+from app.services.reaction import reaction_service
+from app.models.reaction import Reaction, ReactionTypeEnum
+
+
+class TestReactionCounters:
+
+    @pytest.mark.asyncio
+    async def test_upsert_and_delete_maintain_counters(self, test_db, test_blog_post):
+        await reaction_service.upsert_reaction(
+            test_db, "a@example.com", "A", ReactionTypeEnum.LIKE, test_blog_post.id, "blog_post"
+        )
+        await reaction_service.upsert_reaction(
+            test_db, "b@example.com", "B", ReactionTypeEnum.LIKE, test_blog_post.id, "blog_post"
+        )
+        await reaction_service.upsert_reaction(
+            test_db, "b@example.com", "B", ReactionTypeEnum.LOVE, test_blog_post.id, "blog_post"
+        )
+
+        summary = await reaction_service.get_reaction_summary(
+            test_db, test_blog_post.id, "blog_post", user_email="b@example.com"
+        )
+        assert summary["like_count"] == 1
+        assert summary["love_count"] == 1
+        assert summary["total_reactions"] == 2
+        assert summary["user_reaction"] == ReactionTypeEnum.LOVE
+
+        deleted = await reaction_service.delete_reaction(
+            test_db, "a@example.com", test_blog_post.id, "blog_post"
+        )
+        assert deleted is True
+
+        summary = await reaction_service.get_reaction_summary(
+            test_db, test_blog_post.id, "blog_post"
+        )
+        assert summary["like_count"] == 0
+        assert summary["total_reactions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_summary_for_missing_entity(self, test_db):
+        summary = await reaction_service.get_reaction_summary(test_db, 999, "blog_post")
+
+        assert summary is None
+
+    @pytest.mark.asyncio
+    async def test_summary_without_reactions(self, test_db, test_project):
+        summary = await reaction_service.get_reaction_summary(test_db, test_project.id, "project")
+
+        assert summary["total_reactions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rebuild_counters(self, test_db, test_project):
+        test_db.add_all([
+            Reaction(email="a@example.com", name="A", reaction_type=ReactionTypeEnum.CONGRATULATIONS,
+                     entity_id=test_project.id, entity_type="project"),
+            Reaction(email="b@example.com", name="B", reaction_type=ReactionTypeEnum.LIKE,
+                     entity_id=test_project.id, entity_type="project"),
+        ])
+        await test_db.commit()
+
+        rebuilt = await reaction_service.rebuild_counters(test_db)
+
+        assert rebuilt == 1
+        summary = await reaction_service.get_reaction_summary(test_db, test_project.id, "project")
+        assert summary["congratulations_count"] == 1
+        assert summary["like_count"] == 1
@@ -63,6 +63,33 @@ class TestProjectRepository:
         deleted_project = await project_repository.get(test_db, test_project.id)
         assert deleted_project is None
 
+    
+    @pytest.mark.asyncio
+    async def test_technology_counts_follow_project_changes(self, test_db):
+        from app.schemas.project import ProjectCreate, ProjectUpdate
+        
+        first = await project_repository.create(test_db, obj_in=ProjectCreate(
+            title="First", description="Desc", technologies="Python, FastAPI"
+        ))
+        second = await project_repository.create(test_db, obj_in=ProjectCreate(
+            title="Second", description="Desc", technologies="python, Go"
+        ))
+        
+        facets = await project_repository.get_technology_facets(test_db)
+        assert [(f.name, f.project_count) for f in facets] == [
+            ("python", 2), ("fastapi", 1), ("go", 1)
+        ]
+        assert facets[0].label == "Python"
+        
+        await project_repository.update(test_db, db_obj=second, obj_in=ProjectUpdate(technologies="Go"))
+        await project_repository.delete(test_db, id=first.id)
+        
+        facets = await project_repository.get_technology_facets(test_db)
+        assert [(f.name, f.project_count) for f in facets] == [("go", 1)]
+        
+        page = await project_repository.get_ordered_page(test_db, technology="GO")
+        assert [p.id for p in page.items] == [second.id]
+
 
 class TestBlogRepository:
     
@@ -106,4 +133,116 @@ class TestBlogRepository:
         await blog_repository.increment_views(test_db, test_blog_post.id)
         
         await test_db.refresh(test_blog_post)
-        assert test_blog_post.views == initial_views + 1
\ No newline at end of file
+        assert test_blog_post.views == initial_views + 1
+    
+    @pytest.mark.asyncio
+    async def test_list_page_does_not_load_content(self, test_db, test_blog_post):
+        from sqlalchemy import inspect
+        
+        test_db.expunge_all()
+        page = await blog_repository.get_ordered_page(test_db)
+        
+        post = page.items[0]
+        assert post.title == test_blog_post.title
+        assert "content" in inspect(post).unloaded
+    
+    @pytest.mark.asyncio
+    async def test_search_by_tag_matches_whole_tags(self, test_db):
+        from app.schemas.blog import BlogPostCreate, BlogPostUpdate
+        
+        go_post = await blog_repository.create(test_db, obj_in=BlogPostCreate(
+            title="Go", slug="go-post", content="Content", author="Author", tags="Go, Concurrency"
+        ))
+        await blog_repository.create(test_db, obj_in=BlogPostCreate(
+            title="Django", slug="django-post", content="Content", author="Author", tags="django, python"
+        ))
+        
+        page = await blog_repository.search_by_tag(test_db, "go", include_total=True)
+        
+        assert [p.id for p in page.items] == [go_post.id]
+        assert page.total == 1
+        
+        await blog_repository.update(test_db, db_obj=go_post, obj_in=BlogPostUpdate(tags="rust"))
+        
+        page = await blog_repository.search_by_tag(test_db, "go")
+        assert page.items == []
+        page = await blog_repository.search_by_tag(test_db, "RUST")
+        assert [p.id for p in page.items] == [go_post.id]
+
+class TestKeysetPagination:
+    
+    @pytest.mark.asyncio
+    async def test_forward_and_backward_pages(self, test_db):
+        from datetime import datetime, timedelta
+        
+        base = datetime(2024, 1, 1)
+        for i in range(5):
+            test_db.add(BlogPost(
+                title=f"Post {i}",
+                slug=f"post-{i}",
+                content="Content",
+                author="Author",
+                created_at=base + timedelta(days=i)
+            ))
+        await test_db.commit()
+        
+        first = await blog_repository.get_ordered_page(test_db, limit=2)
+        assert [p.slug for p in first.items] == ["post-4", "post-3"]
+        assert first.prev_cursor is None
+        assert first.total is None
+        
+        second = await blog_repository.get_ordered_page(
+            test_db, cursor=first.next_cursor, limit=2
+        )
+        assert [p.slug for p in second.items] == ["post-2", "post-1"]
+        
+        last = await blog_repository.get_ordered_page(
+            test_db, cursor=second.next_cursor, limit=2, include_total=True
+        )
+        assert [p.slug for p in last.items] == ["post-0"]
+        assert last.next_cursor is None
+        assert last.total == 5
+        
+        back = await blog_repository.get_ordered_page(
+            test_db, cursor=second.prev_cursor, limit=2
+        )
+        assert [p.slug for p in back.items] == ["post-4", "post-3"]
+        assert back.prev_cursor is None
+    
+    @pytest.mark.asyncio
+    async def test_ties_on_created_at_use_id(self, test_db):
+        from datetime import datetime
+        
+        created_at = datetime(2024, 1, 1)
+        for i in range(3):
+            test_db.add(Project(
+                title=f"Project {i}",
+                description="Description",
+                created_at=created_at
+            ))
+        await test_db.commit()
+        
+        first = await project_repository.get_ordered_page(test_db, limit=2)
+        second = await project_repository.get_ordered_page(
+            test_db, cursor=first.next_cursor, limit=2
+        )
+        
+        ids = [p.id for p in first.items] + [p.id for p in second.items]
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 3
+    
+    def test_invalid_cursor(self):
+        from app.core.exceptions import BadRequestException
+        from app.utils.pagination import decode_cursor
+        
+        with pytest.raises(BadRequestException):
+            decode_cursor("not-a-cursor")
+    
+    @pytest.mark.parametrize("payload", [b"[]", b"1", b'"text"', b"null"])
+    def test_cursor_that_is_not_an_object(self, payload):
+        import base64
+        from app.core.exceptions import BadRequestException
+        from app.utils.pagination import decode_cursor
+        
+        with pytest.raises(BadRequestException):
+            decode_cursor(base64.urlsafe_b64encode(payload).decode())
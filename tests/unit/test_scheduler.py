@@ -0,0 +1,40 @@
+# tests/unit/test_scheduler.py
+
+import asyncio
+import pytest
+
+from app.core.scheduler import PeriodicScheduler
+
+
+class TestPeriodicScheduler:
+
+    @pytest.mark.asyncio
+    async def test_job_runs_every_interval_and_survives_errors(self):
+        scheduler = PeriodicScheduler()
+        calls = []
+
+        async def job():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+
+        scheduler.add_job("job", job, 0.01)
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        runs = len(calls)
+        await asyncio.sleep(0.05)
+
+        assert runs >= 3
+        assert len(calls) == runs
+
+    def test_rejects_duplicate_names(self):
+        scheduler = PeriodicScheduler()
+
+        async def job():
+            pass
+
+        scheduler.add_job("job", job, 1)
+
+        with pytest.raises(ValueError):
+            scheduler.add_job("job", job, 1)
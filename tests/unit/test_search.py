@@ -0,0 +1,66 @@
+# tests/unit/test_search.py
+
+import pytest
+
+from app.services.search import SearchIndex, tokenize, stem
+
+
+class TestTokenizer:
+    
+    def test_tokenize_folds_accents_and_stems(self):
+        assert tokenize("Programación de APIs con FastAPI") == ["programacion", "api", "fastapi"]
+        assert tokenize("Testing tested tests") == ["test", "test", "test"]
+    
+    def test_tokenize_keeps_language_names(self):
+        assert tokenize("C++ and C# services") == ["c++", "c#", "service"]
+    
+    def test_stem_leaves_short_words(self):
+        assert stem("class") == "class"
+        assert stem("gas") == "gas"
+
+
+class TestSearchIndex:
+    
+    def _index(self):
+        index = SearchIndex()
+        index.upsert("blog_post", 1, title="Async Python", slug="async-python",
+                     fields=[("Async Python", 3.0), ("Using asyncio in web services", 1.0)],
+                     body="Using asyncio in web services")
+        index.upsert("blog_post", 2, title="Django tips", slug="django-tips",
+                     fields=[("Django tips", 3.0), ("Python ORM tricks", 1.0)],
+                     body="Python ORM tricks")
+        index.upsert("project", 1, title="Go CLI",
+                     fields=[("Go CLI", 3.0), ("A command line tool", 1.0)],
+                     body="A command line tool")
+        return index
+    
+    def test_title_matches_rank_first(self):
+        total, hits = self._index().search("python")
+        
+        assert total == 2
+        assert [(h.entity_type, h.id) for h in hits] == [("blog_post", 1), ("blog_post", 2)]
+        assert hits[0].title_highlight == "Async <mark>Python</mark>"
+        assert hits[1].snippet == "<mark>Python</mark> ORM tricks"
+    
+    def test_filter_and_pagination(self):
+        index = self._index()
+        
+        total, hits = index.search("python", offset=1, limit=1)
+        assert total == 2
+        assert [h.id for h in hits] == [2]
+        
+        total, hits = index.search("python", entity_type="project")
+        assert total == 0
+    
+    def test_upsert_and_remove_update_postings(self):
+        index = self._index()
+        
+        index.upsert("blog_post", 2, title="Django tips", fields=[("Django tips", 3.0)])
+        assert index.search("python")[0] == 1
+        
+        assert index.remove("blog_post", 1) is True
+        assert index.search("python")[0] == 0
+        assert len(index) == 2
+    
+    def test_highlight_escapes_html(self):
+        assert SearchIndex.highlight("<b>Python</b>", {"python"}) == "&lt;b&gt;<mark>Python</mark>&lt;/b&gt;"
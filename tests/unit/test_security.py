@@ -0,0 +1,36 @@
+# tests/unit/test_security.py
+
+from datetime import timedelta
+
+from app.core.security import (
+    SUBSCRIBER_TOKEN_UNSUBSCRIBE,
+    SUBSCRIBER_TOKEN_VERIFY,
+    create_subscriber_token,
+    verify_subscriber_token
+)
+
+
+class TestSubscriberTokens:
+    
+    def test_round_trip(self):
+        token = create_subscriber_token(42, SUBSCRIBER_TOKEN_VERIFY)
+        
+        assert verify_subscriber_token(token, SUBSCRIBER_TOKEN_VERIFY) == 42
+    
+    def test_purpose_is_signed(self):
+        token = create_subscriber_token(42, SUBSCRIBER_TOKEN_VERIFY)
+        
+        assert verify_subscriber_token(token, SUBSCRIBER_TOKEN_UNSUBSCRIBE) is None
+    
+    def test_tampered_id_is_rejected(self):
+        _, expire, signature = create_subscriber_token(42, SUBSCRIBER_TOKEN_UNSUBSCRIBE).split(".")
+        
+        assert verify_subscriber_token(f"43.{expire}.{signature}", SUBSCRIBER_TOKEN_UNSUBSCRIBE) is None
+    
+    def test_expired_token_is_rejected(self):
+        token = create_subscriber_token(42, SUBSCRIBER_TOKEN_VERIFY, expires_delta=timedelta(seconds=-1))
+        
+        assert verify_subscriber_token(token, SUBSCRIBER_TOKEN_VERIFY) is None
+    
+    def test_malformed_token_is_rejected(self):
+        assert verify_subscriber_token("not-a-token", SUBSCRIBER_TOKEN_VERIFY) is None
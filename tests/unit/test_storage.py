@@ -0,0 +1,95 @@
+# tests/unit/test_storage.py
+
+import hashlib
+import io
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+from app.core.storage import LocalStorageBackend, ObjectExistsError, StorageService, create_storage_backend
+
+
+@pytest.fixture
+async def backend(tmp_path):
+    backend = LocalStorageBackend(tmp_path / "media", "http://testserver/media", block_size=1024)
+    await backend.start()
+    return backend
+
+
+def _upload(size: int, filename: str = "photo.png") -> UploadFile:
+    return UploadFile(io.BytesIO(b"x" * size), filename=filename)
+
+
+class TestLocalStorageBackend:
+
+    @pytest.mark.asyncio
+    async def test_put_stream_exists_delete(self, backend):
+        url = await backend.put_stream("project/1/photo.png", _upload(2500), "image/png")
+
+        assert url == "http://testserver/media/project/1/photo.png"
+        assert (backend.root / "project/1/photo.png").stat().st_size == 2500
+        assert await backend.exists("project/1/photo.png")
+        assert await backend.delete_batch(["project/1/photo.png", "project/1/missing.png"]) == {
+            "project/1/photo.png": True,
+            "project/1/missing.png": False
+        }
+        assert not await backend.exists("project/1/photo.png")
+
+    @pytest.mark.asyncio
+    async def test_existing_objects_are_not_overwritten(self, backend):
+        await backend.put("project/1/photo.png", b"first", "image/png")
+
+        with pytest.raises(ObjectExistsError):
+            await backend.put("project/1/photo.png", b"second", "image/png")
+
+    @pytest.mark.asyncio
+    async def test_names_cannot_escape_the_root(self, backend):
+        with pytest.raises(ValueError):
+            await backend.delete("../outside.png")
+
+
+class TestStorageService:
+
+    @pytest.mark.asyncio
+    async def test_upload_image_stores_and_rewinds(self, backend):
+        service = StorageService(backend)
+        file = _upload(100)
+
+        url, blob_name, created = await service.upload_image(file)
+
+        assert blob_name == f"content/{hashlib.sha256(b'x' * 100).hexdigest()}.png"
+        assert created
+        assert url == backend.url_for(blob_name)
+        assert await backend.exists(blob_name)
+        assert file.file.tell() == 0
+
+    @pytest.mark.asyncio
+    async def test_identical_content_is_stored_once(self, backend):
+        service = StorageService(backend)
+
+        _, first_name, _ = await service.upload_image(_upload(3000, "logo.png"))
+        url, blob_name, created = await service.upload_image(_upload(3000, "copy.png"))
+
+        assert blob_name == first_name
+        assert not created
+        assert url == backend.url_for(blob_name)
+        assert service.content_hash_of(blob_name) == hashlib.sha256(b"x" * 3000).hexdigest()
+        assert service.content_hash_of(f"content/{'a' * 64}_w640.webp") == "a" * 64
+        assert service.content_hash_of("project/1/20250101_abc_photo.png") is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_extension_is_rejected(self, backend):
+        service = StorageService(backend)
+
+        with pytest.raises(HTTPException) as error:
+            await service.upload_image(_upload(100, "script.exe"))
+
+        assert error.value.status_code == 400
+
+    def test_backend_is_created_lazily(self):
+        service = StorageService()
+
+        assert service._backend is None
+        assert create_storage_backend("local").name == "local"
+        with pytest.raises(ValueError):
+            create_storage_backend("ftp")
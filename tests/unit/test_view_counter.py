@@ -0,0 +1,44 @@
+# tests/unit/test_view_counter.py
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.services.view_counter import ViewCounterService
+
+
+class TestViewCounterService:
+
+    @pytest.mark.asyncio
+    async def test_record_returns_unflushed_views(self, test_engine, test_blog_post):
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        counter = ViewCounterService(session_factory, flush_threshold=100)
+
+        assert counter.record(test_blog_post.id) == 1
+        assert counter.record(test_blog_post.id) == 2
+        assert counter.pending(test_blog_post.id) == 2
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_aggregated_delta(self, test_db, test_engine, test_blog_post):
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        counter = ViewCounterService(session_factory, flush_threshold=100)
+
+        for _ in range(5):
+            counter.record(test_blog_post.id)
+
+        assert await counter.flush() == 5
+        assert counter.pending(test_blog_post.id) == 0
+
+        await test_db.refresh(test_blog_post)
+        assert test_blog_post.views == 5
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_views(self, test_db, test_engine, test_blog_post):
+        session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        counter = ViewCounterService(session_factory, flush_threshold=100)
+
+        counter.start()
+        counter.record(test_blog_post.id)
+        await counter.stop()
+
+        await test_db.refresh(test_blog_post)
+        assert test_blog_post.views == 1